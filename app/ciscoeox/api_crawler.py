@@ -7,7 +7,8 @@ from django.utils.datetime_safe import datetime
 from app.ciscoeox.exception import ConnectionFailedException, CiscoApiCallFailed
 from app.ciscoeox.base_api import CiscoEoxApi
 from app.config.settings import AppSettings
-from app.productdb.models import Product, Vendor, ProductMigrationSource, ProductMigrationOption
+from app.productdb.models import Product, Vendor, ProductMigrationSource, ProductMigrationOption, \
+    get_product_id_normalizers, normalize_product_id
 
 logger = logging.getLogger("productdb")
 
@@ -54,9 +55,10 @@ def update_local_db_based_on_record(eox_record, create_missing=False):
     :param create_missing: set to True, if the product should be created if it's not part of the local database
     :return: returns an error message or None if successful
     """
-    pid = eox_record['EOLProductID']
     # only used with Cisco Products
     v = Vendor.objects.get(name="Cisco Systems")
+    normalizers = get_product_id_normalizers()
+    pid = normalize_product_id(eox_record['EOLProductID'], vendor_id=v.id, normalizers=normalizers)
 
     if create_missing:
         product, created = Product.objects.get_or_create(
@@ -161,7 +163,9 @@ def update_local_db_based_on_record(eox_record, create_missing=False):
             product_migration_source.save()
 
         if "MigrationOption" in migration_details:
-            candidate_replacement_pid = migration_details["MigrationProductId"].strip()
+            candidate_replacement_pid = normalize_product_id(
+                migration_details["MigrationProductId"], vendor_id=v.id, normalizers=normalizers
+            )
 
             if candidate_replacement_pid == pid:
                 logger.error("Product ID '%s' should be replaced by itself, which is not possible" % pid)
@@ -12,8 +12,8 @@ from app.ciscoeox.exception import CiscoApiCallFailed
 from app.config.settings import AppSettings
 from app.config.models import NotificationMessage
 from app.config import utils
-from app.productdb.models import Vendor, Product
-from django_project.celery import app as app, TaskState
+from app.productdb.models import Vendor, Product, bulk_operation
+from django_project.celery import app as app, TaskState, TaskProgressReporter
 
 logger = logging.getLogger("productdb")
 
@@ -70,8 +70,9 @@ def cisco_eox_populate_product_lc_state_sync_field():
     name="ciscoeox.update_local_database_records"
 )
 def update_local_database_records(results, year, records):
-    for record in records:
-        cisco_eox_api_crawler.update_local_db_based_on_record(record, True)
+    with bulk_operation():
+        for record in records:
+            cisco_eox_api_crawler.update_local_db_based_on_record(record, True)
 
     results[str(year)] = "success"
     return results
@@ -130,14 +131,11 @@ def initial_sync_with_cisco_eox_api(self, years_list):
 
     if test_result:
         # perform synchronization
-        self.update_state(state=TaskState.PROCESSING, meta={
-            "status_message": "start initial synchronization with the Cisco EoX API..."
-        })
+        update_task_state = TaskProgressReporter(self, total=len(years_list))
+        update_task_state("start initial synchronization with the Cisco EoX API...")
         all_records = []
-        for year in years_list:
-            self.update_state(state=TaskState.PROCESSING, meta={
-                "status_message": "fetch all information for year %d..." % year
-            })
+        for counter, year in enumerate(years_list):
+            update_task_state("fetch all information for year %d..." % year, processed=counter, force=True)
             # wait some time between the query calls
             time.sleep(int(app_config.get_cisco_eox_api_sync_wait_time()))
 
@@ -228,30 +226,31 @@ def update_cisco_eox_records(records):
     counter = 0
     messages = {}
 
-    for record in records:
-        blacklisted = False
-        for regex in blacklist:
-            try:
-                if re.search(regex, record["EOLProductID"], re.I):
-                    blacklisted = True
-                    break
-
-            except:
-                logger.warning("invalid regular expression in blacklist: %s" % regex)
-
-        if not blacklisted:
-            try:
-                message = cisco_eox_api_crawler.update_local_db_based_on_record(record, create_missing)
-                if message:
-                    messages[record["EOLProductID"]] = message
-
-            except ValidationError as ex:
-                logger.error("invalid data received from Cisco API, cannot save data object for "
-                             "'%s' (%s)" % (record, str(ex)), exc_info=True)
-        else:
-            messages[record["EOLProductID"]] = " Product record ignored"
+    with bulk_operation():
+        for record in records:
+            blacklisted = False
+            for regex in blacklist:
+                try:
+                    if re.search(regex, record["EOLProductID"], re.I):
+                        blacklisted = True
+                        break
+
+                except:
+                    logger.warning("invalid regular expression in blacklist: %s" % regex)
+
+            if not blacklisted:
+                try:
+                    message = cisco_eox_api_crawler.update_local_db_based_on_record(record, create_missing)
+                    if message:
+                        messages[record["EOLProductID"]] = message
+
+                except ValidationError as ex:
+                    logger.error("invalid data received from Cisco API, cannot save data object for "
+                                 "'%s' (%s)" % (record, str(ex)), exc_info=True)
+            else:
+                messages[record["EOLProductID"]] = " Product record ignored"
 
-        counter += 1
+            counter += 1
 
     return {
         "count": counter,
@@ -337,11 +336,14 @@ def execute_task_to_synchronize_cisco_eox_states(self, ignore_periodic_sync_flag
                 successful_queries = []
                 counter = 1
 
+                update_task_state = TaskProgressReporter(self, total=len(queries))
                 for query in queries:
-                    self.update_state(state=TaskState.PROCESSING, meta={
-                        "status_message": "send query <code>%s</code> to the Cisco EoX API (<strong>%d of "
-                                          "%d</strong>)..." % (query, counter, len(queries))
-                    })
+                    update_task_state(
+                        "send query <code>%s</code> to the Cisco EoX API (<strong>%d of "
+                        "%d</strong>)..." % (query, counter, len(queries)),
+                        processed=counter - 1,
+                        force=True
+                    )
 
                     # wait some time between the query calls
                     time.sleep(int(app_config.get_cisco_eox_api_sync_wait_time()))
@@ -367,10 +369,8 @@ def execute_task_to_synchronize_cisco_eox_states(self, ignore_periodic_sync_flag
 
                 for key in query_eox_records:
                     amount_of_records = len(query_eox_records[key])
-                    self.update_state(state=TaskState.PROCESSING, meta={
-                        "status_message": "update database (query <code>%s</code>, processed <b>0</b> of "
-                                          "<b>%d</b> results)..." % (key, amount_of_records)
-                    })
+                    update_task_state("update database (query <code>%s</code>, processed <b>0</b> of "
+                                      "<b>%d</b> results)..." % (key, amount_of_records))
 
                     # update database in a separate task
                     update_cisco_eox_records.apply_async(kwargs={
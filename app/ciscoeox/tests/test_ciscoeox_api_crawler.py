@@ -235,6 +235,24 @@ class TestUpdateLocalDbBasedOnRecord:
         assert p.eol_reference_url == "http://www.cisco.com/en/US/products/hw/switches/ps628/prod_eol_notice0" \
                                       "900aecd804658c9.html"
 
+    def test_with_product_id_normalization_rule(self):
+        productdb_models.ProductIdNormalizationRule.objects.create(
+            vendor=productdb_models.Vendor.objects.get(name="Cisco Systems"),
+            product_id="WS-C2960-24T-S=",
+            regex_match=r"^WS\-C2960\-24T\-S$"
+        )
+        p = productdb_models.Product.objects.create(
+            product_id="WS-C2960-24T-S=",
+            vendor=productdb_models.Vendor.objects.get(name="Cisco Systems")
+        )
+
+        result = api_crawler.update_local_db_based_on_record(valid_eox_record)
+
+        assert result is None
+        assert productdb_models.Product.objects.count() == 1, "the record should update the normalized Product ID"
+        p.refresh_from_db()
+        assert p.end_of_sale_date == datetime.date(2016, 10, 5)
+
     @pytest.mark.usefixtures("import_default_vendors")
     def test_update_local_db_based_on_record(self):
         productdb_models.ProductGroup.objects.create(name="Catalyst 2960")
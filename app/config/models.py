@@ -1,9 +1,31 @@
+import uuid
 from django.core.cache import cache
-from django.db import models
+from django.db import models, transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 
+CONFIG_OPTIONS_VERSION_CACHE_KEY = "PDB_CONFIG_OPTIONS_VERSION"
+
+
+def get_config_options_version():
+    """
+    get the current version of the configuration options, a new version is created if the value does not exist
+    (e.g. after a cache flush)
+    """
+    version = cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(CONFIG_OPTIONS_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY)
+
+    return version
+
+
+def update_config_options_version():
+    """create a new version of the configuration options, all process local copies are reloaded on next access"""
+    cache.set(CONFIG_OPTIONS_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
 class NotificationMessage(models.Model):
     """
     Notifications from certain processes
@@ -156,6 +178,16 @@ class ConfigOption(models.Model):
         return self.key
 
 
+@receiver([post_save, post_delete], sender=ConfigOption)
+def invalidate_config_options_version(sender, instance, **kwargs):
+    """
+    update the configuration version, the version is updated again after the commit so that no other process
+    keeps a copy of the options that was loaded before the change was visible
+    """
+    update_config_options_version()
+    transaction.on_commit(update_config_options_version)
+
+
 @receiver([post_save, post_delete], sender=NotificationMessage)
 def invalidate_notification_message_related_cache_values(sender, instance, **kwargs):
     """delete cache values that are somehow related to the Notification Message data model"""
@@ -2,8 +2,8 @@
 Settings file class for the product database
 """
 import logging
-from app.config.models import ConfigOption
-from django.core.cache import cache
+from app.config.models import ConfigOption, get_config_options_version
+from django.db import transaction
 
 logger = logging.getLogger("productdb")
 
@@ -12,20 +12,39 @@ class AppSettings:
     """
     Product Database settings
     """
-    CONFIG_OPTIONS_DICT_CACHE_KEY = "PRODUCTDB_CONFIG_OPTIONS"
+    # process wide copy of the configuration options as (version, options) tuple, the options are reloaded from the
+    # database if the version in the cache changes (any ConfigOption is saved)
+    _config_options_snapshot = (None, None)
 
     def __init__(self):
-        self._config_options = cache.get(self.CONFIG_OPTIONS_DICT_CACHE_KEY, None)
-        if not self._config_options or len(self._config_options) < 12:
-            # populate cache
-            self.create_defaults()
-            self._config_options = dict(ConfigOption.objects.all().values_list("key", "value"))
-            cache.set(self.CONFIG_OPTIONS_DICT_CACHE_KEY, self._config_options, timeout=None)
-
-    def _rebuild_config_cache(self):
-        cache.delete(self.CONFIG_OPTIONS_DICT_CACHE_KEY)
-        self._config_options = dict(ConfigOption.objects.all().values_list("key", "value"))
-        cache.set(self.CONFIG_OPTIONS_DICT_CACHE_KEY, self._config_options, timeout=None)
+        self._config_options = self._get_config_options()
+
+    @classmethod
+    def _get_config_options(cls):
+        version = get_config_options_version()
+        snapshot_version, config_options = cls._config_options_snapshot
+        if version is not None and snapshot_version == version:
+            return config_options
+
+        config_options = dict(ConfigOption.objects.all().values_list("key", "value"))
+        if len(config_options) < 14:
+            # populate defaults (changes the version)
+            cls.create_defaults()
+            version = get_config_options_version()
+            config_options = dict(ConfigOption.objects.all().values_list("key", "value"))
+
+        cls._config_options_snapshot = (version, config_options)
+        return config_options
+
+    @classmethod
+    def invalidate_snapshot(cls):
+        """discard the process wide copy of the configuration options"""
+        cls._config_options_snapshot = (None, None)
+
+    def _rebuild_config_cache(self, config_object):
+        # the process wide copy is reloaded on next access (version changed), only update the local copy
+        self._config_options = dict(self._config_options)
+        self._config_options[config_object.key] = config_object.value
 
     def _set_boolean(self, config_object, value):
         if value:
@@ -35,6 +54,7 @@ class AppSettings:
             config_object.value = "false"
 
         config_object.save()
+        self._rebuild_config_cache(config_object)
 
     def _get_boolean(self, value):
         result = True
@@ -83,7 +103,6 @@ class AppSettings:
         """
         co, created = ConfigOption.objects.get_or_create(key=ConfigOption.GLOBAL_LOGIN_ONLY_MODE)
         self._set_boolean(co, value)
-        self._rebuild_config_cache()
 
     def is_cisco_api_enabled(self):
         """
@@ -97,7 +116,6 @@ class AppSettings:
         """
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.GLOBAL_CISCO_API_ENABLED)
         self._set_boolean(co, value)
-        self._rebuild_config_cache()
 
     def is_periodic_sync_enabled(self):
         """
@@ -111,7 +129,6 @@ class AppSettings:
         """
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_CRAWLER_AUTO_SYNC)
         self._set_boolean(co, value)
-        self._rebuild_config_cache()
 
     def is_auto_create_new_products(self):
         """
@@ -125,7 +142,6 @@ class AppSettings:
         """
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_CRAWLER_CREATE_PRODUCTS)
         self._set_boolean(co, value)
-        self._rebuild_config_cache()
 
     def get_cisco_eox_api_queries(self):
         """
@@ -151,7 +167,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_API_QUERIES)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_product_blacklist_regex(self):
         """
@@ -167,7 +183,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_PRODUCT_BLACKLIST_REGEX)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_cisco_api_client_id(self):
         """
@@ -182,7 +198,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_API_CLIENT_ID)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_cisco_api_client_secret(self):
         """
@@ -197,7 +213,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_API_CLIENT_SECRET)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_cisco_eox_api_auto_sync_last_execution_time(self):
         """
@@ -212,7 +228,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_CRAWLER_LAST_EXECUTION_TIME)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_cisco_eox_api_auto_sync_last_execution_result(self):
         """
@@ -227,7 +243,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_CRAWLER_LAST_EXECUTION_RESULT)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_internal_product_id_label(self):
         """
@@ -242,7 +258,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.GLOBAL_INTERNAL_PRODUCT_ID_LABEL)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_cisco_eox_api_sync_wait_time(self):
         """
@@ -260,7 +276,7 @@ class AppSettings:
         co, _ = ConfigOption.objects.get_or_create(key=ConfigOption.CISCO_EOX_WAIT_TIME)
         co.value = value
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def set_amount_of_product_checks(self, value):
         """
@@ -269,7 +285,7 @@ class AppSettings:
         co, created = ConfigOption.objects.get_or_create(key=ConfigOption.STAT_AMOUNT_OF_PRODUCT_CHECKS)
         co.value = str(int(value))
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
 
     def get_amount_of_product_checks(self):
         """
@@ -280,8 +296,8 @@ class AppSettings:
             return int(self._config_options[ConfigOption.STAT_AMOUNT_OF_PRODUCT_CHECKS])\
                 if self._config_options[ConfigOption.STAT_AMOUNT_OF_PRODUCT_CHECKS] else 0
         except:  # catch any exception
-            # may occur after update, after cleaning the cache value it should work
-            cache.delete(self.CONFIG_OPTIONS_DICT_CACHE_KEY)
+            # may occur after update, after reloading the options it should work
+            self.invalidate_snapshot()
             return -1
 
     def set_amount_of_unique_product_check_entries(self, value):
@@ -291,7 +307,30 @@ class AppSettings:
         co, created = ConfigOption.objects.get_or_create(key=ConfigOption.STAT_AMOUNT_OF_UNIQUE_PRODUCT_CHECK_ENTRIES)
         co.value = str(int(value))
         co.save()
-        self._rebuild_config_cache()
+        self._rebuild_config_cache(co)
+
+    def increment_product_check_statistics(self, product_checks=1, unique_product_check_entries=0):
+        """
+        atomically increment the product check statistics counters (safe for concurrent workers)
+        :param product_checks: amount of product checks that should be added
+        :param unique_product_check_entries: amount of unique product check entries that should be added
+        """
+        increments = {
+            ConfigOption.STAT_AMOUNT_OF_PRODUCT_CHECKS: product_checks,
+            ConfigOption.STAT_AMOUNT_OF_UNIQUE_PRODUCT_CHECK_ENTRIES: unique_product_check_entries,
+        }
+        with transaction.atomic():
+            for key, increment in increments.items():
+                ConfigOption.objects.get_or_create(key=key)
+                co = ConfigOption.objects.select_for_update().get(key=key)
+                try:
+                    value = int(co.value) if co.value else 0
+
+                except ValueError:
+                    value = 0
+                co.value = str(value + int(increment))
+                co.save()
+                self._rebuild_config_cache(co)
 
     def get_amount_of_unique_product_check_entries(self):
         """
@@ -302,6 +341,6 @@ class AppSettings:
             return int(self._config_options[ConfigOption.STAT_AMOUNT_OF_UNIQUE_PRODUCT_CHECK_ENTRIES])\
                 if self._config_options[ConfigOption.STAT_AMOUNT_OF_UNIQUE_PRODUCT_CHECK_ENTRIES] else 0
         except:  # catch any exception
-            # may occur after update, after cleaning the cache value it should work
-            cache.delete(self.CONFIG_OPTIONS_DICT_CACHE_KEY)
+            # may occur after update, after reloading the options it should work
+            self.invalidate_snapshot()
             return -1
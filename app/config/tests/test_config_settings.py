@@ -6,21 +6,40 @@ from datetime import datetime
 from django.utils.dateparse import parse_datetime
 from django.core.cache import cache
 from app.config.settings import AppSettings
-from app.config.models import ConfigOption
+from app.config.models import ConfigOption, CONFIG_OPTIONS_VERSION_CACHE_KEY
 
 pytestmark = pytest.mark.django_db
 
 
-def test_config_options_cache():
-    # check that cache key doesn't exist
-    assert cache.get(AppSettings.CONFIG_OPTIONS_DICT_CACHE_KEY) is None
+def test_config_options_cache(django_assert_num_queries):
+    # check that the version key doesn't exist
+    assert cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY) is None
 
     # create object
     AppSettings()
 
-    # key exists and contains a dictionary
-    assert cache.get(AppSettings.CONFIG_OPTIONS_DICT_CACHE_KEY) is not None
-    assert type(cache.get(AppSettings.CONFIG_OPTIONS_DICT_CACHE_KEY)) is dict
+    # version exists and the options are kept in the process wide copy
+    version = cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY)
+    assert version is not None
+    assert AppSettings._config_options_snapshot[0] == version
+    assert type(AppSettings._config_options_snapshot[1]) is dict
+
+    # no database access if the version is not changed
+    with django_assert_num_queries(0):
+        assert AppSettings().is_login_only_mode() is False
+
+    # any change of a ConfigOption (e.g. from another process) changes the version
+    co = ConfigOption.objects.get(key=ConfigOption.GLOBAL_LOGIN_ONLY_MODE)
+    co.value = "true"
+    co.save()
+    assert cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY) != version
+
+    assert AppSettings().is_login_only_mode() is True
+
+    # the options are reloaded if the version is not available (e.g. cache flush)
+    cache.clear()
+    assert AppSettings().is_login_only_mode() is True
+    assert AppSettings._config_options_snapshot[0] == cache.get(CONFIG_OPTIONS_VERSION_CACHE_KEY)
 
 
 class TestConfigSettings:
@@ -240,3 +259,10 @@ class TestConfigSettings:
         value = settings.get_amount_of_unique_product_check_entries()
         assert type(value) is int
         assert value == 40
+
+        # increment values
+        settings.increment_product_check_statistics(1, 25)
+
+        assert settings.get_amount_of_product_checks() == 41
+        assert settings.get_amount_of_unique_product_check_entries() == 65
+        assert AppSettings().get_amount_of_product_checks() == 41, "cache should be updated"
@@ -282,6 +282,33 @@ class TestStatusView:
         cache.delete("CISCO_EOX_API_TEST")
 
 
+@pytest.mark.usefixtures("import_default_vendors")
+class TestDownloadProfile:
+    URL_NAME = "productdb_config:download_profile"
+
+    def test_superuser_access(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        (tmp_path / "profiles").mkdir()
+        (tmp_path / "profiles" / "test.prof").write_bytes(b"profile")
+
+        url = reverse(self.URL_NAME, kwargs={"filename": "test.prof"})
+        request = RequestFactory().get(url)
+        request.user = User.objects.create(username="username", is_superuser=False)
+        with pytest.raises(PermissionDenied):
+            views.download_profile(request, filename="test.prof")
+
+        request.user = User.objects.create(username="superuser", is_superuser=True)
+        response = views.download_profile(request, filename="test.prof")
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"profile"
+
+        with pytest.raises(Http404):
+            views.download_profile(request, filename="missing.prof")
+
+        with pytest.raises(Http404):
+            views.download_profile(request, filename="../test.prof")
+
+
 @pytest.mark.usefixtures("import_default_vendors")
 class TestChangeConfiguration:
     URL_NAME = "productdb_config:change_settings"
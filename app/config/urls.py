@@ -9,6 +9,7 @@ urlpatterns = [
     # user views
     url(r'^change/$', views.change_configuration, name='change_settings'),
     url(r'^status/$', views.status, name='status'),
+    url(r'^status/profiles/(?P<filename>[\w\-.]+\.prof)$', views.download_profile, name='download_profile'),
     url(r'^flush_cache/$', views.flush_cache, name='flush_cache'),
     url(r'^messages/$', views.server_messages_list, name='notification-list'),
     url(r'^messages/add/$', views.add_notification, name='notification-add'),
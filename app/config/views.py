@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.cache import cache
 from django.urls import reverse
-from django.http import Http404
+from django.http import Http404, FileResponse
 from django.shortcuts import resolve_url, redirect, render
 from django.utils.safestring import mark_safe
 from app.config.settings import AppSettings
@@ -12,6 +12,7 @@ from app.config.forms import SettingsForm, NotificationMessageForm
 from app.config.models import NotificationMessage, TextBlock
 from app.config import utils
 from app.productdb.utils import login_required_if_login_only_mode
+from django_project import profiling
 
 
 @login_required()
@@ -74,9 +75,32 @@ def status(request):
     # determine worker status
     context['worker_status'] = mark_safe(utils.get_celery_worker_state_html())
 
+    context["profiling_enabled"] = settings.PDB_ENABLE_PROFILING
+    if settings.PDB_ENABLE_PROFILING:
+        context["profile_files"] = profiling.get_profile_files()
+
     return render(request, "config/status.html", context=context)
 
 
+@login_required()
+@permission_required('is_superuser', raise_exception=True)
+def download_profile(request, filename):
+    """
+    download a stored profile of a request or task
+    """
+    try:
+        path = profiling.get_profile_file_path(filename)
+
+    except ValueError:
+        raise Http404("Profile not found")
+
+    try:
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=filename)
+
+    except FileNotFoundError:
+        raise Http404("Profile not found")
+
+
 @login_required()
 @permission_required('is_superuser', raise_exception=True)
 def flush_cache(request):
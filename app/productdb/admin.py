@@ -1,9 +1,16 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils.functional import cached_property
 from app.productdb.forms import ProductMigrationOptionForm
 from app.productdb.models import Product, Vendor, ProductGroup, ProductList, ProductMigrationOption, \
-    ProductMigrationSource, ProductCheck, ProductCheckEntry, ProductIdNormalizationRule
+    ProductMigrationSource, ProductCheck, ProductCheckEntry, ProductIdNormalizationRule, \
+    get_preferred_replacement_options
 from app.productdb.models import UserProfile
 from django.contrib.auth.models import Permission
 
@@ -33,8 +40,50 @@ class UserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline, )
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    paginator that uses the row estimate of the PostgreSQL statistics instead of a COUNT(*) for unfiltered querysets
+    of large tables (the exact count is used for filtered querysets and for tables below the threshold)
+    """
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self.get_estimated_count(queryset.model)
+            if estimate > self.ESTIMATE_THRESHOLD:
+                return estimate
+
+        # count only the primary keys, otherwise the annotations of the queryset are part of the count query
+        return queryset.values("pk").order_by().count()
+
+    @staticmethod
+    def get_estimated_count(model):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [model._meta.db_table])
+            row = cursor.fetchone()
+
+        return int(row[0]) if row else 0
+
+
+class ProductChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+
+        # resolve the preferred replacement options of all Products on the page at once
+        products = list(self.result_list)
+        product_ids = [p.id for p in products if getattr(p, "annotated_has_preferred_migration_option", True)]
+        options = get_preferred_replacement_options(product_ids) if product_ids else {}
+        for product in products:
+            product.resolved_preferred_replacement_option = options.get(product.id, None)
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     list_display = (
         "product_id",
         "description",
@@ -44,6 +93,7 @@ class ProductAdmin(admin.ModelAdmin):
         "end_of_support_date",
         "has_migration_options",
         "product_migration_source_names",
+        "preferred_replacement_option",
         "lc_state_sync",
     )
 
@@ -57,7 +107,6 @@ class ProductAdmin(admin.ModelAdmin):
         "product_id",
         "description",
         "tags",
-        "vendor__name",
     )
 
     fieldsets = (
@@ -101,14 +150,52 @@ class ProductAdmin(admin.ModelAdmin):
         "lc_state_sync",
     )
 
+    def get_queryset(self, request):
+        """annotate the values of the migration options, otherwise every row requires additional queries"""
+        migration_options = ProductMigrationOption.objects.filter(product=OuterRef("pk"))
+        migration_source_names = migration_options.order_by().values("product").annotate(
+            names=ArrayAgg(
+                "migration_source__name",
+                ordering=("-migration_source__preference", "migration_source__name")
+            )
+        ).values("names")
+
+        return super().get_queryset(request).select_related("vendor", "product_group").annotate(
+            annotated_has_migration_options=Exists(migration_options),
+            annotated_has_preferred_migration_option=Exists(migration_options.filter(
+                migration_source__preference__gt=Product.LESS_PREFERRED_PREFERENCE_VALUE
+            )),
+            annotated_migration_source_names=Subquery(migration_source_names),
+        )
+
     def has_migration_options(self, obj):
+        if hasattr(obj, "annotated_has_migration_options"):
+            return obj.annotated_has_migration_options
         return obj.has_migration_options()
 
+    has_migration_options.boolean = True
+    has_migration_options.admin_order_field = "annotated_has_migration_options"
+
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
+
     def preferred_replacement_option(self, obj):
-        result = obj.get_preferred_replacement_option()
+        if hasattr(obj, "resolved_preferred_replacement_option"):
+            # resolved for the entire page of the changelist
+            result = obj.resolved_preferred_replacement_option
+
+        elif not getattr(obj, "annotated_has_preferred_migration_option", True):
+            # the migration path is only calculated if a preferred migration option exists
+            return ""
+
+        else:
+            result = obj.get_preferred_replacement_option()
+
         return result.replacement_product_id if result else ""
 
     def product_migration_source_names(self, obj):
+        if hasattr(obj, "annotated_migration_source_names"):
+            return "\n".join(obj.annotated_migration_source_names or [])
         return "\n".join(obj.get_product_migration_source_names_set())
 
     def current_lifecycle_states(self, obj):
@@ -123,6 +210,9 @@ class ProductAdmin(admin.ModelAdmin):
 
 @admin.register(ProductGroup)
 class ProductGroupAdmin(admin.ModelAdmin):
+    list_select_related = (
+        "vendor",
+    )
     list_display = (
         "name",
         "vendor"
@@ -162,6 +252,11 @@ class ProductMigrationSourceAdmin(admin.ModelAdmin):
 @admin.register(ProductMigrationOption)
 class ProductMigrationOptionAdmin(admin.ModelAdmin):
     form = ProductMigrationOptionForm
+    list_select_related = (
+        "product",
+        "migration_source",
+        "replacement_db_product",
+    )
     list_display = (
         "product",
         "replacement_product_id",
@@ -1,5 +1,7 @@
 from django.contrib.auth import logout
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.urls import reverse
+from django.utils.timezone import timedelta, now
 from django.utils.decorators import method_decorator
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -7,17 +9,24 @@ from rest_framework import permissions, status
 from rest_framework import filters
 from rest_framework.authtoken.models import Token
 from rest_framework.generics import GenericAPIView
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
 
 from app.config.models import NotificationMessage
 from app.productdb.serializers import ProductSerializer, VendorSerializer, ProductGroupSerializer, ProductListSerializer, \
     ProductMigrationSourceSerializer, ProductMigrationOptionSerializer, NotificationMessageSerializer, \
-    ProductIdNormalizationRuleSerializer
+    ProductIdNormalizationRuleSerializer, ProductValuesSerializer, ProductListProductSerializer
 from app.productdb.models import Product, Vendor, ProductGroup, ProductList, ProductMigrationSource, \
-    ProductMigrationOption, ProductIdNormalizationRule
+    ProductMigrationOption, ProductIdNormalizationRule, ProductCheck, get_preferred_replacement_options, \
+    get_product_id_normalizers
+from app.productdb import utils
+import app.productdb.tasks as tasks
+from django_project.renderers import FastJSONRenderer
 from rest_framework import viewsets
 from rest_framework.decorators import action
 
@@ -319,6 +328,33 @@ class ProductListViewSet(viewsets.ReadOnlyModelViewSet):
     filter_class = ProductListFilter
     permission_classes = (permissions.DjangoModelPermissions,)
 
+    @swagger_auto_schema(
+        tags=["Product Lists"],
+        operation_id="v1_productlist_products",
+        operation_description="paginated list of the Products within a Product List by `id` (including the current "
+                              "lifecycle states and the preferred replacement option)",
+    )
+    @action(detail=True, serializer_class=ProductListProductSerializer)
+    def products(self, request, id=None):
+        """
+        returns the Products within the Product List
+        """
+        product_list = self.get_object()
+        queryset = Product.objects.filter(product_list_entries__product_list=product_list).select_related(
+            "vendor", "product_group"
+        ).order_by("product_id")
+
+        page = self.paginate_queryset(queryset)
+        products = list(page if page is not None else queryset)
+
+        context = self.get_serializer_context()
+        context["preferred_replacement_options"] = get_preferred_replacement_options([p.id for p in products])
+        serializer = self.get_serializer_class()(products, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+
+        return Response(serializer.data)
+
 
 class ProductFilter(django_filters.FilterSet):
     vendor = django_filters.CharFilter(field_name="vendor__name", lookup_expr="startswith")
@@ -388,6 +424,22 @@ class ProductViewSet(viewsets.ModelViewSet):
     filter_class = ProductFilter
     search_fields = ("$product_id", "$description", "$tags")
     permission_classes = (permissions.DjangoModelPermissions,)
+    renderer_classes = [
+        FastJSONRenderer if renderer is JSONRenderer else renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+    ]
+
+    def list(self, request, *args, **kwargs):
+        """
+        read-only fast path that serializes the values of the Products (same representation as the ProductSerializer)
+        """
+        serializer = ProductValuesSerializer(self.get_serializer())
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.value_names)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+
+        return Response(serializer.to_representation(queryset))
 
     @swagger_auto_schema(
         tags=["Base Data"],
@@ -535,21 +587,20 @@ class ProductIdNormalizationRuleViewSet(viewsets.ReadOnlyModelViewSet):
         vendor = vendor_qs.first()
         product_id = input_string
         product_in_database = None
-        matched_rule = None
 
-        # apply rules on input string
-        rules = ProductIdNormalizationRule.objects.filter(vendor=vendor).order_by("priority").order_by("product_id")
-        for rule in rules:
-            if rule.matches(input_string):
-                product_id = rule.get_normalized_product_id(product_id)
+        # apply the (precompiled) rules of the vendor on the input string
+        matched_rule = None
+        normalizer = get_product_id_normalizers().get(vendor.id, None)
+        if normalizer is not None:
+            normalized_product_id, matched_rule = normalizer.match(input_string)
 
-                # lookup in local database
-                pqs = Product.objects.filter(product_id=product_id, vendor=vendor)
-                if pqs.count() != 0:
-                    product_in_database = pqs.first().id
+        if matched_rule is not None:
+            product_id = normalized_product_id
 
-                matched_rule = rule.id
-                break
+            # lookup in local database
+            product_in_database = Product.objects.filter(
+                product_id=product_id, vendor=vendor
+            ).values_list("id", flat=True).first()
 
         return Response({
             "vendor_id": vendor.id,
@@ -559,6 +610,149 @@ class ProductIdNormalizationRuleViewSet(viewsets.ReadOnlyModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
+class ShowInventoryProductCheckApiView(GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def get_queryset(self):
+        return ProductCheck.objects.filter(create_user=self.request.user)
+
+    @swagger_auto_schema(
+        tags=["Product Checks"],
+        operation_id="v1_productcheck_show_inventory",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["name"],
+            properties={
+                "name": openapi.Schema(type=openapi.TYPE_STRING, description="name of the Product Check"),
+                "outputs": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                    description="list of show inventory outputs (e.g. one per device)"
+                ),
+                "migration_source": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="ID of the Product Migration Source (if not set, the preferred migration path is used)"
+                ),
+                "public": openapi.Schema(
+                    type=openapi.TYPE_BOOLEAN,
+                    description="if true, the Product Check is visible to everyone"
+                ),
+            }
+        ),
+        responses={
+            status.HTTP_202_ACCEPTED: openapi.Response(
+                "Product Check created and scheduled",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "product_check": openapi.Schema(
+                            type=openapi.TYPE_INTEGER,
+                            description="ID of the Product Check"
+                        ),
+                        "task_id": openapi.Schema(
+                            type=openapi.TYPE_STRING,
+                            description="ID of the task that executes the Product Check"
+                        ),
+                        "unique_product_ids": openapi.Schema(
+                            type=openapi.TYPE_INTEGER,
+                            description="amount of unique Product IDs that were found in the outputs"
+                        ),
+                        "amount_of_products": openapi.Schema(
+                            type=openapi.TYPE_INTEGER,
+                            description="amount of Product IDs that were found in the outputs"
+                        ),
+                        "url": openapi.Schema(
+                            type=openapi.TYPE_STRING,
+                            description="URL of the Product Check"
+                        ),
+                    }
+                )
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                "invalid request (e.g. parameters missing)",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "error": openapi.Schema(
+                            type=openapi.TYPE_STRING,
+                            description="error message"
+                        )
+                    }
+                )
+            )
+        }
+    )
+    def post(self, request):
+        """
+        Create a Product Check from the output of multiple Cisco IOS `show inventory` commands.
+
+        The outputs are either provided as a list of strings in the `outputs` field or as uploaded text files (multiple
+        `files` fields). A file can also be a .zip/.tar(.gz) archive with one text file per device. The Product IDs of
+        all outputs are aggregated and the Product Check is scheduled immediately.
+        """
+        name = request.data.get("name", None)
+        if not name:
+            return Response({"error": "name parameter required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if hasattr(request.data, "getlist"):
+            contents = request.data.getlist("outputs")
+
+        else:
+            contents = request.data.get("outputs", [])
+
+        if type(contents) is not list or any([type(e) is not str for e in contents]):
+            return Response({"error": "outputs must be a list of strings"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            for uploaded_file in request.FILES.getlist("files"):
+                contents += utils.read_show_inventory_files(uploaded_file)
+
+        except ValueError as ex:
+            return Response({"error": str(ex)}, status=status.HTTP_400_BAD_REQUEST)
+
+        product_amounts = utils.count_cisco_show_inventory_product_ids(contents)
+        if not product_amounts:
+            return Response({"error": "no Product IDs found in the given outputs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        migration_source = None
+        if request.data.get("migration_source", None):
+            try:
+                migration_source = ProductMigrationSource.objects.get(id=request.data["migration_source"])
+
+            except (ProductMigrationSource.DoesNotExist, ValueError, TypeError):
+                return Response({"error": "migration_source not found"}, status=status.HTTP_400_BAD_REQUEST)
+
+        public = str(request.data.get("public", False)).lower() in ["true", "1", "on"]
+
+        product_check = ProductCheck(
+            name=name,
+            migration_source=migration_source,
+            create_user=None if public else request.user
+        )
+        product_check.input_product_ids = utils.convert_product_amounts_to_input_string(product_amounts)
+        try:
+            product_check.save()
+
+        except ValidationError as ex:
+            return Response({
+                "error": "; ".join(["%s: %s" % (key, " ".join(value)) for key, value in ex.message_dict.items()])
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        task = tasks.perform_product_check.apply_async(
+            eta=now() + timedelta(seconds=3),
+            args=(product_check.id, )
+        )
+
+        return Response({
+            "product_check": product_check.id,
+            "task_id": task.id,
+            "unique_product_ids": len(product_amounts),
+            "amount_of_products": sum(product_amounts.values()),
+            "url": reverse("productdb:detail-product_check", kwargs={"product_check_id": product_check.id})
+        }, status=status.HTTP_202_ACCEPTED)
+
+
 class TokenLogoutApiView(GenericAPIView):
     permission_classes = [IsAuthenticated]
 
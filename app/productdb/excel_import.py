@@ -5,7 +5,8 @@ from zipfile import BadZipFile
 import pandas as pd
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from app.productdb.models import Product, CURRENCY_CHOICES, ProductGroup, ProductMigrationSource, ProductMigrationOption
+from app.productdb.models import Product, CURRENCY_CHOICES, ProductGroup, ProductMigrationSource, \
+    ProductMigrationOption, update_replacement_db_product_relations, get_product_id_normalizers, normalize_product_id
 from app.productdb.models import Vendor
 
 logger = logging.getLogger("productdb")
@@ -29,6 +30,8 @@ class BaseExcelImporter:
     required_keys = {"product id", "description", "list price", "vendor"}
     import_converter = None
     drop_na_columns = None
+    # columns that contain Product IDs of the vendor from the row (normalized before the import)
+    product_id_columns = None
     workbook = None
     path = None
     valid_file = False
@@ -44,6 +47,8 @@ class BaseExcelImporter:
             self.import_converter = {}
         if self.drop_na_columns is None:
             self.drop_na_columns = []
+        if self.product_id_columns is None:
+            self.product_id_columns = []
         if user_for_revision:
             self.user_for_revision = user_for_revision
 
@@ -72,6 +77,33 @@ class BaseExcelImporter:
         if len(self.drop_na_columns) != 0:
             self.__wb_data_frame__.dropna(axis=0, subset=self.drop_na_columns, inplace=True)
 
+        self._normalize_product_id_columns()
+
+    def _normalize_product_id_columns(self):
+        """apply the Product ID Normalization Rules of the vendor from the row to all Product ID columns"""
+        columns = [e for e in self.product_id_columns if e in self.__wb_data_frame__.columns]
+        if len(columns) == 0 or len(self.__wb_data_frame__.index) == 0:
+            return
+
+        normalizers = get_product_id_normalizers()
+        vendors = {v.name: v.id for v in Vendor.objects.all()}
+        if "vendor" in self.__wb_data_frame__.columns:
+            vendor_ids = [
+                0 if pd.isnull(e) else vendors.get(str(e).strip(), None) for e in self.__wb_data_frame__["vendor"]
+            ]
+
+        else:
+            vendor_ids = [0] * len(self.__wb_data_frame__.index)
+
+        for column in columns:
+            self.__wb_data_frame__[column] = [
+                # values of unknown vendors are kept (the import of these rows fails anyway)
+                value if pd.isnull(value) or vendor_id is None else normalize_product_id(
+                    str(value), vendor_id=vendor_id, normalizers=normalizers
+                )
+                for value, vendor_id in zip(self.__wb_data_frame__[column], vendor_ids)
+            ]
+
     def verify_file(self):
         if self.workbook is None:
             self._load_workbook()
@@ -154,6 +186,7 @@ class ProductsExcelImporter(BaseExcelImporter):
         "tags": str
     }
     drop_na_columns = ["product id"]
+    product_id_columns = ["product id"]
     valid_imported_products = 0
     invalid_products = 0
 
@@ -164,7 +197,7 @@ class ProductsExcelImporter(BaseExcelImporter):
     def import_to_database(self, status_callback=None, update_only=False):
         """
         Import products from the associated excel sheet to the database
-        :param status_callback: optional status message callback function
+        :param status_callback: optional progress callback function, called with the processed and total entries
         :param update_only: don't create new entries
         """
         if self.workbook is None:
@@ -181,9 +214,8 @@ class ProductsExcelImporter(BaseExcelImporter):
         current_entry = 1
         for index, row in self.__wb_data_frame__.iterrows():
             # update status message if defined
-            if status_callback and (current_entry % 100 == 0):
-                status_callback("Process entry <strong>%s</strong> of "
-                                "<strong>%s</strong>..." % (current_entry, amount_of_entries))
+            if status_callback:
+                status_callback(processed=current_entry, total=amount_of_entries)
 
             faulty_entry = False        # indicates an invalid entry
             created = False             # indicates that the product was created
@@ -438,6 +470,10 @@ class ProductMigrationsExcelImporter(BaseExcelImporter):
         "product id",
         "migration source"
     ]
+    product_id_columns = [
+        "product id",
+        "replacement product id"
+    ]
     import_converter = {
         "product id": str,
         "vendor": str,
@@ -447,10 +483,72 @@ class ProductMigrationsExcelImporter(BaseExcelImporter):
         "migration product info url": str
     }
 
+    # amount of rows that are written to the database within a single transaction
+    chunk_size = 500
+
+    def _get_optional_value(self, row, row_key):
+        """return the value of an optional column or None, if the column is not set"""
+        if row_key in row and not pd.isnull(row[row_key]):
+            return row[row_key]
+
+        return None
+
+    def _resolve_vendors(self):
+        """
+        resolve the vendors for all rows within the file
+        :raises Exception: if an unknown vendor name is used
+        """
+        vendors = {v.name: v for v in Vendor.objects.all()}
+        result = {}
+        for vendor_name in self.__wb_data_frame__["vendor"].unique():
+            if pd.isnull(vendor_name):
+                continue
+
+            if str(vendor_name).strip() not in vendors:
+                raise Exception("unknown vendor '%s'" % vendor_name)
+
+            result[vendor_name] = vendors[str(vendor_name).strip()]
+
+        return result
+
+    def _resolve_migration_sources(self):
+        """
+        resolve (and create if required) the migration sources for all rows within the file
+        :return: dictionary with the Migration Source per name and a dictionary with the validation errors per name
+        """
+        names = [e for e in self.__wb_data_frame__["migration source"].unique() if not pd.isnull(e)]
+        migration_sources = {pms.name: pms for pms in ProductMigrationSource.objects.filter(name__in=names)}
+        invalid_migration_sources = {}
+
+        for name in names:
+            if name not in migration_sources:
+                try:
+                    migration_sources[name] = ProductMigrationSource.objects.create(name=name, preference=10)
+                    self.import_result_messages.append("Product Migration Source \"%s\" was created with a "
+                                                       "preference of 10" % name)
+
+                except ValidationError as ex:
+                    invalid_migration_sources[name] = ex
+
+        return migration_sources, invalid_migration_sources
+
+    def _write_chunk(self, new_options, changed_options):
+        """write a chunk of Product Migration Options within a single transaction"""
+        with transaction.atomic():
+            ProductMigrationOption.objects.bulk_create(new_options)
+            ProductMigrationOption.objects.bulk_update(
+                changed_options,
+                fields=["comment", "replacement_product_id", "migration_product_info_url"]
+            )
+            update_replacement_db_product_relations(
+                set([pmo.replacement_product_id for pmo in new_options + changed_options])
+            )
+
     def import_to_database(self, status_callback=None, update_only=False):
         """
-        Import products from the associated excel sheet to the database
-        :param status_callback: optional status message callback function
+        Import product migrations from the associated excel sheet to the database. The vendors, products and
+        migration sources are resolved up front and the Product Migration Options are written in chunks.
+        :param status_callback: optional progress callback function, called with the processed and total entries
         :param update_only: don't create new entries
         """
         if self.workbook is None:
@@ -458,77 +556,104 @@ class ProductMigrationsExcelImporter(BaseExcelImporter):
         if self.__wb_data_frame__ is None:
             self._create_data_frame()
 
-        # process entries in file
         self.import_result_messages = []
-        current_entry = 1
         amount_of_entries = len(self.__wb_data_frame__.index)
+
+        # resolve all required database objects up front
+        vendors = self._resolve_vendors()
+        default_vendor = Vendor.objects.get(id=0)
+        migration_sources, invalid_migration_sources = self._resolve_migration_sources()
+
+        product_ids = [e for e in self.__wb_data_frame__["product id"].unique() if not pd.isnull(e)]
+        products = {
+            (p.product_id, p.vendor_id): p for p in Product.objects.filter(product_id__in=product_ids)
+        }
+        product_migration_options = {
+            (pmo.product_id, pmo.migration_source_id): pmo for pmo in ProductMigrationOption.objects.filter(
+                product__in=products.values()
+            )
+        }
+
+        option_attributes = {
+            # data frame column name - Product Migration Option attribute
+            "comment": "comment",
+            "replacement product id": "replacement_product_id",
+            "migration product info url": "migration_product_info_url"
+        }
+
+        # process entries in file
+        new_options = []
+        changed_options = {}
+        current_entry = 1
         for index, row in self.__wb_data_frame__.iterrows():
             # update status message if defined
             if status_callback:
-                status_callback("Process entry <strong>%s</strong> of "
-                                "<strong>%s</strong>..." % (current_entry, amount_of_entries))
+                status_callback(processed=current_entry, total=amount_of_entries)
 
-            if row["product id"] == "" or row["product id"] is None:
+            current_entry += 1
+            if row["product id"] == "" or row["product id"] is None or pd.isnull(row["migration source"]):
                 continue
 
-            # check that product is part of the database
-            try:
-                with transaction.atomic():
-                    vendor_name = row["vendor"]
-                    v = Vendor.objects.get(id=0)
-                    if not pd.isnull(row["vendor"]):
-                        qs_v = Vendor.objects.filter(name=str(vendor_name).strip())
-                        if qs_v.count() == 0:
-                            raise Exception("unknown vendor '%s'" % row["vendor"])
+            v = default_vendor if pd.isnull(row["vendor"]) else vendors[row["vendor"]]
 
-                        else:
-                            v = qs_v.first()
-
-                    # update element
-                    product = Product.objects.get(product_id=row["product id"], vendor=v)
-                    migration_source, created = ProductMigrationSource.objects.get_or_create(
-                        name=row["migration source"]
-                    )
-
-                    if created:
-                        migration_source.preference = 10
-                        migration_source.save()
-                        self.import_result_messages.append("Product Migration Source \"%s\" was created with a "
-                                                           "preference of 10" % row["migration source"])
-
-                    pmo, created = ProductMigrationOption.objects.get_or_create(product=product,
-                                                                                migration_source=migration_source)
-                    row_key = "comment"
-                    if row_key in row:  # optional key
-                        if not pd.isnull(row[row_key]):
-                            if pmo.comment != row[row_key]:
-                                pmo.comment = row[row_key]
+            product = products.get((row["product id"], v.id), None)
+            if product is None:
+                self.import_result_messages.append("Product %s not found in database, skip entry" % row["product id"])
+                continue
 
-                    row_key = "replacement product id"
-                    if row_key in row:  # optional key
-                        if not pd.isnull(row[row_key]):
-                            if pmo.replacement_product_id != row[row_key]:
-                                pmo.replacement_product_id = row[row_key]
+            if row["migration source"] in invalid_migration_sources:
+                self.import_result_messages.append("cannot save Product Migration for %s: %s" % (
+                    row["product id"],
+                    str(invalid_migration_sources[row["migration source"]])
+                ))
+                continue
 
-                    row_key = "migration product info url"
-                    if row_key in row:  # optional key
-                        if not pd.isnull(row[row_key]):
-                            if pmo.migration_product_info_url != row[row_key]:
-                                pmo.migration_product_info_url = row[row_key]
+            migration_source = migration_sources[row["migration source"]]
+            key = (product.id, migration_source.id)
+            pmo = product_migration_options.get(key, None)
+            created = pmo is None
+            if created:
+                pmo = ProductMigrationOption(product=product, migration_source=migration_source)
 
-                    pmo.save()
+            previous_values = {attribute: getattr(pmo, attribute) for attribute in option_attributes.values()}
+            for row_key, attribute in option_attributes.items():
+                value = self._get_optional_value(row, row_key)
+                if value is not None:
+                    setattr(pmo, attribute, value)
 
-                    if created:
-                        self.import_result_messages.append("create Product Migration path \"%s\" for Product "
-                                                           "\"%s\"" % (row["migration source"], row["product id"]))
-                    else:
-                        self.import_result_messages.append("update Product Migration path \"%s\" for Product "
-                                                           "\"%s\"" % (row["migration source"], row["product id"]))
+            try:
+                # the relations are resolved within this function, only the field values must be validated
+                pmo.clean_fields(exclude=["product", "migration_source", "replacement_db_product"])
+                if pmo.replacement_product_id == product.product_id:
+                    raise ValidationError({
+                        "replacement_product_id": "Product ID that should be replaced cannot be the same as the "
+                                                  "suggested replacement Product ID"
+                    })
 
             except ValidationError as ex:
                 self.import_result_messages.append("cannot save Product Migration for %s: %s" % (row["product id"],
                                                                                                  str(ex)))
+                # discard the changes from the current row
+                for attribute, value in previous_values.items():
+                    setattr(pmo, attribute, value)
+                continue
 
-            except Product.DoesNotExist:
-                self.import_result_messages.append("Product %s not found in database, skip entry" % row["product id"])
+            if created:
+                new_options.append(pmo)
+                product_migration_options[key] = pmo
+                self.import_result_messages.append("create Product Migration path \"%s\" for Product "
+                                                   "\"%s\"" % (row["migration source"], row["product id"]))
 
+            else:
+                if pmo.pk is not None:
+                    changed_options[pmo.pk] = pmo
+                self.import_result_messages.append("update Product Migration path \"%s\" for Product "
+                                                   "\"%s\"" % (row["migration source"], row["product id"]))
+
+            if len(new_options) + len(changed_options) >= self.chunk_size:
+                self._write_chunk(new_options, list(changed_options.values()))
+                new_options = []
+                changed_options = {}
+
+        if len(new_options) + len(changed_options) != 0:
+            self._write_chunk(new_options, list(changed_options.values()))
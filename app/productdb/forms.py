@@ -165,7 +165,15 @@ class ProductCheckForm(forms.ModelForm):
         label="Product ID list",
         help_text="unordered Product IDs, separated by line breaks or semicolon",
         widget=forms.Textarea(attrs={'cols': 80, 'rows': 10}),
-        required=True
+        required=False
+    )
+
+    show_inventory_file = forms.FileField(
+        label="show inventory file",
+        help_text="text file with the output of one or multiple Cisco IOS <code>show inventory</code> commands or "
+                  "a .zip/.tar(.gz) archive with one text file per device. The Product IDs are added to the "
+                  "Product ID list.",
+        required=False
     )
 
     public_product_check = forms.BooleanField(
@@ -187,12 +195,38 @@ class ProductCheckForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
+        input_product_ids = cleaned_data.get("input_product_ids", "")
+
+        if not input_product_ids and not cleaned_data.get("show_inventory_file"):
+            self.add_error("input_product_ids", forms.ValidationError(
+                self.fields["input_product_ids"].error_messages["required"], code="required"
+            ))
+            return cleaned_data
 
         # check if the output is provided as show inventory output
-        if cleaned_data.get("is_cisco_show_inventory_output", False):
-            cleaned_data["input_product_ids"] = "\n".join(utils.parse_cisco_show_inventory(
-                cleaned_data["input_product_ids"])
-            )
+        if input_product_ids and cleaned_data.get("is_cisco_show_inventory_output", False):
+            input_product_ids = "\n".join(utils.parse_cisco_show_inventory(input_product_ids))
+
+        # add the Product IDs from the uploaded show inventory file(s)
+        if cleaned_data.get("show_inventory_file"):
+            try:
+                product_amounts = utils.count_cisco_show_inventory_product_ids(
+                    utils.read_show_inventory_files(cleaned_data["show_inventory_file"])
+                )
+
+            except ValueError as ex:
+                self.add_error("show_inventory_file", str(ex))
+                return cleaned_data
+
+            if not product_amounts:
+                self.add_error("show_inventory_file", "no Product IDs found in the uploaded file")
+                return cleaned_data
+
+            input_product_ids = "\n".join([
+                e for e in [input_product_ids, utils.convert_product_amounts_to_input_string(product_amounts)] if e
+            ])
+
+        cleaned_data["input_product_ids"] = input_product_ids
 
         return cleaned_data
 
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import timedelta, now
+from app.productdb import tasks
+from app.productdb.models import update_replacement_db_product_relations
+
+
+class Command(BaseCommand):
+    help = "recompute the database relation of the replacement Product IDs for all Product Migration Options"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--async",
+            help="execute the update within the background worker",
+            action="store_true",
+            dest="run_async"
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["run_async"]:
+            eta = now() + timedelta(seconds=3)
+            tasks.update_all_replacement_db_product_relations.apply_async(eta=eta)
+            self.stdout.write("Task successful started...")
+
+        else:
+            count = update_replacement_db_product_relations()
+            self.stdout.write("%d Product Migration Options updated" % count)
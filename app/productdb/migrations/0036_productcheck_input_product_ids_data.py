@@ -0,0 +1,49 @@
+# Generated by Django 2.2.28
+
+import zlib
+from django.db import migrations, models
+
+
+def compress_input_product_id_chunks(apps, schema_editor):
+    ProductCheck = apps.get_model("productdb", "ProductCheck")
+    ProductCheckInputChunks = apps.get_model("productdb", "ProductCheckInputChunks")
+
+    for product_check in ProductCheck.objects.all():
+        value = "".join(ProductCheckInputChunks.objects.filter(
+            product_check=product_check
+        ).order_by("sequence").values_list("input_product_ids_chunk", flat=True))
+        product_check.input_product_ids_data = zlib.compress(value.encode())
+        product_check.save(update_fields=["input_product_ids_data"])
+
+
+def split_input_product_ids_data(apps, schema_editor):
+    ProductCheck = apps.get_model("productdb", "ProductCheck")
+    ProductCheckInputChunks = apps.get_model("productdb", "ProductCheckInputChunks")
+
+    for product_check in ProductCheck.objects.all():
+        data = bytes(product_check.input_product_ids_data or b"")
+        value = zlib.decompress(data).decode() if data else ""
+        chunks = [value[i:i + 65536] for i in range(0, len(value), 65536)]
+        ProductCheckInputChunks.objects.bulk_create([
+            ProductCheckInputChunks(product_check=product_check, input_product_ids_chunk=chunk, sequence=counter)
+            for counter, chunk in enumerate(chunks, start=1)
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productdb', '0035_auto_20201226_1053'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcheck',
+            name='input_product_ids_data',
+            field=models.BinaryField(blank=True, default=b'', editable=False, help_text='zlib compressed input Product IDs (use the input_product_ids property)'),
+        ),
+        migrations.RunPython(compress_input_product_id_chunks, split_input_product_ids_data),
+        migrations.DeleteModel(
+            name='ProductCheckInputChunks',
+        ),
+    ]
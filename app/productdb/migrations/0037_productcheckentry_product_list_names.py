@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28
+
+from django.db import migrations, models
+
+
+def populate_product_list_names(apps, schema_editor):
+    ProductList = apps.get_model("productdb", "ProductList")
+    ProductCheckEntry = apps.get_model("productdb", "ProductCheckEntry")
+
+    product_list_names = dict(ProductList.objects.values_list("hash", "name"))
+    entries = []
+    for entry in ProductCheckEntry.objects.exclude(part_of_product_list=""):
+        entry.product_list_names = "\n".join([
+            product_list_names.get(hash_value, "") for hash_value in entry.part_of_product_list.splitlines()
+        ])
+        entries.append(entry)
+
+    ProductCheckEntry.objects.bulk_update(entries, ["product_list_names"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productdb', '0036_productcheck_input_product_ids_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcheckentry',
+            name='product_list_names',
+            field=models.TextField(blank=True, default='', help_text='names of the product lists that contain the Product (at time of the check, same order as the hash values)', verbose_name='product list names'),
+        ),
+        migrations.RunPython(populate_product_list_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productdb', '0037_productcheckentry_product_list_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcheck',
+            name='result_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='hash value of the normalized input, the migration source and the catalogue data version of the last completed check', max_length=64),
+        ),
+    ]
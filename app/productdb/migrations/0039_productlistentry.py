@@ -0,0 +1,44 @@
+# Generated by Django 2.2.28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_product_list_entries(apps, schema_editor):
+    Product = apps.get_model("productdb", "Product")
+    ProductList = apps.get_model("productdb", "ProductList")
+    ProductListEntry = apps.get_model("productdb", "ProductListEntry")
+
+    for product_list in ProductList.objects.all():
+        # the product list string is normalized on save (one Product ID per line)
+        product_ids = Product.objects.filter(
+            vendor_id=product_list.vendor_id,
+            product_id__in=set(product_list.string_product_list.splitlines())
+        ).values_list("id", flat=True)
+        ProductListEntry.objects.bulk_create([
+            ProductListEntry(product_list=product_list, product_id=product_id) for product_id in product_ids
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productdb', '0038_productcheck_result_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductListEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_list_entries', to='productdb.Product')),
+                ('product_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='productdb.ProductList')),
+            ],
+            options={
+                'verbose_name': 'Product List Entry',
+                'verbose_name_plural': 'Product List Entries',
+                'unique_together': {('product_list', 'product')},
+            },
+        ),
+        migrations.RunPython(populate_product_list_entries, migrations.RunPython.noop),
+    ]
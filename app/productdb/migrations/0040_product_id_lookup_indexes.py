@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productdb', '0039_productlistentry'),
+    ]
+
+    operations = [
+        # functional index for the case-insensitive lookups (product_id__iexact is UPPER("product_id"::text) = UPPER(%s))
+        migrations.RunSQL(
+            'CREATE INDEX "productdb_product_product_id_upper_idx" ON "productdb_product" (UPPER("product_id"::text));',
+            'DROP INDEX IF EXISTS "productdb_product_product_id_upper_idx";'
+        ),
+        migrations.AlterField(
+            model_name='productmigrationoption',
+            name='replacement_product_id',
+            field=models.CharField(blank=True, db_index=True, help_text='the suggested replacement option', max_length=512),
+        ),
+    ]
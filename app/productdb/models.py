@@ -1,6 +1,11 @@
 import hashlib
+import logging
 import re
+import threading
+import uuid
+import zlib
 from collections import Counter
+from contextlib import contextmanager
 from datetime import timedelta
 from django.contrib.auth.models import User
 from django.conf import settings
@@ -9,14 +14,18 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.signals import pre_delete, post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.utils.timezone import datetime, now
+from cacheops import invalidate_model
 from app.config.settings import AppSettings
 from app.productdb.validators import validate_product_list_string
-from app.productdb import utils
+from app.productdb import product_list_export
+
+logger = logging.getLogger("productdb")
 
 CURRENCY_CHOICES = (
     ('EUR', 'Euro'),
@@ -131,6 +140,9 @@ class ProductGroup(models.Model):
         unique_together = ("name", "vendor")
 
 
+PRODUCT_ID_UPPER_INDEX = "productdb_product_product_id_upper_idx"
+
+
 class Product(models.Model):
     END_OF_SUPPORT_STR = "End of Support"
     END_OF_SALE_STR = "End of Sale"
@@ -466,6 +478,8 @@ class Product(models.Model):
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        # the unique index serves also the lookups by Product ID without a vendor, the case-insensitive lookups
+        # (product_id__iexact) use the PRODUCT_ID_UPPER_INDEX (created in migration 0040)
         unique_together = ("product_id", "vendor",)
         ordering = ("product_id",)
 
@@ -514,7 +528,8 @@ class ProductMigrationOption(models.Model):
         max_length=512,
         help_text="the suggested replacement option",
         null=False,
-        blank=True
+        blank=True,
+        db_index=True
     )
     replacement_db_product = models.ForeignKey(
         Product,
@@ -602,6 +617,13 @@ class ProductMigrationOption(models.Model):
         verbose_name_plural = "Product Migration Options"
 
 
+# cache keys and timeout for the serialized Products and the export files of a Product List (the values are
+# refreshed in the background if the list or one of the Products within the list changes)
+PRODUCT_LIST_OBJECTS_CACHE_KEY = "PDB_PRODUCT_LIST_OBJECTS_%d"
+PRODUCT_LIST_EXPORT_CACHE_KEY = "PDB_PRODUCT_LIST_EXPORT_%d_%s"
+PRODUCT_LIST_OBJECTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
 class ProductList(models.Model):
     name = models.CharField(
         max_length=2048,
@@ -659,6 +681,9 @@ class ProductList(models.Model):
         default=""
     )
 
+    # the product list string and vendor ID of the last successful validation
+    _validated_product_list_state = None
+
     def get_string_product_list_as_list(self):
         result = []
         for line in self.string_product_list.splitlines():
@@ -666,11 +691,68 @@ class ProductList(models.Model):
         return sorted([e.strip() for e in result])
 
     def get_product_list_objects(self):
-        q_filter = Q()
-        for product_id in self.get_string_product_list_as_list():
-            q_filter.add(Q(product_id=product_id, vendor_id=self.vendor_id), Q.OR)
+        return Product.objects.filter(
+            vendor_id=self.vendor_id,
+            product_id__in=set(self.get_string_product_list_as_list())
+        ).select_related("vendor", "product_group")
+
+    def get_serialized_product_list_objects(self, refresh=False):
+        """
+        values of all Products within the list that are displayed on the detail page and used for the export. The
+        result is cached per day, because the lifecycle states depend on the current date.
+        :param refresh: ignore the cached value
+        """
+        cache_key = PRODUCT_LIST_OBJECTS_CACHE_KEY % self.id
+        today = datetime.now().date()
+        cached_result = None if refresh else cache.get(cache_key)
+        if cached_result and cached_result["date"] == today:
+            return cached_result["products"]
+
+        products = [
+            {
+                "id": product.id,
+                "product_id": product.product_id,
+                "vendor_name": product.vendor.name,
+                "product_group_name": product.product_group.name if product.product_group else "",
+                "description": product.description,
+                "list_price": product.list_price,
+                "currency": product.currency,
+                "tags": product.tags,
+                "current_lifecycle_states": product.current_lifecycle_states,
+                "eol_ext_announcement_date": product.eol_ext_announcement_date,
+                "end_of_sale_date": product.end_of_sale_date,
+                "end_of_new_service_attachment_date": product.end_of_new_service_attachment_date,
+                "end_of_sw_maintenance_date": product.end_of_sw_maintenance_date,
+                "end_of_routine_failure_analysis": product.end_of_routine_failure_analysis,
+                "end_of_service_contract_renewal": product.end_of_service_contract_renewal,
+                "end_of_sec_vuln_supp_date": product.end_of_sec_vuln_supp_date,
+                "end_of_support_date": product.end_of_support_date,
+                "eol_reference_number": product.eol_reference_number,
+                "eol_reference_url": product.eol_reference_url,
+                "lc_state_sync": product.lc_state_sync,
+                "internal_product_id": product.internal_product_id,
+            } for product in self.get_product_list_objects()
+        ]
+        cache.set(cache_key, {"date": today, "products": products}, PRODUCT_LIST_OBJECTS_CACHE_TIMEOUT)
+
+        return products
+
+    def get_export_file(self, file_format, refresh=False):
+        """
+        content of the export file for the Product List in the given format, cached per day
+        :param file_format: one of the formats from app.productdb.product_list_export.EXPORT_FORMATS
+        :param refresh: ignore the cached value
+        """
+        cache_key = PRODUCT_LIST_EXPORT_CACHE_KEY % (self.id, file_format)
+        today = datetime.now().date()
+        cached_result = None if refresh else cache.get(cache_key)
+        if cached_result and cached_result["date"] == today:
+            return cached_result["content"]
 
-        return Product.objects.filter(q_filter).prefetch_related("vendor", "product_group")
+        content = product_list_export.create_export(self.get_serialized_product_list_objects(), file_format)
+        cache.set(cache_key, {"date": today, "content": content}, PRODUCT_LIST_OBJECTS_CACHE_TIMEOUT)
+
+        return content
 
     def full_clean(self, exclude=None, validate_unique=True):
         # validate product list string together with selected vendor
@@ -678,7 +760,11 @@ class ProductList(models.Model):
         # validation between fields
         self.__discover_vendor_based_on_products()
         if self.vendor is not None:
-            validate_product_list_string(self.string_product_list, self.vendor.id)
+            # skip the validation if the same product list was already validated (e.g. by a ModelForm before save)
+            validated_state = (self.string_product_list, self.vendor.id)
+            if self._validated_product_list_state != validated_state:
+                validate_product_list_string(self.string_product_list, self.vendor.id)
+                self._validated_product_list_state = validated_state
 
         else:
             raise ValidationError("vendor not set")
@@ -698,6 +784,7 @@ class ProductList(models.Model):
         self.hash = hashlib.sha256(s.encode()).hexdigest()
 
         super(ProductList, self).save(**kwargs)
+        self._validated_product_list_state = None
 
     def __discover_vendor_based_on_products(self):
         # discovery vendor based on the products (if not set, used primary for data migration)
@@ -715,6 +802,29 @@ class ProductList(models.Model):
         ordering = ('name',)
 
 
+class ProductListEntry(models.Model):
+    """membership of the Products within a Product List (maintained based on the string_product_list)"""
+    product_list = models.ForeignKey(
+        ProductList,
+        related_name="entries",
+        on_delete=models.CASCADE
+    )
+
+    product = models.ForeignKey(
+        Product,
+        related_name="product_list_entries",
+        on_delete=models.CASCADE
+    )
+
+    def __str__(self):
+        return "%s in %s" % (self.product_id, self.product_list_id)
+
+    class Meta:
+        verbose_name = "Product List Entry"
+        verbose_name_plural = "Product List Entries"
+        unique_together = ("product_list", "product")
+
+
 class UserProfileManager(models.Manager):
     def get_by_natural_key(self, username):
         return self.get(user=User.objects.get(username=username))
@@ -759,25 +869,6 @@ class UserProfile(models.Model):
         return "User Profile for %s" % self.user.username
 
 
-class ProductCheckInputChunks(models.Model):
-    """chunks for the input product IDs field in the product check"""
-    sequence = models.PositiveIntegerField()
-
-    input_product_ids_chunk = models.CharField(
-        max_length=65536,
-        null=False,
-        blank=True
-    )
-
-    product_check = models.ForeignKey(
-        "ProductCheck",
-        on_delete=models.CASCADE
-    )
-
-    class Meta:
-        ordering = ['sequence']
-
-
 class ProductCheck(models.Model):
     name = models.CharField(
         verbose_name="Name",
@@ -800,18 +891,26 @@ class ProductCheck(models.Model):
         """if no migration source is choosen, always use the preferred one"""
         return self.migration_source is None
 
-    # buffer value (before save)
-    _input_product_ids = ""
+    input_product_ids_data = models.BinaryField(
+        help_text="zlib compressed input Product IDs (use the input_product_ids property)",
+        blank=True,
+        default=b"",
+        editable=False
+    )
+
+    # buffer values, the input is decompressed, parsed and normalized only once
+    _input_product_ids = None
+    _input_product_ids_list = None
+    _input_product_amounts = None
 
     @property
     def input_product_ids(self):
-        """return concat string of all input product id chunks"""
-        if self._input_product_ids == "":
-            values = self.productcheckinputchunks_set.values_list("input_product_ids_chunk", flat=True)
-            return "".join(values)
+        """return the raw input Product IDs string"""
+        if self._input_product_ids is None:
+            data = bytes(self.input_product_ids_data or b"")
+            self._input_product_ids = zlib.decompress(data).decode() if data else ""
 
-        else:
-            return self._input_product_ids
+        return self._input_product_ids
 
     @input_product_ids.setter
     def input_product_ids(self, value):
@@ -819,13 +918,34 @@ class ProductCheck(models.Model):
             raise AttributeError("value must be a string type")
 
         self._input_product_ids = value
+        self._input_product_ids_list = None
+        self._input_product_amounts = None
+        self.input_product_ids_data = zlib.compress(value.encode())
 
     @property
     def input_product_ids_list(self):
-        result = []
-        for line in [line.strip() for line in self.input_product_ids.splitlines() if line.strip() != ""]:
-            result += line.split(";")
-        return sorted([e.strip() for e in result])
+        if self._input_product_ids_list is None:
+            result = []
+            for line in [line.strip() for line in self.input_product_ids.splitlines() if line.strip() != ""]:
+                result += line.split(";")
+            self._input_product_ids_list = sorted([e.strip() for e in result])
+
+        return list(self._input_product_ids_list)
+
+    @property
+    def input_product_amounts(self):
+        """
+        amount of each unique (non-empty) normalized Product ID within the input, see
+        normalize_product_ids_without_vendor
+        """
+        if self._input_product_amounts is None:
+            product_ids = self.input_product_ids_list
+            normalized_product_ids = normalize_product_ids_without_vendor(product_ids)
+            amounts = Counter([normalized_product_ids[e] for e in product_ids])
+            amounts.pop("", None)
+            self._input_product_amounts = amounts
+
+        return Counter(self._input_product_amounts)
 
     last_change = models.DateTimeField(
         auto_now=True
@@ -850,51 +970,116 @@ class ProductCheck(models.Model):
         blank=True
     )
 
+    result_hash = models.CharField(
+        help_text="hash value of the normalized input, the migration source and the catalogue data version of the "
+                  "last completed check",
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True
+    )
+
     @property
     def in_progress(self):
         """product check is currently processed"""
         return self.task_id is not None
 
-    def perform_product_check(self):
-        """perform the product check and populate the ProductCheckEntries"""
-        unique_products = [line.strip() for line in set(self.input_product_ids_list) if line.strip() != ""]
-        amounts = Counter(self.input_product_ids_list)
+    def get_result_hash(self):
+        """
+        hash value that identifies the result of the product check, identical checks (same input Product IDs and
+        amounts, same migration source and no catalogue changes in between) have the same result
+        """
+        amounts = self.input_product_amounts
+        normalized_input = "\n".join(["%s;%d" % (product_id, amounts[product_id]) for product_id in sorted(amounts)])
+        s = "%s:%s:%s" % (normalized_input, self.migration_source_id or "", get_catalogue_data_version())
+        return hashlib.sha256(s.encode()).hexdigest()
+
+    def copy_previous_product_check_result(self, result_hash):
+        """
+        clone the ProductCheckEntries of a completed Product Check with the same result hash
+        :param result_hash: result hash of this Product Check (see get_result_hash)
+        :return: True, if the entries were copied
+        """
+        source_check = ProductCheck.objects.filter(
+            result_hash=result_hash,
+            task_id__isnull=True
+        ).exclude(id=self.id).order_by("-last_change").first()
+        if source_check is None:
+            return False
+
+        entries = [
+            ProductCheckEntry(product_check=self, **values) for values in source_check.productcheckentry_set.values(
+                "input_product_id",
+                "product_in_database_id",
+                "amount",
+                "migration_product_id",
+                "part_of_product_list",
+                "product_list_names"
+            )
+        ]
+        if len(entries) != len(self.input_product_amounts):
+            # source check changed in the meantime
+            return False
+
+        with transaction.atomic():
+            self.productcheckentry_set.all().delete()
+            ProductCheckEntry.objects.bulk_create(entries, batch_size=1000)
+
+        return True
+
+    def perform_product_check(self, status_callback=None):
+        """
+        perform the product check and populate the ProductCheckEntries (reuses the result of an identical check if
+        possible)
+        :param status_callback: optional progress callback function, called with the processed and total entries
+        """
+        amounts = self.input_product_amounts
+        result_hash = self.get_result_hash()
+        self.result_hash = ""
+
+        if not self.copy_previous_product_check_result(result_hash):
+            # clean all entries
+            self.productcheckentry_set.all().delete()
 
-        # clean all entries
-        self.productcheckentry_set.all().delete()
+            self.create_product_check_entries(amounts, status_callback=status_callback)
+
+        self.complete_product_check(result_hash, len(amounts))
+
+    def complete_product_check(self, result_hash, amount_of_unique_products):
+        """
+        update the statistics and store the result hash of a completed Product Check
+        :param result_hash: result hash at the beginning of the check (see get_result_hash)
+        :param amount_of_unique_products: amount of unique input Product IDs
+        """
+        AppSettings().increment_product_check_statistics(1, amount_of_unique_products)
+
+        self.result_hash = result_hash
+        self.save()
+
+    def create_product_check_entries(self, input_product_amounts, status_callback=None):
+        """
+        populate the ProductCheckEntries for the given (unique) input Product IDs, used for the entire check or a
+        single shard of it
+        :param input_product_amounts: amount of each unique (normalized) input Product ID, see input_product_amounts
+        :param status_callback: optional progress callback function, called with the processed and total entries
+        """
+        for counter, (input_product_id, amount) in enumerate(input_product_amounts.items(), start=1):
+            if status_callback:
+                status_callback(processed=counter, total=len(input_product_amounts))
 
-        for input_product_id in unique_products:
             product_entry, _ = ProductCheckEntry.objects.get_or_create(
                 input_product_id=input_product_id,
                 product_check=self
             )
-            product_entry.amount = amounts[input_product_id]
+            product_entry.amount = amount
             product_entry.discover_product_list_values()
 
             product_entry.save()
 
-        # increments statistics
-        settings = AppSettings()
-        settings.set_amount_of_product_checks(settings.get_amount_of_product_checks() + 1)
-        settings.set_amount_of_unique_product_check_entries(settings.get_amount_of_unique_product_check_entries() +
-                                                            len(unique_products))
-
-        self.save()
-
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.full_clean()
         super().save(force_insert, force_update, using, update_fields)
 
-        # save chunks to database (if new value is set)
-        if self._input_product_ids != "":
-            self.productcheckinputchunks_set.all().delete()
-
-            chunks = utils.split_string(self._input_product_ids, 65536)
-            counter = 1
-            for chunk in chunks:
-                ProductCheckInputChunks.objects.create(product_check=self, input_product_ids_chunk=chunk, sequence=counter)
-                counter += 1
-
     def __str__(self):
         return self.name
 
@@ -950,21 +1135,65 @@ class ProductCheckEntry(models.Model):
         default=""
     )
 
+    product_list_names = models.TextField(
+        verbose_name="product list names",
+        help_text="names of the product lists that contain the Product (at time of the check, same order as the hash "
+                  "values)",
+        null=False,
+        blank=True,
+        default=""
+    )
+
+    # hash values of the Product Lists that are still valid, see set_current_product_list_hash_values
+    _current_product_list_hash_values = None
+
     @property
     def product_list_hash_values(self):
         """return an unordered list of hash strings that contains the Product at time of the check"""
         return self.part_of_product_list.splitlines()
 
+    @staticmethod
+    def set_current_product_list_hash_values(entries):
+        """
+        lookup the hash values of the Product Lists that are still valid (not changed since the check) for multiple
+        Product Check Entries with a single query
+        """
+        entries = list(entries)
+        hash_values = set()
+        for entry in entries:
+            hash_values.update(entry.product_list_hash_values)
+
+        current_hash_values = set()
+        if len(hash_values) != 0:
+            current_hash_values = set(
+                ProductList.objects.filter(hash__in=hash_values).values_list("hash", flat=True)
+            )
+
+        for entry in entries:
+            entry._current_product_list_hash_values = current_hash_values
+
+        return entries
+
     def get_product_list_names(self):
-        """return an list of Product List Names that contains the Product at time of the check"""
-        self.__discover_product_relation_in_database()
-        return ProductList.objects.filter(hash__in=self.product_list_hash_values).values_list("name", flat=True)
+        """return an list of Product List Names that contains the Product at time of the check (and were not
+        changed since then)"""
+        current_hash_values = self._current_product_list_hash_values
+        if current_hash_values is None:
+            current_hash_values = set(
+                ProductList.objects.filter(hash__in=self.product_list_hash_values).values_list("hash", flat=True)
+            )
+
+        return [
+            name for hash_value, name in zip(self.product_list_hash_values, self.product_list_names.splitlines())
+            if hash_value in current_hash_values
+        ]
 
     def discover_product_list_values(self):
-        """populate the part_of_product_list field"""
-        self.part_of_product_list = ""
+        """populate the part_of_product_list and the product_list_names field"""
         query = ProductList.objects.filter(string_product_list__contains=self.input_product_id)
-        self.part_of_product_list += "\n".join(query.values_list("hash", flat=True))
+        product_lists = list(query.values_list("hash", "name"))
+        self.part_of_product_list = "\n".join([e[0] for e in product_lists])
+        self.product_list_names = "\n".join([e[1] for e in product_lists])
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.full_clean()
@@ -1044,6 +1273,28 @@ class ProductIdNormalizationRule(models.Model):
         super().__init__(*args, **kwargs)
         self._pattern = None
 
+    def clean(self):
+        # the normalized Product ID is used as template for the groups of the regular expression
+        if not self.regex_match:
+            return
+
+        try:
+            pattern = re.compile(self.regex_match)
+
+        except re.error as ex:
+            raise ValidationError({
+                "regex_match": ValidationError("invalid regular expression (%s)" % ex, code="invalid")
+            })
+
+        if self.product_id and not is_valid_normalized_product_id_template(self.product_id, pattern.groups):
+            raise ValidationError({
+                "product_id": ValidationError(
+                    "Product ID must contain a %%s placeholder for each group of the regular expression (%d) and "
+                    "no other placeholders (use %%%% for a literal %%)" % pattern.groups,
+                    code="invalid"
+                )
+            })
+
     def matches(self, raw_product_id):
         """
         returns True if the given Product ID matches the pattern from the instance
@@ -1101,39 +1352,538 @@ def create_user_profile_if_not_exist(sender, instance, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
-@receiver([post_save, post_delete], sender=ProductList)
+PRODUCT_ID_NORMALIZATION_VERSION_CACHE_KEY = "PDB_PRODUCT_ID_NORMALIZATION_VERSION"
+
+
+def is_valid_normalized_product_id_template(product_id, amount_of_groups):
+    """True if the normalized Product ID of a rule can be used with the given amount of regular expression groups"""
+    if amount_of_groups == 0:
+        # the Product ID is used as it is
+        return True
+
+    try:
+        product_id % (("", ) * amount_of_groups)
+
+    except (TypeError, ValueError):
+        return False
+
+    return True
+
+
+class ProductIdNormalizer:
+    """
+    precompiled Product ID Normalization Rules of a single vendor, the first matching rule (ordered by priority and
+    Product ID) is used
+    """
+    def __init__(self, rules):
+        self.rules = []
+        for rule in rules:
+            if not rule.regex_match or not rule.product_id:
+                continue
+
+            try:
+                pattern = re.compile(rule.regex_match)
+
+            except re.error as ex:
+                logger.warning("Product ID Normalization Rule %s ignored, invalid regular expression (%s)" % (
+                    rule.id, ex
+                ))
+                continue
+
+            if not is_valid_normalized_product_id_template(rule.product_id, pattern.groups):
+                logger.warning("Product ID Normalization Rule %s ignored, the Product ID doesn't match the groups of "
+                               "the regular expression" % rule.id)
+                continue
+
+            self.rules.append((pattern, rule.product_id, rule.id))
+
+    def _match(self, product_id):
+        for pattern, normalized_product_id, rule_id in self.rules:
+            match = pattern.match(product_id)
+            if not match:
+                continue
+
+            if pattern.groups == 0:
+                return normalized_product_id, rule_id
+
+            try:
+                # optional groups that didn't participate in the match are empty
+                return normalized_product_id % match.groups(""), rule_id
+
+            except (TypeError, ValueError) as ex:
+                logger.warning("Product ID Normalization Rule %s skipped, cannot create the Product ID (%s)" % (
+                    rule_id, ex
+                ))
+
+        return product_id, None
+
+    def match(self, raw_product_id):
+        """
+        normalize the given Product ID (the upper-case variant is used if the Product ID itself doesn't match)
+        :return: tuple with the normalized Product ID and the ID of the matching rule (None if no rule matches)
+        """
+        product_id = raw_product_id.strip()
+        normalized_product_id, rule_id = self._match(product_id)
+        if rule_id is None and product_id != product_id.upper():
+            normalized_upper_product_id, rule_id = self._match(product_id.upper())
+            if rule_id is not None:
+                return normalized_upper_product_id, rule_id
+
+        return normalized_product_id, rule_id
+
+
+_product_id_normalizers = {
+    "version": None,
+    "normalizers": {}
+}
+
+
+def get_product_id_normalization_version():
+    version = cache.get(PRODUCT_ID_NORMALIZATION_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PRODUCT_ID_NORMALIZATION_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(PRODUCT_ID_NORMALIZATION_VERSION_CACHE_KEY)
+
+    return str(version)
+
+
+def update_product_id_normalization_version():
+    """create a new version of the normalization rules, all process local copies are reloaded on next access"""
+    cache.set(PRODUCT_ID_NORMALIZATION_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def get_product_id_normalizers():
+    """
+    precompiled normalization rules per vendor ID, the rules are loaded once per process and reloaded after a rule
+    was changed
+    """
+    version = get_product_id_normalization_version()
+    if _product_id_normalizers["version"] != version:
+        rules = {}
+        for rule in ProductIdNormalizationRule.objects.all().order_by("priority", "product_id").nocache():
+            rules.setdefault(rule.vendor_id, []).append(rule)
+
+        _product_id_normalizers["normalizers"] = {
+            vendor_id: ProductIdNormalizer(vendor_rules) for vendor_id, vendor_rules in rules.items()
+        }
+        _product_id_normalizers["version"] = version
+
+    return _product_id_normalizers["normalizers"]
+
+
+def normalize_product_id(raw_product_id, vendor_id, normalizers=None):
+    """
+    canonical form of the given Product ID of a vendor that is used within the database
+    :param raw_product_id: raw Product ID
+    :param vendor_id: ID of the vendor, whose rules are applied
+    :param normalizers: result of get_product_id_normalizers (should be reused when normalizing multiple values)
+    :return:
+    """
+    if normalizers is None:
+        normalizers = get_product_id_normalizers()
+
+    if vendor_id in normalizers:
+        normalized_product_id, rule_id = normalizers[vendor_id].match(raw_product_id)
+        if rule_id is not None:
+            return normalized_product_id
+
+    return raw_product_id.strip()
+
+
+def normalize_product_ids_without_vendor(raw_product_ids, normalizers=None):
+    """
+    canonical form of Product IDs without a vendor (e.g. the input of a Product Check). A Product ID that is already
+    part of the database is kept, otherwise the result of the first vendor (by ID) is used that resolves to a Product
+    of this vendor.
+    :param raw_product_ids: list of raw Product IDs
+    :param normalizers: result of get_product_id_normalizers
+    :return: dictionary with the normalized Product ID for every (stripped) raw Product ID
+    """
+    if normalizers is None:
+        normalizers = get_product_id_normalizers()
+
+    result = {}
+    candidates = {}
+    for product_id in set([e.strip() for e in raw_product_ids]):
+        result[product_id] = product_id
+        for vendor_id in sorted(normalizers.keys()):
+            normalized_product_id, rule_id = normalizers[vendor_id].match(product_id)
+            if rule_id is not None and normalized_product_id != product_id:
+                candidates.setdefault(product_id, []).append((normalized_product_id, vendor_id))
+
+    if len(candidates) == 0:
+        return result
+
+    lookup_product_ids = set(candidates.keys())
+    for values in candidates.values():
+        lookup_product_ids.update([normalized_product_id for normalized_product_id, _ in values])
+
+    existing_products = set(
+        Product.objects.filter(product_id__in=lookup_product_ids).values_list("product_id", "vendor_id").nocache()
+    )
+    existing_product_ids = set([product_id for product_id, _ in existing_products])
+
+    for product_id, values in candidates.items():
+        if product_id in existing_product_ids:
+            continue
+
+        for value in values:
+            if value in existing_products:
+                result[product_id] = value[0]
+                break
+
+    return result
+
+
+@receiver([post_save, post_delete], sender=ProductIdNormalizationRule)
+def update_product_id_normalization_version_on_change(sender, instance, **kwargs):
+    """
+    update the normalization rule version, the version is updated again after the commit so that no other process
+    keeps a copy of the rules that was loaded before the change was visible
+    """
+    update_product_id_normalization_version()
+    transaction.on_commit(update_product_id_normalization_version)
+
+
+CATALOGUE_DATA_VERSION_CACHE_KEY = "PDB_CATALOGUE_DATA_VERSION"
+
+
+def get_catalogue_data_version():
+    """
+    version of the data that is used within the product checks (Products, Product Migrations and Product Lists), a
+    new version is created whenever this data changes
+    """
+    version = cache.get(CATALOGUE_DATA_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(CATALOGUE_DATA_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(CATALOGUE_DATA_VERSION_CACHE_KEY)
+
+    return str(version)
+
+
+def update_catalogue_data_version():
+    """create a new version of the catalogue data (previous product check results are no longer reused)"""
+    cache.set(CATALOGUE_DATA_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def update_catalogue_data_version_on_commit():
+    """
+    update the catalogue data version now and again after the commit, so that a product check that runs in between
+    doesn't store a result hash of the new version for the data before the change
+    """
+    update_catalogue_data_version()
+    transaction.on_commit(update_catalogue_data_version)
+
+
+class _BulkOperationState(threading.local):
+    """state of the bulk operation context within the current thread"""
+    def __init__(self):
+        self.depth = 0
+        self.product_ids = set()
+        self.product_list_ids = set()
+        self.product_list_members = set()
+        self.catalogue_changed = False
+
+
+_bulk_operation_state = _BulkOperationState()
+
+
+def is_bulk_operation_active():
+    """True, if the current thread is within a bulk_operation context"""
+    return _bulk_operation_state.depth > 0
+
+
+@contextmanager
+def bulk_operation():
+    """
+    context manager for bulk changes (e.g. Excel imports or the EoX synchronization), suppresses the per-object
+    signal handlers of the Product and Product List models and collects the affected Product IDs and Product List IDs
+    instead. When the outermost context is left, the replacement relations are updated with a single set-based query
+    and the related cache values are invalidated once.
+    """
+    _bulk_operation_state.depth += 1
+    try:
+        yield
+
+    finally:
+        _bulk_operation_state.depth -= 1
+        if _bulk_operation_state.depth == 0:
+            product_ids = _bulk_operation_state.product_ids
+            product_list_ids = _bulk_operation_state.product_list_ids
+            product_list_members = _bulk_operation_state.product_list_members
+            catalogue_changed = _bulk_operation_state.catalogue_changed
+            _bulk_operation_state.product_ids = set()
+            _bulk_operation_state.product_list_ids = set()
+            _bulk_operation_state.product_list_members = set()
+            _bulk_operation_state.catalogue_changed = False
+
+            if catalogue_changed and len(product_ids) == 0:
+                # otherwise updated with the replacement relations
+                update_catalogue_data_version_on_commit()
+
+            if len(product_ids) != 0:
+                update_replacement_db_product_relations(product_ids)
+
+                # import within the function to avoid a circular import
+                from app.productdb.tasks import schedule_homepage_statistics_update
+                schedule_homepage_statistics_update()
+
+            if len(product_list_members) != 0:
+                product_list_ids |= get_product_list_ids_for_products(product_list_members)
+
+            for product_list_id in product_list_ids:
+                update_product_list_cache(product_list_id)
+
+
+def update_replacement_db_product_relations(replacement_product_ids=None):
+    """
+    update the replacement_db_product relation of the Product Migration Options with a single query, the replacement
+    Product ID is resolved with the same vendor as the Product of the option and falls back to a Product ID that is
+    unique within the database (otherwise the relation is cleared)
+    :param replacement_product_ids: limit the update to the options that reference one of the given Product IDs
+                                    (all options if None)
+    :return: amount of updated Product Migration Options
+    """
+    same_vendor_product = Product.objects.filter(
+        product_id=OuterRef("replacement_product_id"),
+        vendor__product__id=OuterRef("product_id")
+    ).order_by().values("id")[:1]
+
+    unique_product = Product.objects.filter(
+        product_id=OuterRef("replacement_product_id")
+    ).order_by().values("product_id").annotate(
+        product_count=Count("id"),
+        db_product_id=Min("id")
+    ).filter(product_count=1).values("db_product_id")
+
+    query = ProductMigrationOption.objects.all()
+    if replacement_product_ids is not None:
+        query = query.filter(replacement_product_id__in=list(replacement_product_ids))
+
+    result = query.update(replacement_db_product=Coalesce(
+        Subquery(same_vendor_product),
+        Subquery(unique_product),
+        output_field=models.IntegerField()
+    ))
+    invalidate_model(ProductMigrationOption)
+    update_catalogue_data_version_on_commit()
+
+    return result
+
+
+def get_preferred_replacement_options(product_ids):
+    """
+    preferred replacement option of multiple Products (last element of the preferred migration path, same as
+    Product.get_preferred_replacement_option) with a single query per step of the migration paths
+    :param product_ids: database IDs of the Products
+    :return: dictionary with the database ID of the Product and the ProductMigrationOption (only for Products with a
+             preferred migration option)
+    """
+    options = ProductMigrationOption.objects.select_related("migration_source", "replacement_db_product")
+
+    # the first option is from the most preferred migration source
+    result = {}
+    for option in options.filter(
+        product_id__in=list(product_ids),
+        migration_source__preference__gt=Product.LESS_PREFERRED_PREFERENCE_VALUE
+    ):
+        result.setdefault(option.product_id, option)
+
+    # follow the migration paths until a valid replacement or the end of the path is reached
+    visited = {product_id: {option.product_id} for product_id, option in result.items()}
+    while True:
+        pending = {
+            product_id: option for product_id, option in result.items()
+            if not option.is_valid_replacement() and option.replacement_product_id and
+            option.is_replacement_in_db() and option.replacement_db_product_id not in visited[product_id]
+        }
+        if not pending:
+            break
+
+        next_options = {}
+        for option in options.filter(
+            product_id__in={e.replacement_db_product_id for e in pending.values()},
+            migration_source_id__in={e.migration_source_id for e in pending.values()}
+        ):
+            next_options[(option.product_id, option.migration_source_id)] = option
+
+        for product_id, option in pending.items():
+            # the replacement is visited even if it has no option for the migration source (end of the path)
+            visited[product_id].add(option.replacement_db_product_id)
+            next_option = next_options.get((option.replacement_db_product_id, option.migration_source_id))
+            if next_option:
+                result[product_id] = next_option
+
+    return result
+
+
+def get_product_list_cache_date():
+    """date that is part of the page fragment cache key of the Product List (the lifecycle states depend on it)"""
+    return datetime.now().date().isoformat()
+
+
+def invalidate_product_list_page_cache(product_list_id, include_data=True):
+    """
+    delete the cached page fragments of the Product List
+    :param product_list_id: ID of the Product List
+    :param include_data: delete also the serialized Products and the export files
+    """
+    if include_data:
+        cache.delete_many(
+            [PRODUCT_LIST_OBJECTS_CACHE_KEY % product_list_id] +
+            [PRODUCT_LIST_EXPORT_CACHE_KEY % (product_list_id, f) for f in product_list_export.EXPORT_FORMATS]
+        )
+    for share_link in [False, True]:
+        key = make_template_fragment_key(
+            "productlist_detail",
+            [product_list_id, share_link, get_product_list_cache_date()]
+        )
+        if key:
+            cache.delete(key)
+
+
+def get_product_list_ids_for_products(products):
+    """
+    IDs of all Product Lists that contain at least one of the given Products
+    :param products: iterable of (vendor ID, Product ID) tuples
+    """
+    vendor_products = {}
+    for vendor_id, product_id in products:
+        vendor_products.setdefault(vendor_id, set()).add(product_id)
+
+    query = ProductList.objects.filter(vendor_id__in=vendor_products.keys())
+    if len(vendor_products) == 1:
+        product_ids = next(iter(vendor_products.values()))
+        if len(product_ids) == 1:
+            # pre-filter the lists in the database
+            query = query.filter(string_product_list__contains=next(iter(product_ids)))
+
+    result = set()
+    for product_list_id, vendor_id, string_product_list in query.values_list("id", "vendor_id", "string_product_list"):
+        # the product list string is normalized on save (one Product ID per line)
+        if not vendor_products[vendor_id].isdisjoint(string_product_list.splitlines()):
+            result.add(product_list_id)
+
+    return result
+
+
+def update_product_list_entries(product_list_id):
+    """synchronize the ProductListEntries with the Products of the Product List"""
+    product_list = ProductList.objects.filter(id=product_list_id).first()
+    if product_list is None:
+        return
+
+    product_ids = set(product_list.get_product_list_objects().values_list("id", flat=True))
+    existing_product_ids = set(product_list.entries.values_list("product_id", flat=True))
+
+    if existing_product_ids - product_ids:
+        product_list.entries.filter(product_id__in=existing_product_ids - product_ids).delete()
+
+    ProductListEntry.objects.bulk_create([
+        ProductListEntry(product_list=product_list, product_id=product_id)
+        for product_id in product_ids - existing_product_ids
+    ], ignore_conflicts=True)
+
+
+def update_product_list_cache(product_list_id):
+    """
+    update the ProductListEntries, invalidate the cached values of the Product List and schedule the generation of
+    the new values
+    """
+    update_product_list_entries(product_list_id)
+    invalidate_product_list_page_cache(product_list_id)
+
+    # import within the function to avoid a circular import
+    from app.productdb.tasks import schedule_product_list_prerendering
+    schedule_product_list_prerendering(product_list_id)
+
+
+@receiver(post_save, sender=ProductList)
 def invalidate_page_cache(sender, instance, **kwargs):
-    key = make_template_fragment_key("productlist_detail", [instance.id, False])
-    if key:
-        cache.delete(key)
-    key = make_template_fragment_key("productlist_detail", [instance.id, True])
-    if key:
-        cache.delete(key)
+    if is_bulk_operation_active():
+        _bulk_operation_state.product_list_ids.add(instance.id)
+        return
+
+    update_product_list_cache(instance.id)
+
+
+@receiver(post_delete, sender=ProductList)
+def invalidate_page_cache_of_deleted_list(sender, instance, **kwargs):
+    invalidate_product_list_page_cache(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def update_product_list_cache_for_product(sender, instance, **kwargs):
+    """update the cached values of all Product Lists that contain the Product"""
+    if is_bulk_operation_active():
+        _bulk_operation_state.product_list_members.add((instance.vendor_id, instance.product_id))
+        return
+
+    product_list_ids = get_product_list_ids_for_products([(instance.vendor_id, instance.product_id)])
+    if kwargs.get("signal") is post_save:
+        # the Product ID or vendor of the Product may have changed
+        product_list_ids |= set(ProductListEntry.objects.filter(product=instance).values_list(
+            "product_list_id", flat=True
+        ))
+
+    for product_list_id in product_list_ids:
+        update_product_list_cache(product_list_id)
 
 
 @receiver(post_save, sender=Product)
 def update_db_state_for_the_migration_options_with_product_id(sender, instance, **kwargs):
-    """save all Product Migration Options where the replacement product ID is the same as the Product ID that was
-    saved to update the replacement_in_db flag"""
-    for pmo in ProductMigrationOption.objects.filter(replacement_product_id=instance.product_id):
-        pmo.save()
+    """update the replacement_db_product relation of all Product Migration Options where the replacement product ID is
+    the same as the Product ID that was saved"""
+    if is_bulk_operation_active():
+        _bulk_operation_state.product_ids.add(instance.product_id)
+        return
+
+    update_replacement_db_product_relations([instance.product_id])
 
 
 @receiver([post_save, post_delete], sender=Product)
 def invalidate_product_related_cache_values(sender, instance, **kwargs):
-    """delete cache values that are somehow related to the Product data model"""
-    cache.delete("PDB_HOMEPAGE_CONTEXT")
+    """schedule the update of cache values that are somehow related to the Product data model"""
+    if is_bulk_operation_active():
+        _bulk_operation_state.product_ids.add(instance.product_id)
+        return
+
+    # import within the function to avoid a circular import
+    from app.productdb.tasks import schedule_homepage_statistics_update
+    schedule_homepage_statistics_update()
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductMigrationOption)
+@receiver([post_save, post_delete], sender=ProductMigrationSource)
+@receiver([post_save, post_delete], sender=ProductList)
+@receiver([post_save, post_delete], sender=ProductIdNormalizationRule)
+def update_catalogue_data_version_on_change(sender, instance, **kwargs):
+    """the product check results depend on these models (updated only once within a bulk operation)"""
+    if is_bulk_operation_active():
+        _bulk_operation_state.catalogue_changed = True
+        return
+
+    update_catalogue_data_version_on_commit()
 
 
 @receiver(pre_save, sender=ProductMigrationOption)
 def update_product_migration_replacement_id_relation_field(sender, instance, **kwargs):
     """ensures that a database relation for a replacement product ID exists, if the replacement_product_id is part of
-    the database, validates that these two values cannot be the same"""
+    the database, validates that these two values cannot be the same (within a bulk operation, the relation is
+    updated when the operation is finished)"""
     try:
         # check that the replacement product id is not the same as the original product id (would create a loop
         # within migration path computation)
         if instance.replacement_product_id != instance.product.product_id:
-            instance.replacement_db_product = Product.objects.get(product_id=instance.replacement_product_id)
+            if is_bulk_operation_active():
+                # relation is updated when the bulk operation is finished
+                _bulk_operation_state.product_ids.add(instance.replacement_product_id)
+                return
+
+            # prefer the Product from the same vendor, otherwise the Product ID must be unique in the database
+            query = Product.objects.filter(product_id=instance.replacement_product_id)
+            instance.replacement_db_product = query.filter(vendor_id=instance.product.vendor_id).first() or query.get()
 
         else:
             raise ValidationError({
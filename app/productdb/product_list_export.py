@@ -0,0 +1,94 @@
+"""
+export files for the Product Lists, created from the serialized Products (see
+ProductList.get_serialized_product_list_objects)
+"""
+import csv
+import io
+from openpyxl import Workbook
+
+CSV_FORMAT = "csv"
+XLSX_FORMAT = "xlsx"
+EXPORT_FORMATS = (CSV_FORMAT, XLSX_FORMAT)
+
+EXPORT_CONTENT_TYPES = {
+    CSV_FORMAT: "text/csv",
+    XLSX_FORMAT: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# column title - key of the serialized Product
+EXPORT_COLUMNS = (
+    ("Vendor", "vendor_name"),
+    ("Product ID", "product_id"),
+    ("Product Group", "product_group_name"),
+    ("Description", "description"),
+    ("List Price", "list_price"),
+    ("Currency", "currency"),
+    ("Tags", "tags"),
+    ("Lifecycle State", "current_lifecycle_states"),
+    ("EoL anno", "eol_ext_announcement_date"),
+    ("EoS", "end_of_sale_date"),
+    ("EoNewSA", "end_of_new_service_attachment_date"),
+    ("EoSWM", "end_of_sw_maintenance_date"),
+    ("EoRFA", "end_of_routine_failure_analysis"),
+    ("EoSCR", "end_of_service_contract_renewal"),
+    ("EoVulnServ", "end_of_sec_vuln_supp_date"),
+    ("Last Date of Support", "end_of_support_date"),
+    ("Vendor Bulletin", "eol_reference_url"),
+    ("LC auto-sync", "lc_state_sync"),
+    ("Internal Product ID", "internal_product_id"),
+)
+
+
+def _get_export_value(product, key):
+    value = product.get(key)
+    if value is None:
+        return ""
+
+    if key == "current_lifecycle_states":
+        return ", ".join(value)
+
+    if key == "lc_state_sync":
+        return "Yes" if value else "No"
+
+    return value
+
+
+def get_export_filename(product_list, file_format):
+    return "product list - %s.%s" % (product_list.name, file_format)
+
+
+def create_csv_export(products):
+    """create a semicolon separated CSV file (same format as the export on the detail page)"""
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=";")
+    writer.writerow([title for title, _ in EXPORT_COLUMNS])
+    for product in products:
+        writer.writerow([
+            v.isoformat() if hasattr(v, "isoformat") else v
+            for v in [_get_export_value(product, key) for _, key in EXPORT_COLUMNS]
+        ])
+
+    return output.getvalue().encode("utf-8")
+
+
+def create_xlsx_export(products):
+    """create an Excel workbook with a single sheet that contains the Products"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("products")
+    sheet.append([title for title, _ in EXPORT_COLUMNS])
+    for product in products:
+        sheet.append([_get_export_value(product, key) for _, key in EXPORT_COLUMNS])
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def create_export(products, file_format):
+    if file_format == CSV_FORMAT:
+        return create_csv_export(products)
+
+    elif file_format == XLSX_FORMAT:
+        return create_xlsx_export(products)
+
+    raise ValueError("unsupported export format: %s" % file_format)
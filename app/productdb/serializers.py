@@ -1,6 +1,8 @@
+from collections import OrderedDict
 from rest_framework.serializers import HyperlinkedModelSerializer, BooleanField
 from rest_framework import serializers
-from rest_framework.serializers import ChoiceField, CharField, DecimalField, PrimaryKeyRelatedField
+from rest_framework.serializers import ChoiceField, CharField, DecimalField, PrimaryKeyRelatedField, IntegerField, \
+    HyperlinkedIdentityField
 from django.core.validators import MinValueValidator
 
 from app.config.models import NotificationMessage
@@ -189,6 +191,96 @@ class ProductSerializer(HyperlinkedModelSerializer):
         depth = 0
 
 
+class ProductListProductSerializer(ProductSerializer):
+    """
+    read-only representation of the Products within a Product List, the preferred replacement options are provided
+    by the context (`preferred_replacement_options`, see models.get_preferred_replacement_options)
+    """
+    current_lifecycle_states = serializers.ListField(
+        child=CharField(),
+        read_only=True,
+        help_text="current lifecycle states of the Product"
+    )
+    preferred_replacement_product_id = serializers.SerializerMethodField(
+        help_text="Product ID of the preferred replacement option"
+    )
+    preferred_replacement_db_product = serializers.SerializerMethodField(
+        help_text="database ID of the preferred replacement option (if part of the database)"
+    )
+
+    def _get_preferred_replacement_option(self, obj):
+        return self.context.get("preferred_replacement_options", {}).get(obj.id)
+
+    def get_preferred_replacement_product_id(self, obj):
+        option = self._get_preferred_replacement_option(obj)
+        return option.replacement_product_id if option else None
+
+    def get_preferred_replacement_db_product(self, obj):
+        option = self._get_preferred_replacement_option(obj)
+        return option.replacement_db_product_id if option else None
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + (
+            "current_lifecycle_states",
+            "preferred_replacement_product_id",
+            "preferred_replacement_db_product",
+        )
+        read_only_fields = fields
+
+
+class ProductValuesSerializer:
+    """
+    read-only fast path for the Product list endpoint, creates the same representation as the ProductSerializer from
+    the `values()` of the queryset (no model instances, a single URL lookup and no field traversal per row)
+    """
+    URL_ID_PLACEHOLDER = 987654321
+
+    def __init__(self, serializer):
+        """
+        :param serializer: ProductSerializer instance with the context of the view (required to build the URLs)
+        """
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, HyperlinkedIdentityField):
+                url = str(field.to_representation(Product(id=self.URL_ID_PLACEHOLDER)))
+                self.url_prefix, self.url_suffix = url.split(str(self.URL_ID_PLACEHOLDER), 1)
+                self.fields.append((name, "id", self._get_url))
+
+            elif isinstance(field, PrimaryKeyRelatedField):
+                self.fields.append((name, name + "_id", None))
+
+            elif isinstance(field, (CharField, ChoiceField, IntegerField)):
+                # the values from the database are already in the representation format
+                self.fields.append((name, field.source, None))
+
+            else:
+                self.fields.append((name, field.source, field.to_representation))
+
+    def _get_url(self, value):
+        return "%s%s%s" % (self.url_prefix, value, self.url_suffix)
+
+    @property
+    def value_names(self):
+        return list({e[1]: None for e in self.fields}.keys())
+
+    def to_representation(self, rows):
+        """
+        :param rows: values of the Products, e.g. `queryset.values(*serializer.value_names)`
+        """
+        result = []
+        for row in rows:
+            entry = OrderedDict()
+            for name, value_name, to_representation in self.fields:
+                value = row[value_name]
+                entry[name] = to_representation(value) if to_representation and value is not None else value
+            result.append(entry)
+
+        return result
+
+
 class ProductMigrationOptionSerializer(HyperlinkedModelSerializer):
     product = PrimaryKeyRelatedField(
         many=False,
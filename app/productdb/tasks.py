@@ -1,35 +1,156 @@
 import logging
+import uuid
+from celery import chord
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils.timezone import datetime
 
 from app.config.models import NotificationMessage
 from app.productdb.excel_import import ProductsExcelImporter, InvalidImportFormatException, InvalidExcelFileFormat, \
     ProductMigrationsExcelImporter
-from app.productdb.models import JobFile, ProductCheck
-from django_project.celery import app, TaskState
+from app.productdb.models import JobFile, ProductCheck, Product, ProductList, bulk_operation, \
+    update_replacement_db_product_relations, invalidate_product_list_page_cache
+from app.productdb.product_list_export import EXPORT_FORMATS
+from django_project.celery import app, TaskState, TaskProgressReporter, set_meta_data_for_task
 import time
 
 logger = logging.getLogger("productdb")
 
+HOMEPAGE_STATISTICS_CACHE_KEY = "PDB_HOMEPAGE_STATISTICS"
+HOMEPAGE_STATISTICS_SCHEDULED_CACHE_KEY = "PDB_HOMEPAGE_STATISTICS_SCHEDULED"
+HOMEPAGE_STATISTICS_DEBOUNCE_SECONDS = 30
+
+PRODUCT_LIST_PRERENDERING_SCHEDULED_CACHE_KEY = "PDB_PRODUCT_LIST_PRERENDERING_SCHEDULED_%d"
+PRODUCT_LIST_PRERENDERING_DEBOUNCE_SECONDS = 10
+
+PRODUCT_CHECK_SHARD_PROGRESS_CACHE_KEY = "PDB_PRODUCT_CHECK_SHARD_PROGRESS_%s"
+
+
+def schedule_homepage_statistics_update():
+    """
+    schedule a (debounced) update of the homepage statistics, multiple calls within the debounce interval result in
+    a single task execution
+    """
+    if cache.add(HOMEPAGE_STATISTICS_SCHEDULED_CACHE_KEY, True, HOMEPAGE_STATISTICS_DEBOUNCE_SECONDS * 2):
+        try:
+            update_homepage_statistics.apply_async(countdown=HOMEPAGE_STATISTICS_DEBOUNCE_SECONDS)
+
+        except Exception:  # catch any exception
+            logger.error("cannot schedule the update of the homepage statistics", exc_info=True)
+            cache.delete(HOMEPAGE_STATISTICS_SCHEDULED_CACHE_KEY)
+
+
+@app.task(name="productdb.update_homepage_statistics")
+def update_homepage_statistics():
+    """
+    compute the Product statistics for the homepage with a single query and store them in the cache
+    """
+    # changes that occur while the statistics are computed should schedule another update
+    cache.delete(HOMEPAGE_STATISTICS_SCHEDULED_CACHE_KEY)
+
+    today_date = datetime.now().date()
+    statistics = Product.objects.aggregate(
+        product_count=Count("id"),
+        product_lifecycle_count=Count("id", filter=Q(eox_update_time_stamp__isnull=False)),
+        product_no_eol_announcement_count=Count("id", filter=Q(
+            eox_update_time_stamp__isnull=False,
+            eol_ext_announcement_date__isnull=True
+        )),
+        product_eol_announcement_count=Count("id", filter=Q(
+            eol_ext_announcement_date__isnull=False,
+            end_of_sale_date__gt=today_date
+        )),
+        product_eos_count=Count("id", filter=(
+            Q(end_of_sale_date__lte=today_date, end_of_support_date__gt=today_date) |
+            Q(end_of_sale_date__lte=today_date, end_of_support_date__isnull=True)
+        )),
+        product_eol_count=Count("id", filter=Q(end_of_support_date__lte=today_date)),
+        product_price_count=Count("id", filter=Q(list_price__isnull=False)),
+    )
+    # the lifecycle based values depend on the current date
+    statistics["statistics_date"] = today_date
+    cache.set(HOMEPAGE_STATISTICS_CACHE_KEY, statistics, timeout=None)
+
+    return {
+        "status_message": "homepage statistics updated"
+    }
+
+
+def schedule_product_list_prerendering(product_list_id):
+    """
+    schedule a (debounced) generation of the cached values for the detail page and the export files of a Product List
+    """
+    scheduled_cache_key = PRODUCT_LIST_PRERENDERING_SCHEDULED_CACHE_KEY % product_list_id
+    if cache.add(scheduled_cache_key, True, PRODUCT_LIST_PRERENDERING_DEBOUNCE_SECONDS * 2):
+        try:
+            prerender_product_list.apply_async(
+                kwargs={"product_list_id": product_list_id},
+                countdown=PRODUCT_LIST_PRERENDERING_DEBOUNCE_SECONDS
+            )
+
+        except Exception:  # catch any exception
+            logger.error("cannot schedule the prerendering of the product list %d" % product_list_id, exc_info=True)
+            cache.delete(scheduled_cache_key)
+
+
+@app.task(name="productdb.prerender_product_list")
+def prerender_product_list(product_list_id):
+    """
+    generate the serialized Products for the detail page and the export files of a Product List and store them in
+    the cache
+    """
+    # changes that occur while the values are generated should schedule another update
+    cache.delete(PRODUCT_LIST_PRERENDERING_SCHEDULED_CACHE_KEY % product_list_id)
+
+    product_list = ProductList.objects.filter(id=product_list_id).first()
+    if product_list is None:
+        return {
+            "status_message": "Product List not found, nothing to do"
+        }
+
+    product_list.get_serialized_product_list_objects(refresh=True)
+    for file_format in EXPORT_FORMATS:
+        product_list.get_export_file(file_format, refresh=True)
+
+    # the page fragments are rendered again with the new values
+    invalidate_product_list_page_cache(product_list_id, include_data=False)
+
+    return {
+        "status_message": "Product List %s prerendered" % product_list.name
+    }
+
 
 @app.task(name="productdb.delete_all_product_checks")
 def delete_all_product_checks():
     ProductCheck.objects.all().delete()
 
 
+@app.task(name="productdb.update_replacement_db_product_relations")
+def update_all_replacement_db_product_relations():
+    """
+    recompute the replacement_db_product relation of all Product Migration Options
+    """
+    count = update_replacement_db_product_relations()
+
+    return {
+        "status_message": "%d Product Migration Options updated" % count
+    }
+
+
 @app.task(serializer="json", name="productdb.perform_product_check", bind=True)
 def perform_product_check(self, product_check_id):
     """
-    process the Product Check
+    process the Product Check, large Product Checks are split into shards that are processed in parallel (see
+    PDB_PRODUCT_CHECK_SHARD_SIZE)
     :param self:
     :param product_check_id:
     :return:
     """
-    def update_task_state(status_message):
-        """Update the status message of the task, which is displayed in the watch view"""
-        self.update_state(state=TaskState.PROCESSING, meta={
-            "status_message": status_message
-        })
+    update_task_state = TaskProgressReporter(self)
 
     update_task_state("Load Product Check...")
 
@@ -46,14 +167,153 @@ def perform_product_check(self, product_check_id):
         }
         return result
 
-    update_task_state("Product Check in progress, please wait...")
+    amounts = product_check.input_product_amounts
+    unique_products = sorted(amounts.keys())
+    shard_size = settings.PDB_PRODUCT_CHECK_SHARD_SIZE
+    if len(unique_products) > shard_size:
+        update_task_state("Product Check in progress, please wait...")
+        result_hash = product_check.get_result_hash()
+        product_check.result_hash = ""
+        if product_check.copy_previous_product_check_result(result_hash):
+            product_check.task_id = None
+            product_check.complete_product_check(result_hash, len(unique_products))
+            result = {
+                "status_message": "Product check successful finished."
+            }
+
+            # if the task was executed eager, set state to SUCCESS (required for testing)
+            if self.request.is_eager:
+                self.update_state(state=TaskState.SUCCESS, meta=result)
+
+            return result
+
+        shards = [
+            {product_id: amounts[product_id] for product_id in unique_products[i:i + shard_size]}
+            for i in range(0, len(unique_products), shard_size)
+        ]
+        callback_task_id = start_sharded_product_check(product_check, shards, result_hash)
+        logger.info("product check with ID %d split into %d shards (task %s)" % (
+            product_check.id, len(shards), callback_task_id
+        ))
+        result = {
+            "status_message": "Product check started on %d workers, please wait..." % len(shards)
+        }
+
+    else:
+        update_task_state("Product Check in progress, please wait...")
+
+        product_check.perform_product_check(status_callback=update_task_state)
+        result = {
+            "status_message": "Product check successful finished."
+        }
+        product_check.task_id = None
+        product_check.save()
+
+    # if the task was executed eager, set state to SUCCESS (required for testing)
+    if self.request.is_eager:
+        self.update_state(state=TaskState.SUCCESS, meta=result)
+
+    return result
+
+
+def start_sharded_product_check(product_check, shards, result_hash):
+    """
+    process the shards of a Product Check as a Celery chord, the callback task merges the results. The task ID of
+    the callback is stored in the Product Check, the progress view of the check follows this task.
+    :param product_check: Product Check instance
+    :param shards: list of dictionaries with the amount of each unique input Product ID
+    :param result_hash: result hash at the beginning of the check
+    :return: task ID of the callback
+    """
+    product_check.productcheckentry_set.all().delete()
+
+    callback_task_id = str(uuid.uuid4())
+    product_check.task_id = callback_task_id
+    product_check.save()
+
+    amount_of_products = sum([len(shard) for shard in shards])
+    cache.set(PRODUCT_CHECK_SHARD_PROGRESS_CACHE_KEY % callback_task_id, 0, 60 * 60 * 24)
+    set_meta_data_for_task(
+        task_id=callback_task_id,
+        title="Product check",
+        auto_redirect=True,
+        redirect_to=reverse("productdb:detail-product_check", kwargs={"product_check_id": product_check.id})
+    )
+    app.backend.store_result(callback_task_id, {
+        "status_message": "Product Check in progress, please wait..."
+    }, TaskState.PROCESSING)
+
+    callback = finalize_sharded_product_check.s(
+        product_check_id=product_check.id,
+        amount_of_products=amount_of_products,
+        result_hash=result_hash
+    ).set(task_id=callback_task_id)
+    callback.on_error(abort_sharded_product_check.si(product_check_id=product_check.id))
+
+    chord(
+        perform_product_check_shard.s(
+            product_check_id=product_check.id,
+            input_product_amounts=shard,
+            callback_task_id=callback_task_id,
+            amount_of_products=amount_of_products
+        ) for shard in shards
+    )(callback)
+
+    return callback_task_id
+
+
+@app.task(serializer="json", name="productdb.perform_product_check_shard", bind=True)
+def perform_product_check_shard(self, product_check_id, input_product_amounts, callback_task_id, amount_of_products):
+    """
+    process a shard of a Product Check
+    :param self:
+    :param product_check_id:
+    :param input_product_amounts: amount of each unique input Product ID that is part of the shard
+    :param callback_task_id: task ID of the callback, used to report the progress of the entire check
+    :param amount_of_products: amount of unique input Product IDs of the entire check
+    :return: amount of processed entries
+    """
+    product_check = ProductCheck.objects.get(id=product_check_id)
+    product_check.create_product_check_entries(input_product_amounts)
+
+    try:
+        processed = cache.incr(PRODUCT_CHECK_SHARD_PROGRESS_CACHE_KEY % callback_task_id, len(input_product_amounts))
+        self.update_state(task_id=callback_task_id, state=TaskState.PROCESSING, meta={
+            "status_message": "Product Check in progress, processed <strong>%d</strong> of "
+                              "<strong>%d</strong> Product IDs..." % (processed, amount_of_products),
+            "progress": {
+                "processed": processed,
+                "total": amount_of_products,
+                "rate": None,
+                "eta": None
+            }
+        })
+
+    except Exception:  # catch any exception, progress is optional
+        logger.debug("cannot update the progress of the product check %d" % product_check_id, exc_info=True)
+
+    return len(input_product_amounts)
+
+
+@app.task(serializer="json", name="productdb.finalize_sharded_product_check", bind=True)
+def finalize_sharded_product_check(self, shard_results, product_check_id, amount_of_products, result_hash=""):
+    """
+    chord callback of a sharded Product Check, merges the statistics and completes the check
+    :param self:
+    :param shard_results: amount of processed entries per shard
+    :param product_check_id:
+    :param amount_of_products: amount of unique input Product IDs of the entire check
+    :param result_hash: result hash at the beginning of the check
+    :return:
+    """
+    product_check = ProductCheck.objects.get(id=product_check_id)
+    product_check.task_id = None
+    product_check.complete_product_check(result_hash, amount_of_products)
+    cache.delete(PRODUCT_CHECK_SHARD_PROGRESS_CACHE_KEY % self.request.id)
 
-    product_check.perform_product_check()
     result = {
-        "status_message": "Product check successful finished."
+        "status_message": "Product check successful finished (%d entries processed)." % sum(shard_results)
     }
-    product_check.task_id = None
-    product_check.save()
 
     # if the task was executed eager, set state to SUCCESS (required for testing)
     if self.request.is_eager:
@@ -62,6 +322,17 @@ def perform_product_check(self, product_check_id):
     return result
 
 
+@app.task(serializer="json", name="productdb.abort_sharded_product_check")
+def abort_sharded_product_check(product_check_id):
+    """error callback of a sharded Product Check, the check is no longer in progress"""
+    logger.error("sharded product check with ID %d failed" % product_check_id)
+    ProductCheck.objects.filter(id=product_check_id).update(task_id=None)
+
+    return {
+        "error_message": "Product check failed."
+    }
+
+
 @app.task(serializer="json", name="productdb.import_product_migrations", bind=True)
 def import_product_migrations(self, job_file_id, user_for_revision=None):
     """
@@ -70,11 +341,7 @@ def import_product_migrations(self, job_file_id, user_for_revision=None):
     :param user_for_revision: username that should be used for the revision tracking (only if started manually)
     :return:
     """
-    def update_task_state(status_message):
-        """Update the status message of the task, which is displayed in the watch view"""
-        self.update_state(state=TaskState.PROCESSING, meta={
-            "status_message": status_message
-        })
+    update_task_state = TaskProgressReporter(self)
 
     update_task_state("Try to import uploaded file...")
 
@@ -98,7 +365,8 @@ def import_product_migrations(self, job_file_id, user_for_revision=None):
         import_product_migrations_excel.verify_file()
         update_task_state("File valid, start updating the database...")
 
-        import_product_migrations_excel.import_to_database(status_callback=update_task_state)
+        with bulk_operation():
+            import_product_migrations_excel.import_to_database(status_callback=update_task_state)
         update_task_state("Database import finished, processing results...")
 
         status_message = "<p style=\"text-align: left\">Product migrations successful updated</p>" \
@@ -144,11 +412,7 @@ def import_price_list(self, job_file_id, create_notification_on_server=True, upd
     :param update_only: Don't create new products in the database, update only existing ones
     :param user_for_revision: username that should be used for the revision tracking (only if started manually)
     """
-    def update_task_state(status_message):
-        """Update the status message of the task, which is displayed in the watch view"""
-        self.update_state(state=TaskState.PROCESSING, meta={
-            "status_message": status_message
-        })
+    update_task_state = TaskProgressReporter(self)
 
     update_task_state("Try to import uploaded file...")
 
@@ -173,10 +437,11 @@ def import_price_list(self, job_file_id, create_notification_on_server=True, upd
         update_task_state("File valid, start updating the database...")
 
         # if something goes wrong, rollback all changes
-        with transaction.atomic():
+        with bulk_operation(), transaction.atomic():
             import_products_excel.import_to_database(status_callback=update_task_state, update_only=update_only)
 
         update_task_state("Database import finished, processing results...")
+        update_homepage_statistics()
 
         summary_msg = "User <strong>%s</strong> imported a Product list, %s Products " \
                       "changed." % (user_for_revision, import_products_excel.valid_imported_products)
@@ -0,0 +1,42 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from app.productdb import tasks, models
+
+pytestmark = pytest.mark.django_db
+
+
+class TaskResultMock:
+    id = "MOCK_TASK_ID"
+
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestUpdateReplacementProductsCommand:
+    def test_call(self):
+        group1 = models.ProductMigrationSource.objects.create(name="Group One")
+        root_product = models.Product.objects.create(product_id="C2960XS", vendor=models.Vendor.objects.get(id=1))
+        p = models.Product.objects.create(product_id="C2960XL", vendor=models.Vendor.objects.get(id=1))
+        models.ProductMigrationOption.objects.create(
+            product=root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+        models.ProductMigrationOption.objects.all().update(replacement_db_product=None)
+
+        out = StringIO()
+        call_command("updatereplacementproducts", stdout=out)
+
+        assert out.getvalue() == "1 Product Migration Options updated\n"
+        assert models.ProductMigrationOption.objects.get(product=root_product).replacement_db_product == p
+
+    def test_call_async(self, monkeypatch):
+        monkeypatch.setattr(
+            tasks.update_all_replacement_db_product_relations,
+            "apply_async",
+            lambda *args, **kwargs: TaskResultMock()
+        )
+
+        out = StringIO()
+        call_command("updatereplacementproducts", "--async", stdout=out)
+
+        assert out.getvalue() == "Task successful started...\n"
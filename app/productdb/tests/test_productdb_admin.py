@@ -4,6 +4,7 @@ Test suite for the productdb.admin module
 import datetime
 import pytest
 from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
 from app.productdb import models
 from app.productdb import admin
 
@@ -126,3 +127,80 @@ class TestProductAdmin:
         expected = "test\ntest2"
         assert result == expected
 
+
+    @pytest.mark.usefixtures("import_default_vendors")
+    def test_annotated_changelist_queryset(self, rf, django_assert_max_num_queries):
+        site = AdminSite()
+        product_admin = admin.ProductAdmin(models.Product, site)
+        low_source = models.ProductMigrationSource.objects.create(name="low", preference=10)
+        high_source = models.ProductMigrationSource.objects.create(name="high", preference=60)
+        for counter in range(5):
+            p = models.Product.objects.create(product_id="Product %d" % counter, vendor_id=1)
+            models.ProductMigrationOption.objects.create(product=p, migration_source=low_source)
+            models.ProductMigrationOption.objects.create(
+                product=p,
+                migration_source=high_source,
+                replacement_product_id="Replacement"
+            )
+        models.Product.objects.create(product_id="Product without options", vendor_id=1)
+
+        with django_assert_max_num_queries(1):
+            result = []
+            for obj in product_admin.get_queryset(rf.get("/")).nocache():
+                result.append((
+                    obj.vendor.name,
+                    product_admin.has_migration_options(obj),
+                    product_admin.product_migration_source_names(obj)
+                ))
+
+        assert len(result) == 6
+        assert result[0] == ("Cisco Systems", True, "high\nlow")
+        assert result[-1] == ("Cisco Systems", False, "")
+
+        obj = product_admin.get_queryset(rf.get("/")).get(product_id="Product 1")
+        assert product_admin.preferred_replacement_option(obj) == "Replacement"
+
+        obj = product_admin.get_queryset(rf.get("/")).get(product_id="Product without options")
+        with django_assert_max_num_queries(0):
+            assert product_admin.preferred_replacement_option(obj) == ""
+
+        # the preferred replacement options of the changelist are resolved once per page
+        for counter in range(5, 20):
+            p = models.Product.objects.create(product_id="Product %d" % counter, vendor_id=1)
+            models.ProductMigrationOption.objects.create(
+                product=p,
+                migration_source=high_source,
+                replacement_product_id="Product 0"
+            )
+        request = rf.get("/")
+        request.user = User(username="admin", is_staff=True, is_superuser=True)
+
+        # the list filters, the count, the page and the migration options (independent of the amount of rows)
+        with django_assert_max_num_queries(8):
+            changelist = product_admin.get_changelist_instance(request)
+
+        with django_assert_max_num_queries(0):
+            result = {obj.product_id: product_admin.preferred_replacement_option(obj) for obj in changelist.result_list}
+
+        assert len(result) == 21
+        assert result["Product 1"] == "Replacement"
+        assert result["Product 10"] == "Product 0"
+        assert result["Product without options"] == ""
+
+
+class TestEstimatedCountPaginator:
+    @pytest.mark.usefixtures("import_default_vendors")
+    def test_count(self, monkeypatch):
+        models.Product.objects.create(product_id="Product", vendor_id=1)
+        models.Product.objects.create(product_id="Other Product", vendor_id=1)
+
+        paginator = admin.EstimatedCountPaginator(models.Product.objects.all(), 100)
+        assert paginator.count == 2, "small tables should use the exact count"
+
+        monkeypatch.setattr(admin.EstimatedCountPaginator, "get_estimated_count", staticmethod(lambda model: 1000000))
+        paginator = admin.EstimatedCountPaginator(models.Product.objects.all(), 100)
+        assert paginator.count == 1000000
+        assert paginator.num_pages == 10000
+
+        paginator = admin.EstimatedCountPaginator(models.Product.objects.filter(product_id="Product"), 100)
+        assert paginator.count == 1, "filtered querysets should use the exact count"
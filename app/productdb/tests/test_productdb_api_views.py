@@ -11,12 +11,15 @@ from django.utils.dateformat import DateFormat
 from django.utils.formats import get_format
 from django.conf import settings
 from django.contrib.auth.models import User, Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.utils.datetime_safe import date, datetime
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
 from app.productdb import models
+from app.productdb.serializers import ProductSerializer
 
 from app.config.models import NotificationMessage
 from app.productdb.models import Vendor, ProductGroup, Product, ProductList, ProductMigrationOption, \
@@ -53,6 +56,7 @@ REST_NOTIFICATIONMESSAGES_LIST = reverse("productdb:notificationmessages-list")
 REST_NOTIFICATIONMESSAGES_DETAIL = REST_NOTIFICATIONMESSAGES_LIST + "%d/"
 REST_PRODUCTNORMALIZATIONRULE_LIST = reverse("productdb:productidnormalizationrules-list")
 REST_PRODUCTNORMALIZATIONRULE_DETAIL = REST_PRODUCTNORMALIZATIONRULE_LIST + "%d/"
+REST_PRODUCTCHECK_SHOW_INVENTORY = reverse("productdb:api-productcheck-show_inventory")
 
 COMMON_API_ENDPOINT_BEHAVIOR = [
     REST_VENDOR_LIST,
@@ -2482,6 +2486,38 @@ class TestProductAPIEndpoint:
         assert jdata["pagination"]["total_records"] == 1, "Expect a single entry in the result"
         assert jdata == expected_result, "unexpected result from API endpoint"
 
+    def test_list_fast_path_representation(self):
+        v1 = Vendor.objects.get(id=1)
+        pg = models.ProductGroup.objects.create(vendor=v1, name="TestPG")
+        models.Product.objects.create(
+            product_id="Product A",
+            vendor=v1,
+            product_group=pg,
+            description="Description with \u2028 and \u00fcmlaut",
+            list_price=1234.5,
+            eox_update_time_stamp=date(2020, 1, 1),
+            end_of_sale_date=date(2021, 2, 3),
+            eol_reference_url="https://localhost/eol",
+            lc_state_sync=True
+        )
+        models.Product.objects.create(product_id="Product B", vendor=v1)
+
+        client = APIClient()
+        client.login(**AUTH_USER)
+        response = client.get(REST_PRODUCT_LIST + "?format=json")
+        assert response.status_code == status.HTTP_200_OK
+
+        # the result must be the same as with the ProductSerializer and the JSONRenderer
+        serializer = ProductSerializer(
+            Product.objects.all(),
+            many=True,
+            context={"request": response.wsgi_request, "format": None}
+        )
+        expected_data = response.json()
+        expected_data["data"] = serializer.data
+        assert response.content == JSONRenderer().render(expected_data)
+        assert b"\\u2028" in response.content
+
 
 @pytest.mark.usefixtures("import_default_users")
 @pytest.mark.usefixtures("import_default_vendors")
@@ -2711,6 +2747,41 @@ class TestProductListAPIEndpoint:
         assert "data" in jdata, "data branch not provided"
         assert jdata == expected_result, "unexpected result from API endpoint"
 
+    def test_products_of_product_list(self, django_assert_max_num_queries):
+        product_list_id = self.create_test_product_list()
+        product = Product.objects.get(product_id="Product A")
+        product.eol_ext_announcement_date = date(2016, 1, 1)
+        product.end_of_sale_date = date(2016, 1, 1)
+        product.save()
+        ProductMigrationOption.objects.create(
+            product=product,
+            migration_source=ProductMigrationSource.objects.create(name="Preferred Source", preference=60),
+            replacement_product_id="Product B"
+        )
+
+        client = APIClient()
+        client.login(**AUTH_USER)
+        # warm up the session and permission lookups
+        client.get(REST_PRODUCTLIST_DETAIL % product_list_id)
+
+        with django_assert_max_num_queries(10):
+            response = client.get(REST_PRODUCTLIST_DETAIL % product_list_id + "products/?page_size=2")
+        assert response.status_code == status.HTTP_200_OK
+
+        jdata = response.json()
+        assert jdata["pagination"]["total_records"] == len(self.TEST_PRODUCTS)
+        assert jdata["pagination"]["last_page"] == 3
+        assert [e["product_id"] for e in jdata["data"]] == ["Product A", "Product B"]
+        assert jdata["data"][0]["current_lifecycle_states"] == product.current_lifecycle_states
+        assert jdata["data"][0]["preferred_replacement_product_id"] == "Product B"
+        assert jdata["data"][0]["preferred_replacement_db_product"] == Product.objects.get(product_id="Product B").id
+        assert jdata["data"][0]["url"] == "http://testserver" + REST_PRODUCT_DETAIL % product.id
+        assert jdata["data"][1]["preferred_replacement_product_id"] is None
+        assert jdata["data"][1]["current_lifecycle_states"] is None
+
+        response = client.get(REST_PRODUCTLIST_DETAIL % 9999 + "products/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
 
 @pytest.mark.usefixtures("import_default_users")
 @pytest.mark.usefixtures("import_default_vendors")
@@ -2879,6 +2950,84 @@ class TestProductIdNormalizationRuleAPIEndpoint:
         assert response.json() == expected_result
 
 
+@pytest.mark.usefixtures("import_default_users")
+@pytest.mark.usefixtures("import_default_vendors")
+class TestShowInventoryProductCheckAPIEndpoint:
+    """Test the bulk show inventory Product Check API Endpoint"""
+    SHOW_INVENTORY = """\
+NAME: "1", DESCR: "WS-C3750X-24"
+PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCD
+NAME: "Switch 1 - Power Supply 0", DESCR: "FRU Power Supply"
+PID: C3KX-PWR-350WAC , VID: V02 , SN: 12345ABCD"""
+
+    def test_authentication_required(self):
+        client = APIClient()
+
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={
+            "name": "test",
+            "outputs": [self.SHOW_INVENTORY]
+        }, format="json")
+
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+        assert models.ProductCheck.objects.count() == 0
+
+    def test_create_product_check(self, monkeypatch):
+        class MockTask:
+            id = "mock_task_id"
+
+        from app.productdb import tasks
+        monkeypatch.setattr(tasks.perform_product_check, "apply_async", lambda **kwargs: MockTask())
+
+        client = APIClient()
+        client.login(**AUTH_USER)
+
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"error": "name parameter required"}
+
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={
+            "name": "test",
+            "outputs": ["no inventory"]
+        }, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"error": "no Product IDs found in the given outputs"}
+
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={
+            "name": "x" * 257,
+            "outputs": [self.SHOW_INVENTORY]
+        }, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["error"].startswith("name: Ensure this value has at most 256 characters")
+        assert models.ProductCheck.objects.count() == 0
+
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={
+            "name": "test",
+            "outputs": [self.SHOW_INVENTORY, self.SHOW_INVENTORY]
+        }, format="json")
+        assert response.status_code == status.HTTP_202_ACCEPTED, response.content
+
+        jdata = response.json()
+        assert jdata["task_id"] == "mock_task_id"
+        assert jdata["unique_product_ids"] == 2
+        assert jdata["amount_of_products"] == 4
+
+        pc = models.ProductCheck.objects.get(id=jdata["product_check"])
+        assert pc.create_user.username == AUTH_USER["username"]
+        assert pc.input_product_amounts == {"WS-C3750X-24T-S": 2, "C3KX-PWR-350WAC": 2}
+
+        # upload the outputs as file, public Product Check
+        response = client.post(REST_PRODUCTCHECK_SHOW_INVENTORY, data={
+            "name": "test",
+            "public": "true",
+            "files": SimpleUploadedFile("inventory.txt", self.SHOW_INVENTORY.encode())
+        }, format="multipart")
+        assert response.status_code == status.HTTP_202_ACCEPTED, response.content
+
+        pc = models.ProductCheck.objects.get(id=response.json()["product_check"])
+        assert pc.create_user is None
+        assert pc.input_product_amounts == {"WS-C3750X-24T-S": 1, "C3KX-PWR-350WAC": 1}
+
+
 @pytest.mark.usefixtures("import_default_users")
 @pytest.mark.usefixtures("import_default_vendors")
 class TestNotificationMessageAPIEndpoint:
@@ -747,6 +747,104 @@ class TestProductMigrationExcelImporter:
         ProductMigrationSource.objects.all().delete()
 
 
+    @pytest.mark.usefixtures("apply_base_import_products_excel_file_mock")
+    def test_chunked_import(self, monkeypatch):
+        """test the import with multiple chunks and a duplicate entry within the file"""
+        global CURRENT_PRODUCT_MIGRATION_TEST_DATA
+        CURRENT_PRODUCT_MIGRATION_TEST_DATA = pd.DataFrame(
+            [
+                ["Product %d" % e, "Cisco Systems", "Existing Migration Source", "Product %d" % (e + 1), "", ""]
+                for e in range(0, 5)
+            ] + [
+                ["Product 0", "Cisco Systems", "Existing Migration Source", "Other Product", "", ""]
+            ], columns=PRODUCT_MIGRATION_TEST_DATA_COLUMNS
+        )
+        for e in range(0, 5):
+            models.Product.objects.create(product_id="Product %d" % e, vendor=Vendor.objects.get(id=1))
+        models.ProductMigrationSource.objects.create(name="Existing Migration Source")
+        monkeypatch.setattr(ProductMigrationsExcelImporter, "chunk_size", 2)
+
+        status_updates = []
+        product_migrations_file = ProductMigrationsExcelImporter("virtual_file.xlsx")
+        product_migrations_file.verify_file()
+        product_migrations_file.import_to_database(status_callback=lambda **kwargs: status_updates.append(kwargs))
+
+        assert ProductMigrationOption.objects.count() == 5
+        assert len(status_updates) == 6, "status callback is called for every row (rate limited by the caller)"
+        assert status_updates[-1] == {"processed": 6, "total": 6}
+        assert len(product_migrations_file.import_result_messages) == 6
+        assert "update Product Migration path \"Existing Migration Source\" for Product " \
+               "\"Product 0\"" in product_migrations_file.import_result_messages
+
+        pmo = ProductMigrationOption.objects.get(product__product_id="Product 0")
+        assert pmo.replacement_product_id == "Other Product"
+        assert pmo.replacement_db_product is None
+
+        pmo = ProductMigrationOption.objects.get(product__product_id="Product 1")
+        assert pmo.replacement_product_id == "Product 2"
+        assert pmo.replacement_db_product == Product.objects.get(product_id="Product 2")
+
+        Product.objects.all().delete()
+        ProductMigrationOption.objects.all().delete()
+        ProductMigrationSource.objects.all().delete()
+
+
+    @pytest.mark.usefixtures("apply_base_import_products_excel_file_mock")
+    def test_import_with_product_id_normalization(self):
+        """the Product IDs are normalized based on the rules of the vendor from the row"""
+        global CURRENT_PRODUCT_MIGRATION_TEST_DATA
+        CURRENT_PRODUCT_MIGRATION_TEST_DATA = pd.DataFrame(
+            [
+                [
+                    "WSC2960X48TSL",
+                    "Cisco Systems",
+                    "Existing Migration Source",
+                    " wsc2960x48tdl",
+                    "comment of the migration",
+                    "https://localhost"
+                ],
+                [
+                    "WSC2960X48TSL",
+                    None,
+                    "Existing Migration Source",
+                    "WSC2960X48TDL",
+                    "comment of the migration",
+                    "https://localhost"
+                ]
+            ], columns=PRODUCT_MIGRATION_TEST_DATA_COLUMNS
+        )
+        models.ProductIdNormalizationRule.objects.create(
+            vendor=Vendor.objects.get(id=1),
+            product_id="WS-C2960X-48%sD-L",
+            regex_match=r"^WSC2960X48(\w+)DL$"
+        )
+        models.ProductIdNormalizationRule.objects.create(
+            vendor=Vendor.objects.get(id=1),
+            product_id="WS-C2960X-48TS-L",
+            regex_match=r"^WSC2960X48TSL$"
+        )
+        models.Product.objects.create(product_id="WS-C2960X-48TS-L", vendor=Vendor.objects.get(id=1))
+        models.Product.objects.create(product_id="WS-C2960X-48TD-L", vendor=Vendor.objects.get(id=1))
+        models.Product.objects.create(product_id="WSC2960X48TSL", vendor=Vendor.objects.get(id=0))
+        models.ProductMigrationSource.objects.create(name="Existing Migration Source")
+
+        product_migrations_file = ProductMigrationsExcelImporter("virtual_file.xlsx")
+        product_migrations_file.verify_file()
+        product_migrations_file._create_data_frame()
+        product_migrations_file._normalize_product_id_columns()
+        product_migrations_file.import_to_database()
+
+        assert ProductMigrationOption.objects.count() == 2
+        pmo = ProductMigrationOption.objects.get(product__vendor_id=1)
+        assert pmo.product.product_id == "WS-C2960X-48TS-L"
+        assert pmo.replacement_product_id == "WS-C2960X-48TD-L"
+        assert pmo.replacement_db_product == Product.objects.get(product_id="WS-C2960X-48TD-L")
+
+        # the rules of other vendors are not used
+        pmo = ProductMigrationOption.objects.get(product__vendor_id=0)
+        assert pmo.product.product_id == "WSC2960X48TSL"
+        assert pmo.replacement_product_id == "WSC2960X48TDL"
+
 @pytest.mark.usefixtures("import_default_users")
 @pytest.mark.usefixtures("import_default_vendors")
 class TestMigratedImportProductsExcelFile:
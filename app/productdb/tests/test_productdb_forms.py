@@ -372,3 +372,40 @@ class TestProductCheckForm:
         assert form.is_valid() is True
         form.save()
         assert form.instance.input_product_ids == "a\nb\nc"
+
+    def test_form_with_show_inventory_file(self):
+        show_inventory = b"""\
+NAME: "1", DESCR: "WS-C3750X-24"
+PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCD
+NAME: "2", DESCR: "WS-C3750X-24"
+PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCE"""
+
+        form = ProductCheckForm(data={"name": "test"})
+        assert form.is_valid() is False
+        assert "input_product_ids" in form.errors
+
+        form = ProductCheckForm(data={"name": "test"}, files={
+            "show_inventory_file": SimpleUploadedFile("inventory.txt", show_inventory)
+        })
+        assert form.is_valid() is True, form.errors
+        form.save()
+        assert form.instance.input_product_ids == "WS-C3750X-24T-S;WS-C3750X-24T-S"
+
+        form = ProductCheckForm(data={"name": "test", "input_product_ids": "Test"}, files={
+            "show_inventory_file": SimpleUploadedFile("inventory.txt", show_inventory)
+        })
+        assert form.is_valid() is True, form.errors
+        form.save()
+        assert form.instance.input_product_ids == "Test\nWS-C3750X-24T-S;WS-C3750X-24T-S"
+
+        form = ProductCheckForm(data={"name": "test"}, files={
+            "show_inventory_file": SimpleUploadedFile("inventory.txt", b"no inventory")
+        })
+        assert form.is_valid() is False
+        assert form.errors["show_inventory_file"] == ["no Product IDs found in the uploaded file"]
+
+        form = ProductCheckForm(data={"name": "test"}, files={
+            "show_inventory_file": SimpleUploadedFile("inventory.zip", b"no archive")
+        })
+        assert form.is_valid() is False
+        assert "show_inventory_file" in form.errors
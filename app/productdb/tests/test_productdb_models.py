@@ -5,10 +5,12 @@ import pytest
 import os
 import tempfile
 import datetime as _datetime
+import logging
 from hashlib import sha512
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.db.models import QuerySet
 from app.productdb import models
 
@@ -565,6 +567,39 @@ class TestProductList:
         assert pl.string_product_list == expected_product_list_string, \
             "String in DB should only contain a sorted list with line breaks"
 
+    @pytest.mark.usefixtures("import_default_vendors")
+    def test_serialized_product_list_objects(self, django_assert_num_queries):
+        u = User.objects.create(username="pdb_admin")
+        v = models.Vendor.objects.get(name__contains="Cisco")
+        for e in range(1, 4):
+            models.Product.objects.create(product_id="myprod%d" % e, vendor=v, description="description %d" % e)
+        # same Product ID for a different vendor is not part of the list
+        models.Product.objects.create(product_id="myprod1", vendor=models.Vendor.objects.get(name__contains="Juniper"))
+        pl = models.ProductList.objects.create(
+            name="Test Product List",
+            string_product_list="myprod1\nmyprod2",
+            vendor=v,
+            update_user=u
+        )
+
+        result = pl.get_serialized_product_list_objects()
+
+        assert len(result) == 2
+        assert sorted([e["product_id"] for e in result]) == ["myprod1", "myprod2"]
+        assert {e["vendor_name"] for e in result} == {v.name}
+        assert result[0]["current_lifecycle_states"] is None
+
+        # second call is served from the cache
+        with django_assert_num_queries(0):
+            assert pl.get_serialized_product_list_objects() == result
+
+        # cache is invalidated when the list is changed
+        pl.string_product_list = "myprod1\nmyprod2\nmyprod3"
+        pl.save()
+
+        result = pl.get_serialized_product_list_objects()
+        assert sorted([e["product_id"] for e in result]) == ["myprod1", "myprod2", "myprod3"]
+
     @pytest.mark.usefixtures("import_default_vendors")
     def test_hash_function(self):
         u = User.objects.create(username="pdb_admin")
@@ -640,6 +675,39 @@ class TestProductList:
 
         assert hash == pl.hash
 
+    @pytest.mark.usefixtures("import_default_vendors")
+    def test_product_list_entries(self):
+        u = User.objects.create(username="pdb_admin")
+        p1 = models.Product.objects.create(product_id="myprod1", vendor_id=1)
+        p2 = models.Product.objects.create(product_id="myprod2", vendor_id=1)
+        models.Product.objects.create(product_id="myprod3", vendor_id=1)
+        models.Product.objects.create(product_id="myprod1", vendor_id=2)
+
+        pl = models.ProductList.objects.create(
+            name="Test",
+            string_product_list="myprod1;myprod2",
+            vendor_id=1,
+            update_user=u
+        )
+        assert set(pl.entries.values_list("product_id", flat=True)) == {p1.id, p2.id}
+
+        pl.string_product_list = "myprod2\nmyprod3"
+        pl.save()
+        assert set(pl.entries.values_list("product__product_id", flat=True)) == {"myprod2", "myprod3"}
+
+        # renamed and deleted Products are no longer part of the list
+        p2.product_id = "renamed"
+        p2.save()
+        assert set(pl.entries.values_list("product__product_id", flat=True)) == {"myprod3"}
+
+        models.Product.objects.filter(product_id="myprod3").delete()
+        assert pl.entries.count() == 0
+
+        # Products that are created with a Product ID of the list are added
+        with models.bulk_operation():
+            models.Product.objects.create(product_id="myprod3", vendor_id=1)
+        assert set(pl.entries.values_list("product__product_id", flat=True)) == {"myprod3"}
+
 
 class TestUserProfile:
     """Test UserProfile model object"""
@@ -750,8 +818,8 @@ class TestProductCheck:
 
         pc = models.ProductCheck.objects.create(name="Test", input_product_ids=first_large_string)
 
-        # single chunk (maximum size)
-        assert pc.productcheckinputchunks_set.count() == 1
+        # input is stored compressed
+        assert len(pc.input_product_ids_data) < len(first_large_string)
         assert pc.input_product_ids == first_large_string
 
         # test setter property
@@ -765,14 +833,12 @@ class TestProductCheck:
         # save value
         pc.save()
 
-        assert pc.productcheckinputchunks_set.count() == 1
-
         # read from DB
         read_pc = models.ProductCheck.objects.get(id=pc.id)
 
         assert sha512(read_pc.input_product_ids.encode()).digest() == sls_hash
 
-        # test with multiple chunks
+        # test with a very large string
         very_large_string = first_large_string + second_large_string + first_large_string
         vls_hash = sha512(very_large_string.encode()).digest()
 
@@ -785,15 +851,60 @@ class TestProductCheck:
         # save value
         new_pc.save()
 
-        assert new_pc.productcheckinputchunks_set.count() == 3
-        assert models.ProductCheckInputChunks.objects.count() == 3 + 1
-
         # read and save again
         new_pc = models.ProductCheck.objects.get(id=new_pc.id)
         new_pc.save()
 
         assert sha512(new_pc.input_product_ids.encode()).digest() == vls_hash
 
+        new_pc = models.ProductCheck.objects.get(id=new_pc.id)
+        assert sha512(new_pc.input_product_ids.encode()).digest() == vls_hash
+
+    def test_input_product_amounts(self, monkeypatch):
+        pc = models.ProductCheck.objects.create(name="Test", input_product_ids="Test;Test\n\nasdf;;TestTest\n Test ")
+
+        assert pc.input_product_amounts == {"Test": 3, "asdf": 1, "TestTest": 1}
+        assert pc.input_product_ids_list == ["", "Test", "Test", "Test", "TestTest", "asdf"]
+
+        # the parsed values are updated if the input changes
+        pc.input_product_ids = "asdf"
+        assert pc.input_product_amounts == {"asdf": 1}
+
+        # the input is normalized only once per instance
+        with monkeypatch.context() as m:
+            m.setattr(models, "normalize_product_ids_without_vendor", lambda *args, **kwargs: pytest.fail("cached"))
+            assert pc.input_product_amounts == {"asdf": 1}
+
+        pc.input_product_ids = "asdf;asdf"
+        assert pc.input_product_amounts == {"asdf": 2}
+
+        # the input is parsed only once
+        read_pc = models.ProductCheck.objects.get(id=pc.id)
+        assert read_pc.input_product_amounts == {"Test": 3, "asdf": 1, "TestTest": 1}
+        read_pc.input_product_ids_data = b""
+        assert read_pc.input_product_amounts == {"Test": 3, "asdf": 1, "TestTest": 1}
+
+    def test_input_product_amounts_with_normalization_rules(self):
+        models.ProductIdNormalizationRule.objects.create(
+            vendor=models.Vendor.objects.get(id=1),
+            product_id="WS-C2960X-%sTS-L",
+            regex_match=r"^WSC2960X(\d+)TSL$"
+        )
+        models.Product.objects.create(product_id="WS-C2960X-48TS-L", vendor=models.Vendor.objects.get(id=1))
+        pc = models.ProductCheck.objects.create(
+            name="Test",
+            input_product_ids="WSC2960X48TSL;wsc2960x48tsl\nWS-C2960X-48TS-L;Test"
+        )
+
+        assert pc.input_product_amounts == {"WS-C2960X-48TS-L": 3, "Test": 1}
+        assert pc.input_product_ids_list == ["Test", "WS-C2960X-48TS-L", "WSC2960X48TSL", "wsc2960x48tsl"]
+
+        pc.perform_product_check()
+
+        entry = models.ProductCheckEntry.objects.get(product_check=pc, input_product_id="WS-C2960X-48TS-L")
+        assert entry.amount == 3
+        assert entry.in_database is True
+
     def test_basic_product_check(self):
         u = User.objects.create(username="username")
         test_product_string = "myprod"
@@ -885,6 +996,50 @@ class TestProductCheck:
         assert not_in_db.part_of_product_list == ""
         assert not_in_db.migration_product is None
 
+    def test_reuse_of_identical_product_check_results(self, monkeypatch):
+        u = User.objects.create(username="username")
+        v = models.Vendor.objects.get(id=1)
+        p = models.Product.objects.create(product_id="myprod", vendor=v)
+        pms = models.ProductMigrationSource.objects.create(name="Preferred Migration Source", preference=60)
+        models.ProductMigrationOption.objects.create(product=p, migration_source=pms, replacement_product_id="repl")
+        models.ProductList.objects.create(name="TestList", string_product_list="myprod", vendor=v, update_user=u)
+
+        pc = models.ProductCheck.objects.create(name="Test", input_product_ids="myprod;myprod\nTest")
+        pc.perform_product_check()
+        assert pc.result_hash == pc.get_result_hash()
+
+        # same input in a different order, the entries are copied from the first check
+        def fail(*args, **kwargs):
+            raise AssertionError("entries should be copied")
+
+        with monkeypatch.context() as m:
+            m.setattr(models.ProductCheck, "create_product_check_entries", fail)
+            second_pc = models.ProductCheck.objects.create(name="Test 2", input_product_ids="Test\nmyprod;myprod")
+            second_pc.perform_product_check()
+
+        assert second_pc.result_hash == pc.result_hash
+        assert second_pc.productcheckentry_set.count() == 2
+        in_db = second_pc.productcheckentry_set.get(input_product_id="myprod")
+        assert in_db.amount == 2
+        assert in_db.product_in_database == p
+        assert in_db.migration_product.replacement_product_id == "repl"
+        assert in_db.get_product_list_names() == ["TestList"]
+        assert pc.productcheckentry_set.count() == 2, "entries of the source check are not modified"
+
+        # different amounts or migration sources result in a different hash
+        third_pc = models.ProductCheck.objects.create(name="Test 3", input_product_ids="Test\nmyprod")
+        assert third_pc.get_result_hash() != pc.result_hash
+        third_pc.input_product_ids = "Test\nmyprod;myprod"
+        third_pc.migration_source = pms
+        assert third_pc.get_result_hash() != pc.result_hash
+
+        # a change of the catalogue data creates a new version
+        models.Product.objects.create(product_id="Test", vendor=v)
+        assert second_pc.get_result_hash() != second_pc.result_hash
+
+        second_pc.perform_product_check()
+        assert second_pc.productcheckentry_set.get(input_product_id="Test").in_database is True
+
     def test_recursive_product_check(self):
         u = User.objects.create(username="username")
         test_product_string = "myprod"
@@ -1495,6 +1650,183 @@ class TestProductMigrationOption:
         assert pmo3.get_product_replacement_id() is None
         assert pmo3.replacement_db_product is None
 
+    def test_get_preferred_replacement_options(self, django_assert_max_num_queries):
+        preferred_source = models.ProductMigrationSource.objects.create(name="preferred", preference=60)
+        other_source = models.ProductMigrationSource.objects.create(name="other", preference=10)
+        products = {}
+        for product_id in ["A", "B", "C", "D", "E"]:
+            products[product_id] = models.Product.objects.create(product_id=product_id, vendor_id=1)
+        products["B"].end_of_sale_date = _datetime.date(2000, 1, 1)
+        products["B"].eol_ext_announcement_date = _datetime.date(1999, 1, 1)
+        products["B"].save()
+
+        # A -> B (EoS) -> C, D -> not in db, E has only a less preferred option
+        models.ProductMigrationOption.objects.create(
+            product=products["A"], migration_source=preferred_source, replacement_product_id="B"
+        )
+        models.ProductMigrationOption.objects.create(
+            product=products["B"], migration_source=preferred_source, replacement_product_id="C"
+        )
+        models.ProductMigrationOption.objects.create(
+            product=products["D"], migration_source=preferred_source, replacement_product_id="not in db"
+        )
+        models.ProductMigrationOption.objects.create(
+            product=products["E"], migration_source=other_source, replacement_product_id="A"
+        )
+
+        with django_assert_max_num_queries(3):
+            result = models.get_preferred_replacement_options([p.id for p in products.values()])
+
+        assert result[products["A"].id].replacement_product_id == "C"
+        assert result[products["B"].id].replacement_product_id == "C"
+        assert result[products["D"].id].replacement_product_id == "not in db"
+        assert products["C"].id not in result
+        assert products["E"].id not in result
+
+        for product in products.values():
+            expected = product.get_preferred_replacement_option()
+            assert result.get(product.id) == expected, "should be the same as for a single Product"
+
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestBulkOperation:
+    def test_update_replacement_db_product_after_bulk_operation(self):
+        group1 = models.ProductMigrationSource.objects.create(name="Group One")
+        root_product = models.Product.objects.create(
+            product_id="C2960XS",
+            vendor=models.Vendor.objects.get(id=1)
+        )
+        pmo = models.ProductMigrationOption.objects.create(
+            product=root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+        assert pmo.replacement_db_product is None
+
+        with models.bulk_operation():
+            assert models.is_bulk_operation_active() is True
+            p = models.Product.objects.create(
+                product_id="C2960XL",
+                vendor=models.Vendor.objects.get(id=1)
+            )
+
+            pmo.refresh_from_db()
+            assert pmo.replacement_db_product is None, "signal handlers are suppressed within the bulk operation"
+
+        assert models.is_bulk_operation_active() is False
+        pmo.refresh_from_db()
+        assert pmo.replacement_db_product == p
+
+    def test_catalogue_data_version_updates(self, monkeypatch):
+        updates = []
+        monkeypatch.setattr(models, "update_catalogue_data_version", lambda: updates.append(True))
+
+        def updates_after_commit():
+            return len([e for e in connection.run_on_commit if e[1] is models.update_catalogue_data_version])
+
+        with models.bulk_operation():
+            for name in ["Group One", "Group Two", "Group Three"]:
+                models.ProductMigrationSource.objects.create(name=name)
+            assert updates == [], "the version should be updated when the bulk operation is left"
+
+        assert len(updates) == 1
+        assert updates_after_commit() == 1, "the version should be updated again after the commit"
+
+        with models.bulk_operation():
+            for product_id in ["C2960XS", "C2960XL", "C2960XM"]:
+                models.Product.objects.create(product_id=product_id, vendor=models.Vendor.objects.get(id=1))
+
+        assert len(updates) == 2
+        assert updates_after_commit() == 2
+
+        models.ProductMigrationSource.objects.create(name="Group Four")
+        assert len(updates) == 3
+        assert updates_after_commit() == 3
+
+    def test_nested_bulk_operation(self):
+        group1 = models.ProductMigrationSource.objects.create(name="Group One")
+        root_product = models.Product.objects.create(
+            product_id="C2960XS",
+            vendor=models.Vendor.objects.get(id=1)
+        )
+        pmo = models.ProductMigrationOption.objects.create(
+            product=root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+
+        with models.bulk_operation():
+            with models.bulk_operation():
+                p = models.Product.objects.create(
+                    product_id="C2960XL",
+                    vendor=models.Vendor.objects.get(id=1)
+                )
+
+            pmo.refresh_from_db()
+            assert pmo.replacement_db_product is None, "changes are applied when the outermost context is left"
+
+        pmo.refresh_from_db()
+        assert pmo.replacement_db_product == p
+
+    def test_replacement_db_product_with_ambiguous_product_id(self):
+        group1 = models.ProductMigrationSource.objects.create(name="Group One")
+        root_product = models.Product.objects.create(
+            product_id="C2960XS",
+            vendor=models.Vendor.objects.get(id=1)
+        )
+        other_vendor_root_product = models.Product.objects.create(
+            product_id="C2960XS",
+            vendor=models.Vendor.objects.get(id=0)
+        )
+        pmo = models.ProductMigrationOption.objects.create(
+            product=root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+        other_vendor_pmo = models.ProductMigrationOption.objects.create(
+            product=other_vendor_root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+
+        with models.bulk_operation():
+            p = models.Product.objects.create(product_id="C2960XL", vendor=models.Vendor.objects.get(id=1))
+            models.Product.objects.create(product_id="C2960XL", vendor=models.Vendor.objects.get(id=2))
+
+        pmo.refresh_from_db()
+        other_vendor_pmo.refresh_from_db()
+        assert pmo.replacement_db_product == p, "Product from the same vendor should be preferred"
+        assert other_vendor_pmo.replacement_db_product is None, "Product ID is not unique in the database"
+
+        # the same result is expected if the option is saved outside of a bulk operation
+        pmo.save()
+        other_vendor_pmo.save()
+        assert pmo.replacement_db_product == p
+        assert other_vendor_pmo.replacement_db_product is None
+
+    def test_update_replacement_db_product_relations(self):
+        group1 = models.ProductMigrationSource.objects.create(name="Group One")
+        root_product = models.Product.objects.create(
+            product_id="C2960XS",
+            vendor=models.Vendor.objects.get(id=1)
+        )
+        p = models.Product.objects.create(product_id="C2960XL", vendor=models.Vendor.objects.get(id=1))
+        pmo = models.ProductMigrationOption.objects.create(
+            product=root_product,
+            migration_source=group1,
+            replacement_product_id="C2960XL"
+        )
+        assert pmo.replacement_db_product == p
+
+        # clear the relation without the signal handlers
+        models.ProductMigrationOption.objects.all().update(replacement_db_product=None)
+
+        result = models.update_replacement_db_product_relations()
+
+        pmo.refresh_from_db()
+        assert result == 1
+        assert pmo.replacement_db_product == p
+
 
 @pytest.mark.usefixtures("import_default_vendors")
 class TestProductIdNormalization:
@@ -1529,3 +1861,140 @@ class TestProductIdNormalization:
                 regex_match=r"^PWR\-C1\-715WAC$",
                 comment="duplicated entry"
             )
+
+    def test_normalize_product_id(self):
+        v1 = models.Vendor.objects.get(id=1)
+        v2 = models.Vendor.objects.get(id=2)
+        models.ProductIdNormalizationRule.objects.create(
+            vendor=v1,
+            product_id="WS-C2960X-%sTS-L",
+            regex_match=r"^WSC2960X(\d+)TSL$"
+        )
+        models.ProductIdNormalizationRule.objects.create(
+            vendor=v2,
+            product_id="EX%s-48T",
+            regex_match=r"^EX(\d+)$"
+        )
+
+        assert models.normalize_product_id("WSC2960X48TSL", vendor_id=1) == "WS-C2960X-48TS-L"
+        assert models.normalize_product_id(" wsc2960x48tsl ", vendor_id=1) == "WS-C2960X-48TS-L"
+        assert models.normalize_product_id("WSC2960X48TSL ", vendor_id=2) == "WSC2960X48TSL"
+        assert models.normalize_product_id("EX4300", vendor_id=2) == "EX4300-48T"
+        assert models.normalize_product_id("EX4300", vendor_id=0) == "EX4300"
+        assert models.normalize_product_id("", vendor_id=1) == ""
+
+        # the rules are compiled only once
+        normalizers = models.get_product_id_normalizers()
+        assert models.get_product_id_normalizers() is normalizers
+        assert normalizers[1].match("WSC2960X24TSL") == ("WS-C2960X-24TS-L", normalizers[1].rules[0][2])
+
+        # the rule with the highest priority is used, the precompiled rules are updated on change
+        pnr = models.ProductIdNormalizationRule.objects.create(
+            vendor=v1,
+            product_id="WS-C2960X-48TS-L=",
+            regex_match=r"^WSC2960X48TSL$",
+            priority=100
+        )
+        assert models.get_product_id_normalizers() is not normalizers
+        assert models.normalize_product_id("WSC2960X48TSL", vendor_id=1) == "WS-C2960X-48TS-L="
+        assert models.get_product_id_normalizers()[1].match("WSC2960X48TSL")[1] == pnr.id
+
+        pnr.delete()
+        assert models.normalize_product_id("WSC2960X48TSL", vendor_id=1) == "WS-C2960X-48TS-L"
+
+
+    def test_normalize_product_ids_without_vendor(self):
+        """the rules of a vendor must not change the Product IDs of another vendor"""
+        v1 = models.Vendor.objects.get(id=1)
+        v2 = models.Vendor.objects.get(id=2)
+        models.ProductIdNormalizationRule.objects.create(vendor=v1, product_id="EX%s-C", regex_match=r"^EX(\d+)$")
+        models.ProductIdNormalizationRule.objects.create(vendor=v2, product_id="EX%s-48T", regex_match=r"^EX(\d+)$")
+        models.Product.objects.create(product_id="EX4300", vendor=v2)
+        models.Product.objects.create(product_id="EX2200-48T", vendor=v2)
+        models.Product.objects.create(product_id="EX3400-C", vendor=v2)
+
+        result = models.normalize_product_ids_without_vendor(["EX4300", "EX2200", " ex2200 ", "EX3400", "EX9200"])
+
+        assert result == {
+            "EX4300": "EX4300",  # existing Product ID
+            "EX2200": "EX2200-48T",  # only the result of the second vendor exists
+            "ex2200": "EX2200-48T",
+            "EX3400": "EX3400",  # the result of the first vendor exists, but not for this vendor
+            "EX9200": "EX9200",  # no result exists
+        }
+
+        pc = models.ProductCheck.objects.create(name="Test", input_product_ids="EX4300;EX2200;EX2200-48T\nEX3400")
+        assert pc.input_product_amounts == {"EX4300": 1, "EX2200-48T": 2, "EX3400": 1}
+
+    def test_invalid_normalization_rules(self, caplog):
+        v1 = models.Vendor.objects.get(id=1)
+
+        with pytest.raises(ValidationError) as exinfo:
+            models.ProductIdNormalizationRule.objects.create(
+                vendor=v1,
+                product_id="WS-C2960X-48TS-L",
+                regex_match=r"^(WS-C2960X-48TS-L)=?$"
+            )
+        assert "product_id" in exinfo.value.message_dict
+
+        with pytest.raises(ValidationError) as exinfo:
+            models.ProductIdNormalizationRule.objects.create(vendor=v1, product_id="100%-%s", regex_match=r"^X(\d+)$")
+        assert "product_id" in exinfo.value.message_dict
+
+        with pytest.raises(ValidationError) as exinfo:
+            models.ProductIdNormalizationRule.objects.create(vendor=v1, product_id="X", regex_match=r"^X(\d+$")
+        assert "regex_match" in exinfo.value.message_dict
+
+        # a literal percent sign is valid, if the regular expression has no groups or if it is escaped
+        models.ProductIdNormalizationRule.objects.create(vendor=v1, product_id="100%", regex_match=r"^100$")
+        models.ProductIdNormalizationRule.objects.create(vendor=v1, product_id="%s-100%%", regex_match=r"^(\d+)P$")
+
+        # rules that were stored without validation are ignored
+        models.ProductIdNormalizationRule.objects.bulk_create([
+            models.ProductIdNormalizationRule(
+                vendor=v1, product_id="WS-C2960X-48TS-L", regex_match=r"^(WS-C2960X-48TS-L)=?$", priority=100
+            ),
+            models.ProductIdNormalizationRule(vendor=v1, product_id="X", regex_match=r"^X(\d+$", priority=100),
+            models.ProductIdNormalizationRule(
+                vendor=v1, product_id="WS-C2960X-48TS-L%s", regex_match=r"^WS-C2960X-48TS-L(=)?$"
+            ),
+        ])
+        models.update_product_id_normalization_version()
+
+        with caplog.at_level(logging.WARNING, logger="productdb"):
+            models.get_product_id_normalizers()
+        assert "ignored" in caplog.text
+
+        assert models.normalize_product_id("WS-C2960X-48TS-L=", vendor_id=1) == "WS-C2960X-48TS-L="
+        assert models.normalize_product_id("WS-C2960X-48TS-L", vendor_id=1) == "WS-C2960X-48TS-L", \
+            "optional groups that don't match should be empty"
+        assert models.normalize_product_id("100", vendor_id=1) == "100%"
+        assert models.normalize_product_id("24P", vendor_id=1) == "24-100%"
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestProductIdLookupIndexes:
+    """the Product ID lookups must be served by an index (sequential scans are disabled to ignore the table size)"""
+    @staticmethod
+    def get_query_plan(queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN %s" % sql, params)
+            return "\n".join([row[0] for row in cursor.fetchall()])
+
+    @pytest.mark.parametrize("queryset, expected_index", [
+        (lambda: models.Product.objects.filter(product_id__iexact="ws-c2960x-24ts-l"), models.PRODUCT_ID_UPPER_INDEX),
+        (lambda: models.Product.objects.filter(product_id="WS-C2960X-24TS-L"), None),
+        (lambda: models.Product.objects.filter(product_id="WS-C2960X-24TS-L", vendor_id=1), None),
+        (lambda: models.Product.objects.filter(product_id__in=["WS-C2960X-24TS-L", "WS-C2960X-48TS-L"]), None),
+        (lambda: models.ProductMigrationOption.objects.filter(replacement_product_id__in=["WS-C2960X-24TS-L"]), None),
+    ])
+    def test_index_scan(self, queryset, expected_index):
+        models.Product.objects.create(product_id="WS-C2960X-24TS-L", vendor_id=1)
+
+        plan = self.get_query_plan(queryset().order_by())
+
+        assert "Seq Scan" not in plan, plan
+        assert "Index" in plan, plan
+        if expected_index:
+            assert expected_index in plan, plan
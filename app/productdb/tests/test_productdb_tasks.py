@@ -1,6 +1,7 @@
 """
 Test suite for the productdb.tasks module
 """
+import datetime
 import pytest
 import pandas as pd
 from django.contrib.auth.models import User
@@ -94,6 +95,36 @@ class TestRunProductCheckTask:
         assert "error_message" in result
         assert models.ProductCheckEntry.objects.all().count() == 0
 
+    @pytest.mark.usefixtures("set_celery_always_eager")
+    def test_sharded_execution(self, settings, monkeypatch):
+        settings.PDB_PRODUCT_CHECK_SHARD_SIZE = 2
+        normalize_calls = []
+        normalize_product_ids_without_vendor = models.normalize_product_ids_without_vendor
+
+        def count_normalize_calls(*args, **kwargs):
+            normalize_calls.append(args)
+            return normalize_product_ids_without_vendor(*args, **kwargs)
+
+        monkeypatch.setattr(models, "normalize_product_ids_without_vendor", count_normalize_calls)
+        app_settings = AppSettings()
+        app_settings.set_amount_of_product_checks(0)
+        app_settings.set_amount_of_unique_product_check_entries(0)
+        pc = models.ProductCheck.objects.create(name="Test", input_product_ids="A\nB;B\nC\nD\nE")
+
+        result = tasks.perform_product_check(product_check_id=pc.id)
+
+        assert result == {"status_message": "Product check started on 3 workers, please wait..."}
+        assert models.ProductCheckEntry.objects.all().count() == 5
+        assert models.ProductCheckEntry.objects.get(input_product_id="B").amount == 2
+        assert len(normalize_calls) == 1, "the input should be normalized only once (not within the shards)"
+
+        pc = models.ProductCheck.objects.get(id=pc.id)
+        assert pc.in_progress is False, "task ID should be cleared by the chord callback"
+
+        app_settings = AppSettings()
+        assert app_settings.get_amount_of_product_checks() == 1
+        assert app_settings.get_amount_of_unique_product_check_entries() == 5
+
 
 @pytest.mark.usefixtures("suppress_state_update_in_tasks")
 @pytest.mark.usefixtures("import_default_users")
@@ -288,3 +319,99 @@ def test_delete_all_product_checks():
     tasks.delete_all_product_checks()
 
     assert models.ProductCheck.objects.all().count() == 0
+
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestUpdateHomepageStatisticsTask:
+    def test_update_homepage_statistics(self, monkeypatch):
+        monkeypatch.setattr(tasks.update_homepage_statistics, "apply_async", lambda **kwargs: None)
+        v = models.Vendor.objects.get(id=1)
+        models.Product.objects.create(product_id="Product A", vendor=v, list_price=100.0)
+        models.Product.objects.create(product_id="Product B", vendor=v, eox_update_time_stamp=datetime.date.today())
+        models.Product.objects.create(
+            product_id="Product C",
+            vendor=v,
+            eox_update_time_stamp=datetime.date.today(),
+            eol_ext_announcement_date=datetime.date.today() - datetime.timedelta(days=365),
+            end_of_sale_date=datetime.date.today() - datetime.timedelta(days=30),
+        )
+
+        result = tasks.update_homepage_statistics()
+        statistics = cache.get(tasks.HOMEPAGE_STATISTICS_CACHE_KEY)
+
+        assert "status_message" in result
+        assert statistics["product_count"] == 3
+        assert statistics["product_lifecycle_count"] == 2
+        assert statistics["product_no_eol_announcement_count"] == 1
+        assert statistics["product_eol_announcement_count"] == 0
+        assert statistics["product_eos_count"] == 1
+        assert statistics["product_eol_count"] == 0
+        assert statistics["product_price_count"] == 1
+        assert statistics["statistics_date"] == datetime.date.today()
+
+    def test_debounced_schedule_of_homepage_statistics_update(self, monkeypatch):
+        scheduled_calls = []
+        monkeypatch.setattr(
+            tasks.update_homepage_statistics,
+            "apply_async",
+            lambda **kwargs: scheduled_calls.append(kwargs)
+        )
+
+        v = models.Vendor.objects.get(id=1)
+        for e in range(0, 10):
+            models.Product.objects.create(product_id="Product %d" % e, vendor=v)
+
+        assert len(scheduled_calls) == 1, "only a single update should be scheduled within the debounce interval"
+
+        # the execution of the task allows a new schedule
+        tasks.update_homepage_statistics()
+        models.Product.objects.create(product_id="Product X", vendor=v)
+
+        assert len(scheduled_calls) == 2
+
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestPrerenderProductListTask:
+    def test_prerender_product_list(self, monkeypatch):
+        scheduled_calls = []
+        monkeypatch.setattr(
+            tasks.prerender_product_list,
+            "apply_async",
+            lambda **kwargs: scheduled_calls.append(kwargs)
+        )
+        u = User.objects.create(username="pdb_admin")
+        v = models.Vendor.objects.get(id=1)
+        models.Product.objects.create(product_id="Product A", vendor=v)
+        models.Product.objects.create(product_id="Product B", vendor=v)
+        pl = models.ProductList.objects.create(
+            name="Test List",
+            string_product_list="Product A",
+            vendor=v,
+            update_user=u
+        )
+        assert len(scheduled_calls) == 1, "list change should schedule the prerendering"
+
+        result = tasks.prerender_product_list(pl.id)
+
+        assert "status_message" in result
+        cached_products = cache.get(models.PRODUCT_LIST_OBJECTS_CACHE_KEY % pl.id)
+        assert [e["product_id"] for e in cached_products["products"]] == ["Product A"]
+        cached_export = cache.get(models.PRODUCT_LIST_EXPORT_CACHE_KEY % (pl.id, "csv"))
+        assert b"Product A" in cached_export["content"]
+        assert cache.get(models.PRODUCT_LIST_EXPORT_CACHE_KEY % (pl.id, "xlsx")) is not None
+
+        # a change of a member product invalidates the cached values and schedules the prerendering
+        models.Product.objects.filter(product_id="Product A").first().save()
+        assert cache.get(models.PRODUCT_LIST_OBJECTS_CACHE_KEY % pl.id) is None
+        assert len(scheduled_calls) == 2
+
+        # products that are not part of the list are ignored
+        tasks.prerender_product_list(pl.id)
+        models.Product.objects.filter(product_id="Product B").first().save()
+        assert cache.get(models.PRODUCT_LIST_OBJECTS_CACHE_KEY % pl.id) is not None
+        assert len(scheduled_calls) == 2
+
+    def test_prerender_deleted_product_list(self):
+        result = tasks.prerender_product_list(9999)
+
+        assert result == {"status_message": "Product List not found, nothing to do"}
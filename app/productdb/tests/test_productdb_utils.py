@@ -1,6 +1,9 @@
 """
 Test suite for the productdb.views utils
 """
+import io
+import tarfile
+import zipfile
 import pytest
 from datetime import datetime
 from django.contrib.auth.models import AnonymousUser, User
@@ -225,6 +228,57 @@ PID: C3KX-NM-1G , VID: V01 , SN: 12345ABCD"""
     assert utils.parse_cisco_show_inventory(example_string_with_empty_product_id) == expected_list
 
 
+def test_count_cisco_show_inventory_product_ids():
+    device_1 = """\
+NAME: "1", DESCR: "WS-C3750X-24"
+PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCD
+NAME: "Switch 1 - Power Supply 0", DESCR: "FRU Power Supply"
+PID: C3KX-PWR-350WAC , VID: V02 , SN: 12345ABCD"""
+    device_2 = """\
+NAME: "1", DESCR: "WS-C3750X-24"
+PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCE
+NAME: "Switch 1 - Power Supply 0", DESCR: "FRU Power Supply"
+PID:      VID: V04 , SN: 12345ABCD"""
+
+    result = utils.count_cisco_show_inventory_product_ids([device_1, device_2, ""])
+
+    assert result == {"WS-C3750X-24T-S": 2, "C3KX-PWR-350WAC": 1}
+    assert utils.convert_product_amounts_to_input_string(result) == "C3KX-PWR-350WAC\n" \
+                                                                  "WS-C3750X-24T-S;WS-C3750X-24T-S"
+
+
+def test_read_show_inventory_files():
+    device_1 = b"PID: WS-C3750X-24T-S , VID: V04 , SN: 12345ABCD"
+    device_2 = b"PID: C3KX-PWR-350WAC , VID: V02 , SN: 12345ABCD"
+
+    text_file = io.BytesIO(device_1)
+    text_file.name = "device.txt"
+    assert utils.read_show_inventory_files(text_file) == [device_1.decode()]
+
+    zip_file = io.BytesIO()
+    with zipfile.ZipFile(zip_file, "w") as archive:
+        archive.writestr("device_1.txt", device_1)
+        archive.writestr("device_2.txt", device_2)
+    zip_file.seek(0)
+    zip_file.name = "inventory.zip"
+    assert utils.read_show_inventory_files(zip_file) == [device_1.decode(), device_2.decode()]
+
+    tar_file = io.BytesIO()
+    with tarfile.open(fileobj=tar_file, mode="w:gz") as archive:
+        for name, content in [("device_1.txt", device_1), ("device_2.txt", device_2)]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    tar_file.seek(0)
+    tar_file.name = "inventory.tar.gz"
+    assert utils.read_show_inventory_files(tar_file) == [device_1.decode(), device_2.decode()]
+
+    invalid_file = io.BytesIO(b"no archive")
+    invalid_file.name = "inventory.zip"
+    with pytest.raises(ValueError):
+        utils.read_show_inventory_files(invalid_file)
+
+
 def test_split_string_method():
     # generate a long string and split it to chunks
     input_string = "1234567890"
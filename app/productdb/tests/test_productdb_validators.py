@@ -57,3 +57,22 @@ def test_validate_product_list_string():
     with pytest.raises(ValidationError) as exinfo:
         validate_product_list_string(test_product_string, v.id)
     assert exinfo.match(expected_error_msg)
+
+
+def test_validate_product_list_string_with_single_query(django_assert_num_queries):
+    v = models.Vendor.objects.create(name="unassigned", id=0)
+    for e in range(0, 50):
+        models.Product.objects.create(product_id="myprod%d" % e, vendor=v)
+
+    test_product_string = "\n".join(["myprod%d" % e for e in range(0, 50)])
+    with django_assert_num_queries(1):
+        validate_product_list_string(test_product_string, v.id)
+
+    # missing products are reported in sorted order, the vendor name requires an additional query
+    test_product_string += "\nmyprod99;myprod100"
+    expected_error_msg = "The following products are not found in the database for the vendor unassigned: " \
+                         "myprod100,myprod99"
+    with django_assert_num_queries(2):
+        with pytest.raises(ValidationError) as exinfo:
+            validate_product_list_string(test_product_string, v.id)
+    assert exinfo.match(expected_error_msg)
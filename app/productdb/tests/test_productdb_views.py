@@ -8,8 +8,10 @@ from django.core.exceptions import PermissionDenied
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.http import Http404
+from django.db import connection
 from django.test import RequestFactory
-from app.productdb import views
+from django.test.utils import CaptureQueriesContext
+from app.productdb import views, tasks
 from app.productdb import models
 
 pytestmark = pytest.mark.django_db
@@ -374,6 +376,58 @@ class TestShareProductListView:
         assert response.status_code == 200, "Should be callable"
 
 
+@pytest.mark.usefixtures("import_default_vendors")
+class TestExportProductListView:
+    URL_NAME = "productdb:export-product_list"
+
+    def test_404(self):
+        url = reverse(self.URL_NAME, kwargs={"product_list_id": 9999, "file_format": "csv"})
+        request = RequestFactory().get(url)
+        request.user = AnonymousUser()
+        with pytest.raises(Http404):
+            views.export_product_list(request, 9999, "csv")
+
+    @pytest.mark.usefixtures("enable_login_only_mode")
+    def test_anonymous_login_only_mode(self):
+        u = User.objects.create(username="pdb_user")
+        v = models.Vendor.objects.get(id=1)
+        p = models.Product.objects.create(product_id="test product", vendor=v)
+        pl = models.ProductList.objects.create(
+            name="PG",
+            string_product_list=p.product_id,
+            vendor=v,
+            update_user=u
+        )
+
+        for file_format in ["csv", "xlsx"]:
+            url = reverse(self.URL_NAME, kwargs={"product_list_id": pl.id, "file_format": file_format})
+            request = RequestFactory().get(url)
+            request.user = AnonymousUser()
+            response = views.export_product_list(request, pl.id, file_format)
+
+            assert response.status_code == 200, "Export is also callable in login only mode (like the share link)"
+            assert response["Content-Disposition"] == "attachment; filename=\"product list - PG.%s\"" % file_format
+
+        csv_lines = views.export_product_list(request, pl.id, "csv").content.decode().splitlines()
+        assert csv_lines[0].startswith("Vendor;Product ID;Product Group")
+        assert csv_lines[1].startswith("Cisco Systems;test product;")
+
+    def test_invalid_format(self):
+        u = User.objects.create(username="pdb_user")
+        v = models.Vendor.objects.get(id=1)
+        p = models.Product.objects.create(product_id="test product", vendor=v)
+        pl = models.ProductList.objects.create(
+            name="PG",
+            string_product_list=p.product_id,
+            vendor=v,
+            update_user=u
+        )
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        with pytest.raises(Http404):
+            views.export_product_list(request, pl.id, "pdf")
+
+
 @pytest.mark.usefixtures("import_default_vendors")
 class TestDetailProductListView:
     URL_NAME = "productdb:detail-product_list"
@@ -1217,6 +1271,46 @@ class TestListProductCheckView:
 class TestDetailProductCheckView:
     URL_NAME = "productdb:detail-product_check"
 
+    @staticmethod
+    def count_queries_for_product_check(product_ids):
+        pc = models.ProductCheck.objects.create(name="Test", input_product_ids="\n".join(product_ids))
+        pc.perform_product_check()
+        parameters = {"product_check_id": pc.id}
+        url = reverse(TestDetailProductCheckView.URL_NAME, kwargs=parameters)
+        request = RequestFactory().get(url)
+        request.user = AnonymousUser()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = views.detail_product_check(request, **parameters)
+
+        assert response.status_code == 200, "Should be callable"
+        return len(queries)
+
+    def test_constant_amount_of_queries(self, monkeypatch):
+        monkeypatch.setattr(tasks.prerender_product_list, "apply_async", lambda **kwargs: None)
+        u = User.objects.create(username="pdb_user")
+        v = models.Vendor.objects.get(id=1)
+        pms = models.ProductMigrationSource.objects.create(name="Preferred Migration Source", preference=60)
+        product_ids = []
+        for e in range(0, 10):
+            p = models.Product.objects.create(product_id="Product %d" % e, vendor=v)
+            models.Product.objects.create(product_id="Replacement %d" % e, vendor=v)
+            models.ProductMigrationOption.objects.create(
+                product=p,
+                migration_source=pms,
+                replacement_product_id="Replacement %d" % e
+            )
+            product_ids.append(p.product_id)
+        models.ProductList.objects.create(
+            name="PL",
+            string_product_list="\n".join(product_ids),
+            vendor=v,
+            update_user=u
+        )
+
+        assert self.count_queries_for_product_check(product_ids[:2]) == \
+            self.count_queries_for_product_check(product_ids)
+
     def test_anonymous_default(self):
         pc = models.ProductCheck.objects.create(name="Test", input_product_ids="Test")
         parameters = {"product_check_id": pc.id}
@@ -81,6 +81,11 @@ urlpatterns = [
     # API related URLs
     url(r'^api-docs(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name="api-schema-json"),
     url(r'^api-docs/$', schema_view.with_ui('swagger', cache_timeout=0), name="apidocs"),
+    url(
+        r'^api/v1/productchecks/show-inventory/$',
+        api_views.ShowInventoryProductCheckApiView.as_view(),
+        name="api-productcheck-show_inventory"
+    ),
     url(r'^api/v1/', include(router.urls)),
     url(r'^api/token-auth/', decorated_login_view, name="api-token-auth"),
     url(r'^api/token-logout/', decorated_logout_view, name="api-token-logout"),
@@ -130,6 +135,11 @@ urlpatterns = [
     url(r'^productlist/delete/(?P<product_list_id>\d+)/$', views.delete_product_list, name='delete-product_list'),
 
     url(r'^share/productlist/(?P<product_list_id>\d+)/$', views.share_product_list, name='share-product_list'),
+    url(
+        r'^share/productlist/(?P<product_list_id>\d+)/export/(?P<file_format>csv|xlsx)/$',
+        views.export_product_list,
+        name='export-product_list'
+    ),
 
     url(r'^productcheck/(?P<product_check_id>\d+)/$', views.detail_product_check, name="detail-product_check"),
     url(r'^productcheck/create/$', views.create_product_check, name="create-product_check"),
@@ -1,6 +1,7 @@
 import re
-import jtextfsm as textfsm
-import io
+import tarfile
+import zipfile
+from collections import Counter
 from django.core.cache import cache
 from app.config.settings import AppSettings
 
@@ -86,6 +87,15 @@ def login_required_if_login_only_mode(request):
     return False
 
 
+# match the PID lines of a show inventory output (PID, VID and a required serial number), the product ID is the
+# first group, lines without a serial number are ignored
+SHOW_INVENTORY_PID_LINE_REGEX = re.compile(r"^[ \t]*PID: (\S*).*VID: (\S*).*SN: (\S+)", re.MULTILINE)
+
+SHOW_INVENTORY_ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+SHOW_INVENTORY_ARCHIVE_MAX_FILES = 10000
+SHOW_INVENTORY_ARCHIVE_MAX_SIZE = 200 * 1024 * 1024
+
+
 def parse_cisco_show_inventory(content):
     """
     convert the output of a show inventory command to a list of product IDs
@@ -95,27 +105,67 @@ def parse_cisco_show_inventory(content):
     if type(content) is not str:
         raise AttributeError("content must be a string data type")
 
-    # remove empty lines and leading and trailing whitespace
-    sanitized_content = "\n".join([line.strip() for line in content.splitlines() if line != ""])
+    return [
+        match.group(1) for match in SHOW_INVENTORY_PID_LINE_REGEX.finditer(content) if match.group(1) != ""
+    ]
+
+
+def count_cisco_show_inventory_product_ids(contents):
+    """
+    aggregate the Product IDs from multiple show inventory outputs (e.g. one per device)
+    :param contents: iterable of show inventory outputs
+    :return: Counter with the amount per Product ID
+    """
+    result = Counter()
+    for content in contents:
+        result.update(parse_cisco_show_inventory(content))
+
+    return result
+
+
+def convert_product_amounts_to_input_string(product_amounts):
+    """
+    convert a Counter with Product IDs to an input string for a Product Check (one line per Product ID, the
+    Product ID is repeated based on the amount)
+    """
+    return "\n".join([
+        ";".join([product_id] * amount) for product_id, amount in sorted(product_amounts.items()) if amount > 0
+    ])
+
+
+def read_show_inventory_files(uploaded_file):
+    """
+    read the show inventory outputs from a text file or from a tar/zip archive with multiple text files
+    :param uploaded_file: file like object with a name attribute
+    :raises ValueError: if the archive is invalid or exceeds the size limits
+    :return: list of strings, one per file
+    """
+    filename = (getattr(uploaded_file, "name", None) or "").lower()
+    if not filename.endswith(SHOW_INVENTORY_ARCHIVE_EXTENSIONS):
+        return [uploaded_file.read().decode("utf-8", errors="replace")]
+
+    try:
+        if filename.endswith(".zip"):
+            with zipfile.ZipFile(uploaded_file) as archive:
+                members = [m for m in archive.infolist() if not m.is_dir()]
+                _verify_show_inventory_archive_size(len(members), sum([m.file_size for m in members]))
+                return [archive.read(m).decode("utf-8", errors="replace") for m in members]
+
+        with tarfile.open(fileobj=uploaded_file, mode="r:*") as archive:
+            members = [m for m in archive.getmembers() if m.isfile()]
+            _verify_show_inventory_archive_size(len(members), sum([m.size for m in members]))
+            return [archive.extractfile(m).read().decode("utf-8", errors="replace") for m in members]
 
-    template = io.StringIO()
-    template.write("""\
-Value name (.+)
-Value description (.*)
-Value productid (\S*)
-Value vid (\S*)
-Value Required serialnumber (\S+)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError):
+        raise ValueError("invalid archive, cannot read %s" % uploaded_file.name)
 
-Start
-  ^NAME: "${name}", DESCR: "${description}"
-  ^PID: ${productid}.*VID: ${vid}.*SN: ${serialnumber} -> Record
-""")
-    template.seek(0)
 
-    show_inventory_template = textfsm.TextFSM(template)
-    fsm_results = show_inventory_template.ParseText(sanitized_content)
+def _verify_show_inventory_archive_size(file_count, total_size):
+    if file_count > SHOW_INVENTORY_ARCHIVE_MAX_FILES:
+        raise ValueError("archive contains more than %d files" % SHOW_INVENTORY_ARCHIVE_MAX_FILES)
 
-    return [line[2] for line in fsm_results if line[2] != ""]
+    if total_size > SHOW_INVENTORY_ARCHIVE_MAX_SIZE:
+        raise ValueError("uncompressed archive is larger than %d MB" % (SHOW_INVENTORY_ARCHIVE_MAX_SIZE / 1024 / 1024))
 
 
 def split_string(string, length=65536):
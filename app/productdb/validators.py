@@ -21,18 +21,19 @@ def validate_product_list_string(value, vendor_id):
     vendor
     """
     values = []
-    missing_products = []
 
     for line in value.splitlines():
         values += line.split(";")
     values = sorted([e.strip() for e in values])
 
-    for value in values:
-        try:
-            app.productdb.models.Product.objects.get(product_id=value, vendor_id=vendor_id)
-
-        except:
-            missing_products.append(value)
+    # lookup all Product IDs with a single query
+    existing_products = set(
+        app.productdb.models.Product.objects.filter(
+            product_id__in=set(values),
+            vendor_id=vendor_id
+        ).values_list("product_id", flat=True)
+    )
+    missing_products = [value for value in values if value not in existing_products]
 
     if len(missing_products) != 0:
         v = app.productdb.models.Vendor.objects.filter(id=vendor_id).first()
@@ -5,7 +5,7 @@ from django.contrib.auth.decorators import permission_required
 from django.core.cache import cache
 from django.urls import reverse
 from django.db.models import Q
-from django.http import Http404
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect, render, get_object_or_404
 from django.template.defaultfilters import safe
 from django.utils.html import escape
@@ -17,13 +17,23 @@ from app.config.models import NotificationMessage, TextBlock
 from app.productdb.forms import ImportProductsFileUploadForm, ProductListForm, UserProfileForm, \
     ImportProductMigrationFileUploadForm, ProductCheckForm
 from app.productdb.models import Product, JobFile, ProductGroup, ProductList, UserProfile, ProductMigrationSource, \
-    ProductCheck
-from app.productdb.models import Vendor
+    ProductCheck, ProductCheckEntry
+from app.productdb.models import Vendor, get_product_list_cache_date
+from app.productdb import product_list_export
 import app.productdb.tasks as tasks
 from django_project.celery import set_meta_data_for_task
 from app.productdb.utils import login_required_if_login_only_mode
 
 HOMEPAGE_CONTEXT_CACHE_KEY = "PDB_HOMEPAGE_CONTEXT"
+HOMEPAGE_STATISTICS_PLACEHOLDER = {
+    "product_count": "-",
+    "product_lifecycle_count": "-",
+    "product_no_eol_announcement_count": "-",
+    "product_eol_announcement_count": "-",
+    "product_eos_count": "-",
+    "product_eol_count": "-",
+    "product_price_count": "-",
+}
 logger = logging.getLogger("productdb")
 
 
@@ -48,33 +58,21 @@ def home(request):
 
     context = cache.get(HOMEPAGE_CONTEXT_CACHE_KEY)
     if not context:
-        all_products_query = Product.objects.all()
         context = {
             "recent_events": NotificationMessage.objects.filter(
                 created__gte=datetime.now(get_current_timezone()) - timedelta(days=30)
             ).order_by('-created')[:5],
             "vendors": [x.name for x in Vendor.objects.all() if x.name != "unassigned"],
-            "product_count": all_products_query.count(),
-            "product_lifecycle_count": all_products_query.filter(eox_update_time_stamp__isnull=False).count(),
-            "product_no_eol_announcement_count": all_products_query.filter(
-                eox_update_time_stamp__isnull=False,
-                eol_ext_announcement_date__isnull=True
-            ).count(),
-            "product_eol_announcement_count": all_products_query.filter(
-                eol_ext_announcement_date__isnull=False,
-                end_of_sale_date__gt=today_date
-            ).count(),
-            "product_eos_count": all_products_query.filter(
-                Q(end_of_sale_date__lte=today_date, end_of_support_date__gt=today_date)|
-                Q(end_of_sale_date__lte=today_date, end_of_support_date__isnull=True)
-            ).count(),
-            "product_eol_count": all_products_query.filter(
-                end_of_support_date__lte=today_date
-            ).count(),
-            "product_price_count": all_products_query.filter(list_price__isnull=False).count(),
         }
         cache.set(HOMEPAGE_CONTEXT_CACHE_KEY, context, timeout=60*10)
 
+    # the Product statistics are computed in the background, outdated values are shown until the update is finished
+    statistics = cache.get(tasks.HOMEPAGE_STATISTICS_CACHE_KEY)
+    if not statistics or statistics.get("statistics_date") != today_date:
+        tasks.schedule_homepage_statistics_update()
+
+    context.update(statistics if statistics else HOMEPAGE_STATISTICS_PLACEHOLDER)
+
     context.update({
         "TB_HOMEPAGE_TEXT_BEFORE_FAVORITE_ACTIONS":
             TextBlock.objects.filter(name=TextBlock.TB_HOMEPAGE_TEXT_BEFORE_FAVORITE_ACTIONS).first(),
@@ -225,6 +223,7 @@ def detail_product_list(request, product_list_id=None, share_link=False):
 
     context = {
         "product_list": pl,
+        "product_list_cache_date": get_product_list_cache_date(),
         "share_link_content": share_link_content,
         "share_link": False if request.user.is_authenticated else share_link,
         "share_link_url": share_link_url,
@@ -237,6 +236,28 @@ def detail_product_list(request, product_list_id=None, share_link=False):
     return render(request, "productdb/product_list/detail-product_list.html", context=context)
 
 
+def export_product_list(request, product_list_id, file_format):
+    """download the (prerendered) export file of a product list, available to everyone who can access the share link
+    :param request:
+    :param product_list_id:
+    :param file_format: format of the export file (csv or xlsx)
+    :return:
+    """
+    pl = get_object_or_404(ProductList, id=product_list_id)
+    if file_format not in product_list_export.EXPORT_FORMATS:
+        raise Http404("Export format %s not supported" % file_format)
+
+    response = HttpResponse(
+        pl.get_export_file(file_format),
+        content_type=product_list_export.EXPORT_CONTENT_TYPES[file_format]
+    )
+    response["Content-Disposition"] = "attachment; filename=\"%s\"" % product_list_export.get_export_filename(
+        pl, file_format
+    )
+
+    return response
+
+
 def view_product_details(request, product_id=None):
     """view product details"""
     if login_required_if_login_only_mode(request):
@@ -337,10 +358,15 @@ def detail_product_check(request, product_check_id):
     if login_required_if_login_only_mode(request):
         return redirect('%s?next=%s' % (settings.LOGIN_URL, request.path))
 
-    product_check = ProductCheck.objects.filter(id=product_check_id).prefetch_related(
+    product_check = ProductCheck.objects.filter(id=product_check_id).select_related(
+        "migration_source"
+    ).prefetch_related(
         "productcheckentry_set",
         "productcheckentry_set__product_in_database",
+        "productcheckentry_set__product_in_database__vendor",
         "productcheckentry_set__migration_product",
+        "productcheckentry_set__migration_product__migration_source",
+        "productcheckentry_set__migration_product__replacement_db_product",
     ).first()
 
     if product_check is None:
@@ -352,6 +378,9 @@ def detail_product_check(request, product_check_id):
 
     return render(request, "productdb/product_check/detail-product_check.html", context={
         "product_check": product_check,
+        "product_check_entries": ProductCheckEntry.set_current_product_list_hash_values(
+            product_check.productcheckentry_set.all()
+        ),
         "back_to": request.GET.get("back_to") if request.GET.get("back_to") else reverse("productdb:list-product_checks")
     })
 
@@ -366,7 +395,7 @@ def create_product_check(request):
         return redirect('%s?next=%s' % (settings.LOGIN_URL, request.path))
 
     if request.method == "POST":
-        form = ProductCheckForm(request.POST)
+        form = ProductCheckForm(request.POST, request.FILES)
 
         if form.is_valid():
             if form.cleaned_data["public_product_check"]:
@@ -0,0 +1,239 @@
+"""
+reproducible synthetic catalogue for the benchmarks (Vendors, Product Groups, Products, migration chains, Product
+Lists and Product ID normalization rules) and the input files for the hot paths (Excel, CSV and EoX JSON)
+"""
+import csv
+import json
+import random
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from openpyxl import Workbook
+from app.productdb.models import Vendor, ProductGroup, Product, ProductMigrationSource, ProductMigrationOption, \
+    ProductList, ProductIdNormalizationRule
+
+# vendor ID (from the default_vendors.yaml fixture) - share of the catalogue and Product ID families
+VENDORS = {
+    1: (0.7, ["WS-C2960X", "WS-C3850", "C9300", "C9500", "ISR4331", "ASR1001", "N9K-C93180", "AIR-AP3802I"]),
+    2: (0.3, ["EX4300", "EX2300", "QFX5120", "MX204", "SRX345"]),
+}
+BENCHMARK_PREFIX = "BM"
+MIGRATION_SOURCE_NAME = "Benchmark Migration Source"
+PRODUCT_LIST_PREFIX = "Benchmark Product List"
+USERNAME = "benchmark"
+
+
+class SyntheticCatalogue:
+    """
+    synthetic catalogue with the given amount of Products, the same seed creates always the same data
+    """
+    def __init__(self, products=10000, seed=4711, migration_ratio=0.1, eol_ratio=0.3, batch_size=5000):
+        self.amount_of_products = products
+        self.seed = seed
+        self.migration_ratio = migration_ratio
+        self.eol_ratio = eol_ratio
+        self.batch_size = batch_size
+        self.products = self._generate_products()
+
+    def _random(self, name):
+        # independent random generator per data set, so changing one data set doesn't change the others
+        return random.Random("%s-%s" % (self.seed, name))
+
+    def _generate_products(self):
+        rnd = self._random("products")
+        result = []
+        for vendor_id, (share, families) in VENDORS.items():
+            for counter in range(int(self.amount_of_products * share)):
+                family = families[counter % len(families)]
+                eol = rnd.random() < self.eol_ratio
+                end_of_sale_date = date(2015, 1, 1) + timedelta(days=rnd.randint(0, 4000)) if eol else None
+                result.append({
+                    "vendor_id": vendor_id,
+                    "product_id": "%s-%s-%s%06d" % (family, BENCHMARK_PREFIX, rnd.choice("ABCDEFGH"), counter),
+                    "description": "%s series component %d" % (family, counter),
+                    "list_price": round(rnd.uniform(10, 50000), 2),
+                    "tags": rnd.choice(["chassis", "module", "power", "license", ""]),
+                    "product_group": "%s %s" % (family, BENCHMARK_PREFIX),
+                    "end_of_sale_date": end_of_sale_date,
+                    "end_of_support_date": end_of_sale_date + timedelta(days=5 * 365) if eol else None,
+                })
+
+        return result
+
+    def product_ids(self, vendor_id=None):
+        return [p["product_id"] for p in self.products if vendor_id is None or p["vendor_id"] == vendor_id]
+
+    def create(self):
+        """create the catalogue in the database (the default vendors must exist)"""
+        user, _ = User.objects.get_or_create(username=USERNAME)
+        vendors = {v.id: v for v in Vendor.objects.filter(id__in=VENDORS.keys())}
+
+        groups = {}
+        for name, vendor_id in sorted({(p["product_group"], p["vendor_id"]) for p in self.products}):
+            groups[name], _ = ProductGroup.objects.get_or_create(name=name, vendor=vendors[vendor_id])
+
+        Product.objects.bulk_create([
+            Product(
+                product_id=p["product_id"],
+                vendor=vendors[p["vendor_id"]],
+                description=p["description"],
+                list_price=p["list_price"],
+                currency="USD",
+                tags=p["tags"],
+                product_group=groups[p["product_group"]],
+                end_of_sale_date=p["end_of_sale_date"],
+                end_of_support_date=p["end_of_support_date"],
+            ) for p in self.products
+        ], batch_size=self.batch_size)
+
+        self._create_migration_chains()
+        self._create_product_lists(user)
+        self._create_normalization_rules(vendors)
+
+    def _create_migration_chains(self):
+        """migration chains with one to three steps, the last replacement is not always part of the database"""
+        rnd = self._random("migrations")
+        migration_source, _ = ProductMigrationSource.objects.get_or_create(name=MIGRATION_SOURCE_NAME)
+        products = dict(
+            Product.objects.filter(product_id__contains="-%s-" % BENCHMARK_PREFIX).values_list("product_id", "id")
+        )
+        product_ids = sorted(products.keys())
+
+        # replacements are always later in the sorted list of Product IDs, so the chains never contain a loop
+        options = []
+        for index in sorted(rnd.sample(range(len(product_ids) - 1), int(len(product_ids) * self.migration_ratio))):
+            chain = [index]
+            for _ in range(rnd.randint(1, 3)):
+                if chain[-1] + 1 < len(product_ids):
+                    chain.append(rnd.randint(chain[-1] + 1, min(chain[-1] + 1000, len(product_ids) - 1)))
+
+            chain = [product_ids[e] for e in chain]
+            for source, replacement in zip(chain, chain[1:]):
+                if rnd.random() < 0.2:
+                    replacement = "%s-NOT-IN-DB" % replacement
+                options.append(ProductMigrationOption(
+                    product_id=products[source],
+                    migration_source=migration_source,
+                    replacement_product_id=replacement,
+                    replacement_db_product_id=products.get(replacement)
+                ))
+
+        ProductMigrationOption.objects.bulk_create(options, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def _create_product_lists(self, user):
+        rnd = self._random("product_lists")
+        for counter in range(max(1, self.amount_of_products // 5000)):
+            vendor_id = 1 if counter % 3 else 2
+            product_ids = self.product_ids(vendor_id)
+            ProductList.objects.create(
+                name="%s %d" % (PRODUCT_LIST_PREFIX, counter),
+                vendor_id=vendor_id,
+                string_product_list="\n".join(rnd.sample(product_ids, min(len(product_ids), rnd.randint(100, 500)))),
+                update_user=user
+            )
+
+    def _create_normalization_rules(self, vendors):
+        for vendor_id, (_, families) in VENDORS.items():
+            for family in families:
+                ProductIdNormalizationRule.objects.get_or_create(
+                    vendor=vendors[vendor_id],
+                    product_id=family + "-" + BENCHMARK_PREFIX + "-%s",
+                    regex_match=r"^%s%s(\w+)$" % (family.replace("-", ""), BENCHMARK_PREFIX)
+                )
+
+    def delete(self):
+        """remove the catalogue from the database"""
+        ProductList.objects.filter(name__startswith=PRODUCT_LIST_PREFIX).delete()
+        ProductMigrationSource.objects.filter(name=MIGRATION_SOURCE_NAME).delete()
+        ProductIdNormalizationRule.objects.filter(product_id__contains="-%s-" % BENCHMARK_PREFIX).delete()
+        Product.objects.filter(product_id__contains="-%s-" % BENCHMARK_PREFIX).delete()
+        ProductGroup.objects.filter(name__endswith=" %s" % BENCHMARK_PREFIX).delete()
+        User.objects.filter(username=USERNAME).delete()
+
+    def product_check_input(self, amount, unknown_ratio=0.1):
+        """list of Product IDs with duplicates and unknown entries"""
+        rnd = self._random("product_check_%d" % amount)
+        product_ids = self.product_ids()
+        result = []
+        for counter in range(amount):
+            if rnd.random() < unknown_ratio:
+                result.append("UNKNOWN-%s-%06d" % (BENCHMARK_PREFIX, counter))
+
+            else:
+                result.append(rnd.choice(product_ids))
+
+        return result
+
+    def write_product_check_csv(self, path, amount):
+        """CSV file with a Product ID and quantity per line"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["product id", "quantity"])
+            rnd = self._random("csv")
+            for product_id in sorted(set(self.product_check_input(amount))):
+                writer.writerow([product_id, rnd.randint(1, 20)])
+
+    def write_products_excel(self, path, amount, new_ratio=0.2):
+        """Excel file for the ProductsExcelImporter that updates existing Products and creates new ones"""
+        rnd = self._random("excel")
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("products")
+        sheet.append(["product id", "description", "list price", "currency", "vendor", "tags", "end of sale date"])
+        vendor_names = dict(Vendor.objects.filter(id__in=VENDORS.keys()).values_list("id", "name"))
+        for counter, product in enumerate(rnd.sample(self.products, min(amount, len(self.products)))):
+            product_id = product["product_id"]
+            if rnd.random() < new_ratio:
+                product_id = "NEW-%s-%06d" % (BENCHMARK_PREFIX, counter)
+            sheet.append([
+                product_id,
+                "updated description %d" % counter,
+                round(rnd.uniform(10, 50000), 2),
+                "USD",
+                vendor_names[product["vendor_id"]],
+                product["tags"],
+                (date(2015, 1, 1) + timedelta(days=rnd.randint(0, 4000))).isoformat()
+            ])
+
+        workbook.save(path)
+
+    def eox_records(self, amount):
+        """records in the format of the Cisco EoX API for existing Cisco Products"""
+        rnd = self._random("eox_%d" % amount)
+        records = []
+        for product_id in rnd.sample(self.product_ids(vendor_id=1), min(amount, len(self.product_ids(vendor_id=1)))):
+            eos = date(2015, 1, 1) + timedelta(days=rnd.randint(0, 4000))
+
+            def eox_date(days):
+                return {"value": (eos + timedelta(days=days)).isoformat(), "dateFormat": "YYYY-MM-DD"}
+
+            records.append({
+                "EOLProductID": product_id,
+                "ProductIDDescription": "EoX description of %s" % product_id,
+                "ProductBulletinNumber": "EOL%d" % rnd.randint(1000, 99999),
+                "LinkToProductBulletinURL": "https://www.cisco.com/c/en/us/products/eol%d.html" % rnd.randint(1, 999),
+                "EOXExternalAnnouncementDate": eox_date(-180),
+                "EndOfSaleDate": eox_date(0),
+                "EndOfSWMaintenanceReleases": eox_date(365),
+                "EndOfSecurityVulSupportDate": eox_date(730),
+                "EndOfRoutineFailureAnalysisDate": eox_date(365),
+                "EndOfServiceContractRenewal": eox_date(4 * 365),
+                "LastDateOfSupport": eox_date(5 * 365),
+                "EndOfSvcAttachDate": eox_date(365),
+                "UpdatedTimeStamp": eox_date(-200),
+                "EOXMigrationDetails": {
+                    "PIDActiveFlag": "Y",
+                    "MigrationInformation": "",
+                    "MigrationOption": "Enter PID(s)",
+                    "MigrationProductId": rnd.choice(self.product_ids(vendor_id=1)),
+                    "MigrationProductName": "",
+                    "MigrationStrategy": "",
+                    "MigrationProductInfoURL": ""
+                },
+                "EOXInputType": "ShowEOXByPids",
+                "EOXInputValue": product_id,
+            })
+
+        return records
+
+    def write_eox_json(self, path, amount):
+        with open(path, "w") as f:
+            json.dump({"EOXRecord": self.eox_records(amount)}, f)
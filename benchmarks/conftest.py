@@ -0,0 +1,106 @@
+"""
+py.test configuration file for the performance benchmarks (requires the --benchmark option)
+
+Every benchmark records the wall time, the amount of database queries and the peak memory (Python allocations,
+measured with tracemalloc, so the wall time includes the tracing overhead) of a hot path. The results are written
+to the file from the --benchmark-output option and, if a --benchmark-baseline file is given, compared with a
+previous run.
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from benchmarks.catalogue import SyntheticCatalogue
+
+_results = {}
+
+
+class BenchmarkRecorder:
+    def __init__(self, config, catalogue):
+        self.tolerance = config.getoption("--benchmark-tolerance")
+        self.amount_of_products = catalogue.amount_of_products
+        self.baseline = {}
+        baseline_file = config.getoption("--benchmark-baseline")
+        if baseline_file:
+            with open(baseline_file) as f:
+                self.baseline = json.load(f).get("results", {})
+
+    @contextmanager
+    def __call__(self, name):
+        """measure the code within the context"""
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            yield
+
+        wall_time = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            "products": self.amount_of_products,
+            "wall_time": round(wall_time, 4),
+            "queries": queries[0],
+            "peak_memory_kb": round(peak_memory / 1024),
+        }
+        _results[name] = result
+        self._compare_with_baseline(name, result)
+
+    def _compare_with_baseline(self, name, result):
+        baseline = self.baseline.get(name)
+        if not baseline or baseline.get("products") != result["products"]:
+            return
+
+        regressions = []
+        for key in ["wall_time", "peak_memory_kb"]:
+            if result[key] > baseline[key] * (1 + self.tolerance):
+                regressions.append("%s %s > %s" % (key, result[key], baseline[key]))
+
+        if result["queries"] > baseline["queries"]:
+            regressions.append("queries %d > %d" % (result["queries"], baseline["queries"]))
+
+        if regressions:
+            pytest.fail("performance regression in %s: %s" % (name, ", ".join(regressions)))
+
+
+@pytest.fixture(scope="session")
+def benchmark_catalogue(request, django_db_setup, django_db_blocker):
+    """synthetic catalogue that is shared by all benchmarks (removed at the end of the session)"""
+    catalogue = SyntheticCatalogue(products=request.config.getoption("--benchmark-products"))
+    with django_db_blocker.unblock():
+        call_command("loaddata", "default_vendors.yaml")
+        with override_settings(CELERY_ALWAYS_EAGER=True):
+            catalogue.create()
+
+    yield catalogue
+
+    with django_db_blocker.unblock():
+        catalogue.delete()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_catalogue):
+    """context manager to measure a hot path, e.g. `with benchmark("name"): ...`"""
+    return BenchmarkRecorder(request.config, benchmark_catalogue)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+
+    output_file = session.config.getoption("--benchmark-output")
+    with open(output_file, "w") as f:
+        json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": _results}, f, indent=2, sort_keys=True)
+
+    print("\nbenchmark results written to %s" % os.path.abspath(output_file))
@@ -0,0 +1,21 @@
+"""
+benchmarks for the update of the local database based on Cisco EoX API records
+"""
+import json
+import pytest
+from app.ciscoeox.tasks import update_cisco_eox_records
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+@pytest.mark.parametrize("amount", [1000, 5000])
+def test_update_cisco_eox_records(benchmark, benchmark_catalogue, tmp_path, amount):
+    json_file = str(tmp_path / "eox_records.json")
+    benchmark_catalogue.write_eox_json(json_file, amount)
+
+    with benchmark("cisco_eox.update_cisco_eox_records[%d]" % amount):
+        with open(json_file) as f:
+            records = json.load(f)["EOXRecord"]
+        result = update_cisco_eox_records(records)
+
+    assert result["count"] == len(records)
@@ -0,0 +1,22 @@
+"""
+benchmarks for the Excel import of Products
+"""
+import pytest
+from django.contrib.auth.models import User
+from app.productdb.excel_import import ProductsExcelImporter
+from benchmarks.catalogue import USERNAME
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+@pytest.mark.parametrize("amount", [1000, 5000])
+def test_products_excel_import(benchmark, benchmark_catalogue, tmp_path, amount):
+    excel_file = str(tmp_path / "products.xlsx")
+    benchmark_catalogue.write_products_excel(excel_file, amount)
+
+    with benchmark("excel_import.products[%d]" % amount):
+        importer = ProductsExcelImporter(excel_file, user_for_revision=User.objects.get(username=USERNAME))
+        importer.verify_file()
+        importer.import_to_database()
+
+    assert importer.invalid_products == 0
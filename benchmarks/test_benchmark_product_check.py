@@ -0,0 +1,50 @@
+"""
+benchmarks for the Product Check
+"""
+import csv
+import pytest
+from app.productdb.models import ProductCheck, ProductCheckEntry, ProductMigrationSource
+from benchmarks.catalogue import MIGRATION_SOURCE_NAME
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+@pytest.mark.parametrize("amount", [1000, 10000])
+def test_perform_product_check(benchmark, benchmark_catalogue, amount):
+    product_check = ProductCheck.objects.create(
+        name="benchmark",
+        input_product_ids="\n".join(benchmark_catalogue.product_check_input(amount))
+    )
+
+    with benchmark("product_check.perform_product_check[%d]" % amount):
+        product_check.perform_product_check()
+
+    assert ProductCheckEntry.objects.filter(product_check=product_check).count() == \
+        len(product_check.input_product_amounts)
+
+
+def test_perform_product_check_with_migration_source(benchmark, benchmark_catalogue):
+    product_check = ProductCheck.objects.create(
+        name="benchmark",
+        migration_source=ProductMigrationSource.objects.get(name=MIGRATION_SOURCE_NAME),
+        input_product_ids="\n".join(benchmark_catalogue.product_check_input(5000))
+    )
+
+    with benchmark("product_check.perform_product_check_with_migration_source"):
+        product_check.perform_product_check()
+
+
+def test_perform_product_check_from_csv(benchmark, benchmark_catalogue, tmp_path):
+    csv_file = str(tmp_path / "product_check.csv")
+    benchmark_catalogue.write_product_check_csv(csv_file, 5000)
+
+    with benchmark("product_check.perform_product_check_from_csv"):
+        with open(csv_file, newline="") as f:
+            rows = list(csv.DictReader(f, delimiter=";"))
+        product_check = ProductCheck.objects.create(
+            name="benchmark",
+            input_product_ids="\n".join([";".join([r["product id"]] * int(r["quantity"])) for r in rows])
+        )
+        product_check.perform_product_check()
+
+    assert sum(product_check.input_product_amounts.values()) == sum([int(r["quantity"]) for r in rows])
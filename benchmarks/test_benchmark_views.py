@@ -0,0 +1,75 @@
+"""
+benchmarks for the datatables endpoints and the Product API endpoint
+"""
+import pytest
+from urllib.parse import urlencode
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+def datatables_query(search=""):
+    return urlencode({
+        "draw": 1,
+        "start": 0,
+        "length": 100,
+        "search[value]": search,
+        "order[0][column]": 0,
+        "order[0][dir]": "asc",
+    })
+
+
+@pytest.fixture
+def benchmark_user():
+    return User.objects.create_superuser("benchmark_admin", "benchmark@localhost.localdomain", "benchmark")
+
+
+@pytest.mark.parametrize("search", ["", "C9300"])
+def test_datatables_list_products(benchmark, benchmark_catalogue, benchmark_user, search):
+    client = Client()
+    client.force_login(benchmark_user)
+    url = reverse("productdb:datatables_list_products_view") + "?" + datatables_query(search)
+
+    with benchmark("datatables.list_products[%s]" % (search or "all")):
+        response = client.get(url)
+
+    assert response.status_code == 200
+
+
+def test_datatables_vendor_products(benchmark, benchmark_catalogue, benchmark_user):
+    client = Client()
+    client.force_login(benchmark_user)
+    url = reverse("productdb:datatables_vendor_products_endpoint", kwargs={"vendor_id": 1}) + "?" + \
+        datatables_query("WS-C")
+
+    with benchmark("datatables.vendor_products"):
+        response = client.get(url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("page_size", [25, 1000])
+def test_product_api_list(benchmark, benchmark_catalogue, benchmark_user, page_size):
+    client = APIClient()
+    client.force_authenticate(benchmark_user)
+    url = reverse("productdb:products-list") + "?" + urlencode({"page_size": page_size, "page": 2})
+
+    with benchmark("api.products_list[%d]" % page_size):
+        response = client.get(url, format="json")
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == page_size
+
+
+def test_product_api_search(benchmark, benchmark_catalogue, benchmark_user):
+    client = APIClient()
+    client.force_authenticate(benchmark_user)
+    url = reverse("productdb:products-list") + "?" + urlencode({"search": "^EX4300", "page_size": 100})
+
+    with benchmark("api.products_search"):
+        response = client.get(url, format="json")
+
+    assert response.status_code == 200
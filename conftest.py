@@ -19,11 +19,21 @@ def pytest_addoption(parser):
     # requires test credentials in the working directory named .cisco_api_credentials
     parser.addoption("--online", action="store_true", help="run tests online (with external API access)")
     parser.addoption("--selenium", action="store_true", help="execute selenium based test cases against a test instance")
+    parser.addoption("--benchmark", action="store_true", help="run the performance benchmarks (benchmarks directory)")
+    parser.addoption("--benchmark-products", action="store", type=int, default=10000,
+                     help="amount of Products in the synthetic catalogue for the benchmarks")
+    parser.addoption("--benchmark-output", action="store", default=os.path.join("benchmarks", "results.json"),
+                     help="file to store the benchmark results")
+    parser.addoption("--benchmark-baseline", action="store", default=None,
+                     help="results of a previous benchmark run, fail if a benchmark is slower or executes more queries")
+    parser.addoption("--benchmark-tolerance", action="store", type=float, default=0.25,
+                     help="allowed relative deviation of the wall time and the peak memory from the baseline")
 
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "online: run tests that require an internet connection")
     config.addinivalue_line("markers", "selenium: run selenium tests (which require a test instance)")
+    config.addinivalue_line("markers", "benchmark: performance benchmarks (require the --benchmark option)")
 
     if config.getoption("--selenium"):
         # unchecked cleanup if the test is restarted (won't delete on fail for troubleshooting)
@@ -51,6 +61,12 @@ def pytest_collection_modifyitems(config, items):
             if "selenium" in item.keywords:
                 item.add_marker(skip_selenium)
 
+    if not config.getoption("--benchmark"):
+        skip_benchmark = pytest.mark.skip(reason="need --benchmark option to run")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
 
 @pytest.fixture
 def redis_server_required():
@@ -0,0 +1,87 @@
+"""
+REST API authentication classes
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authentication import BasicAuthentication
+
+# the key is only held in the memory of the process, the cache entries are useless outside of it
+_CREDENTIAL_KEY = secrets.token_bytes(32)
+_MAX_CACHE_ENTRIES = 10000
+
+# HMAC of the credentials - (user id, fingerprint of the user state, expire timestamp)
+_verified_credentials = {}
+_verified_credentials_lock = threading.Lock()
+
+
+def _get_credential_digest(userid, password):
+    return hmac.new(_CREDENTIAL_KEY, ("%s\x00%s" % (userid, password)).encode("utf-8"), hashlib.sha256).digest()
+
+
+def _get_user_fingerprint(user):
+    """changes if the password is changed or the user is deactivated"""
+    return hmac.new(
+        _CREDENTIAL_KEY, ("%s\x00%s" % (user.password, user.is_active)).encode("utf-8"), hashlib.sha256
+    ).digest()
+
+
+def clear_verified_credentials(user_id=None):
+    """remove the verified credentials of a single user or of all users from the process memory"""
+    with _verified_credentials_lock:
+        if user_id is None:
+            _verified_credentials.clear()
+            return
+
+        for digest in [d for d, entry in _verified_credentials.items() if entry[0] == user_id]:
+            _verified_credentials.pop(digest, None)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    HTTP Basic authentication that keeps successful credential verifications in the process memory for a short time
+    (API_BASIC_AUTH_CACHE_TIMEOUT seconds), so that scripted API consumers don't pay for the password hashing on every
+    request. An entry is only used as long as the password and the active state of the user are unchanged.
+    """
+    def authenticate_credentials(self, userid, password, request=None):
+        timeout = getattr(settings, "API_BASIC_AUTH_CACHE_TIMEOUT", 0)
+        if timeout <= 0:
+            return super().authenticate_credentials(userid, password, request)
+
+        digest = _get_credential_digest(userid, password)
+        entry = _verified_credentials.get(digest)
+        if entry is not None:
+            user_id, fingerprint, expires = entry
+            if expires > time.monotonic():
+                user = get_user_model().objects.filter(pk=user_id).first()
+                if user is not None and user.is_active and hmac.compare_digest(fingerprint, _get_user_fingerprint(user)):
+                    return user, None
+
+            _verified_credentials.pop(digest, None)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+
+        with _verified_credentials_lock:
+            if len(_verified_credentials) >= _MAX_CACHE_ENTRIES:
+                now = time.monotonic()
+                for key in [k for k, e in _verified_credentials.items() if e[2] <= now]:
+                    del _verified_credentials[key]
+
+                if len(_verified_credentials) >= _MAX_CACHE_ENTRIES:
+                    _verified_credentials.clear()
+
+            _verified_credentials[digest] = (user.pk, _get_user_fingerprint(user), time.monotonic() + timeout)
+
+        return user, auth
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL, dispatch_uid="clear_verified_credentials")
+def clear_verified_credentials_of_user(sender, instance, **kwargs):
+    """other processes detect the change based on the fingerprint of the user"""
+    clear_verified_credentials(instance.pk)
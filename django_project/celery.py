@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 import celery
 import raven
 from celery import states
@@ -27,6 +28,14 @@ app = Celery("product_db")
 app.config_from_object("django.conf:settings")
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 
+if getattr(settings, "PDB_ENABLE_METRICS", False):
+    from django_project.metrics import install_celery_signals
+    install_celery_signals()
+
+if getattr(settings, "PDB_ENABLE_PROFILING", False):
+    from django_project import profiling
+    profiling.install_celery_signals()
+
 
 class TaskState(object):
     """
@@ -39,6 +48,98 @@ class TaskState(object):
     PENDING = states.PENDING
 
 
+class TaskProgressReporter(object):
+    """
+    rate limited status updates for long running tasks, writes the status message and the progress of the task
+    (processed, total, rate and ETA) to the result backend.
+
+    Status messages without a processed count (e.g. a new phase of the task) are always written, progress updates
+    only if the last update is at least ``min_interval_seconds`` or ``min_interval_count`` entries ago.
+    """
+    DEFAULT_PROGRESS_MESSAGE = "Process entry <strong>%d</strong> of <strong>%d</strong>..."
+
+    def __init__(self, task, total=None, min_interval_seconds=2, min_interval_count=500):
+        self.task = task
+        self.total = total
+        self.processed = 0
+        self.status_message = ""
+        self.min_interval_seconds = min_interval_seconds
+        self.min_interval_count = min_interval_count
+        self._start_time = None
+        self._last_update_time = None
+        self._last_update_count = 0
+
+    def __call__(self, status_message=None, processed=None, total=None, force=False):
+        return self.update(status_message=status_message, processed=processed, total=total, force=force)
+
+    def _is_update_required(self):
+        if self._last_update_time is None:
+            return True
+
+        if self.processed - self._last_update_count >= self.min_interval_count:
+            return True
+
+        return time.monotonic() - self._last_update_time >= self.min_interval_seconds
+
+    def get_progress(self):
+        """progress values of the task, rate in entries per second and ETA in seconds"""
+        rate = None
+        eta = None
+        if self._start_time is not None and self.processed > 0:
+            elapsed = time.monotonic() - self._start_time
+            if elapsed > 0:
+                rate = self.processed / elapsed
+                if self.total:
+                    eta = max(self.total - self.processed, 0) / rate
+
+        return {
+            "processed": self.processed,
+            "total": self.total,
+            "rate": round(rate, 2) if rate is not None else None,
+            "eta": int(round(eta)) if eta is not None else None
+        }
+
+    def update(self, status_message=None, processed=None, total=None, force=False):
+        """
+        update the status of the task
+        :param status_message: status message that is displayed in the watch view
+        :param processed: amount of processed entries
+        :param total: total amount of entries
+        :param force: write the state regardless of the rate limit
+        :return: True if the state was written to the result backend
+        """
+        if total is not None:
+            self.total = total
+
+        if processed is None:
+            force = True
+
+        else:
+            if self._start_time is None:
+                self._start_time = time.monotonic()
+            self.processed = processed
+
+        if not (force or self._is_update_required()):
+            return False
+
+        if status_message is not None:
+            self.status_message = status_message
+
+        elif processed is not None and self.total:
+            self.status_message = self.DEFAULT_PROGRESS_MESSAGE % (self.processed, self.total)
+
+        meta = {
+            "status_message": self.status_message
+        }
+        if self._start_time is not None:
+            meta["progress"] = self.get_progress()
+
+        self.task.update_state(state=TaskState.PROCESSING, meta=meta)
+        self._last_update_time = time.monotonic()
+        self._last_update_count = self.processed
+        return True
+
+
 def is_worker_active():
     try:
         i = app.control.inspect()
@@ -0,0 +1,136 @@
+"""
+read replica routing (enabled with PDB_DATABASE_REPLICA_HOSTS)
+
+All queries use the primary database (`default`) except for read-only requests (GET, HEAD and OPTIONS) and read-only
+task phases (see `use_replica`), which read from a randomly chosen replica. After a write, all further reads of the
+request or task use the primary and the client is pinned to the primary for the next PDB_DATABASE_REPLICA_STICKY_SECONDS
+(using a cookie), so it always reads its own writes.
+
+The cacheops keys are the same for all databases, therefore the results of replica reads are never cached (a lagging
+replica would store stale rows for every client after an invalidation). Cached results are only stored by reads from
+the primary.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_DATABASE = "default"
+REPLICA_DATABASE_PREFIX = "replica_"
+PRIMARY_COOKIE_NAME = "productdb_primary"
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+# writes of these apps don't pin to the primary (e.g. the session is saved on every request)
+UNPINNED_APP_LABELS = ("sessions", )
+# reads of these apps and models always use the primary, they populate long-lived caches (cacheops, process wide
+# copies) that would keep stale data from a lagging replica after an invalidation
+PRIMARY_READ_APP_LABELS = ("config", "auth", "sessions")
+PRIMARY_READ_MODELS = ("productdb.productidnormalizationrule", )
+
+_state = threading.local()
+_cacheops_guard_installed = [False]
+
+
+def get_replica_databases():
+    return sorted([alias for alias in settings.DATABASES.keys() if alias.startswith(REPLICA_DATABASE_PREFIX)])
+
+
+def is_pinned_to_primary():
+    return getattr(_state, "pinned", False)
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """read from the replicas within the context (until the first write)"""
+    previous = getattr(_state, "use_replica", False), getattr(_state, "pinned", False)
+    _state.use_replica = enabled
+    _state.pinned = False
+    try:
+        yield
+
+    finally:
+        _state.use_replica, pinned = previous
+        _state.pinned = pinned or _state.pinned
+
+
+def install_cacheops_guard():
+    """don't use cacheops for querysets that read from a replica (only once per process)"""
+    if _cacheops_guard_installed[0]:
+        return
+    _cacheops_guard_installed[0] = True
+
+    # cacheops adds the method to the Django QuerySet class when the app is loaded
+    from django.db.models.query import QuerySet
+    should_cache = getattr(QuerySet, "_should_cache", None)
+    if should_cache is None:  # cacheops not installed
+        return
+
+    def _should_cache(self, op):
+        if self.db.startswith(REPLICA_DATABASE_PREFIX):
+            return False
+
+        return should_cache(self, op)
+
+    _should_cache.__wrapped__ = should_cache
+    QuerySet._should_cache = _should_cache
+
+
+class ReplicaRouter:
+    def __init__(self):
+        install_cacheops_guard()
+
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, "use_replica", False) or is_pinned_to_primary():
+            return PRIMARY_DATABASE
+
+        if model._meta.app_label in PRIMARY_READ_APP_LABELS or model._meta.label_lower in PRIMARY_READ_MODELS:
+            return PRIMARY_DATABASE
+
+        if connections[PRIMARY_DATABASE].in_atomic_block:
+            return PRIMARY_DATABASE
+
+        replicas = get_replica_databases()
+        return random.choice(replicas) if replicas else PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in UNPINNED_APP_LABELS:
+            _state.pinned = True
+
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # all databases contain the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DATABASE
+
+
+class ReplicaRoutingMiddleware:
+    """use the replicas for read-only requests, unless the client wrote to the primary recently"""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned_until = request.COOKIES.get(PRIMARY_COOKIE_NAME, "")
+        recently_written = pinned_until.isdigit() and int(pinned_until) > time.time()
+        read_only = request.method in READ_ONLY_METHODS and not recently_written
+
+        with use_replica(read_only):
+            response = self.get_response(request)
+            pinned = is_pinned_to_primary()
+
+        _state.pinned = False
+        if pinned:
+            sticky_seconds = settings.PDB_DATABASE_REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE_NAME,
+                str(int(time.time() + sticky_seconds)),
+                max_age=sticky_seconds,
+                path=settings.SESSION_COOKIE_PATH,
+                httponly=True,
+                samesite="Strict"
+            )
+
+        return response
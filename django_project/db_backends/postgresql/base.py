@@ -0,0 +1,202 @@
+"""
+PostgreSQL database backend with health checks of persistent connections and an optional in-process connection pool
+
+The additional (optional) keys of the database settings are:
+ * PRE_PING_QUERY - query to verify a persistent connection before it is reused (empty to disable the check)
+ * PRE_PING_INTERVAL - seconds that a connection must be idle before it is verified again
+ * POOL_SIZE - maximum amount of idle connections that are kept per process (0 disables the pool), the connections
+   are returned to the pool at the end of every request and task and closed after CONN_MAX_AGE seconds
+"""
+import logging
+import os
+import threading
+import time
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+logger = logging.getLogger("productdb")
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def is_connection_healthy(connection, query):
+    """run the pre-ping query on the given (idle) psycopg2 connection"""
+    if connection.closed:
+        return False
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+        if not connection.autocommit:
+            connection.rollback()
+
+    except base.Database.Error:
+        return False
+
+    return True
+
+
+class ConnectionPool:
+    """idle psycopg2 connections of a database (shared by all threads of the process)"""
+    def __init__(self, size, max_age=None, pre_ping_query=None, pre_ping_interval=0):
+        self.size = size
+        self.max_age = max_age
+        self.pre_ping_query = pre_ping_query
+        self.pre_ping_interval = pre_ping_interval
+        self._idle = []
+        self._created = {}
+        self._last_used = {}
+        self._lock = threading.Lock()
+
+    def _is_obsolete(self, connection):
+        if self.max_age is None:
+            return False
+
+        return time.time() - self._created.get(id(connection), 0) >= self.max_age
+
+    def _needs_pre_ping(self, connection):
+        if not self.pre_ping_query:
+            return False
+
+        return time.time() - self._last_used.get(id(connection), 0) >= self.pre_ping_interval
+
+    def _discard(self, connection):
+        self._created.pop(id(connection), None)
+        self._last_used.pop(id(connection), None)
+        try:
+            connection.close()
+
+        except base.Database.Error:  # ignore for coverage
+            pass
+
+    def get(self, conn_params):
+        """reuse an idle (healthy) connection or create a new one"""
+        while True:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+
+            if connection is None:
+                connection = base.Database.connect(**conn_params)
+                with self._lock:
+                    self._created[id(connection)] = time.time()
+                return connection
+
+            if self._is_obsolete(connection) or \
+                    (self._needs_pre_ping(connection) and not is_connection_healthy(connection, self.pre_ping_query)):
+                self._discard(connection)
+                continue
+
+            return connection
+
+    def put(self, connection):
+        """return a connection to the pool (closed, if it's not reusable or the pool is full)"""
+        # connections of another pool (e.g. inherited from the parent process) are never reused
+        if connection.closed or id(connection) not in self._created or self._is_obsolete(connection):
+            self._discard(connection)
+            return
+
+        try:
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+
+        except base.Database.Error:
+            self._discard(connection)
+            return
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                # the connection was used until now, it's verified again if it was idle for the pre-ping interval
+                self._last_used[id(connection)] = time.time()
+                self._idle.append(connection)
+                return
+
+        self._discard(connection)
+
+    def clear(self):
+        with self._lock:
+            connections, self._idle = self._idle, []
+
+        for connection in connections:
+            self._discard(connection)
+
+
+def get_pool(alias, settings_dict):
+    # the connections can't be shared with forked processes (e.g. the Celery worker processes)
+    key = (alias, os.getpid())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                size=settings_dict["POOL_SIZE"],
+                max_age=settings_dict["CONN_MAX_AGE"],
+                pre_ping_query=settings_dict.get("PRE_PING_QUERY"),
+                pre_ping_interval=settings_dict.get("PRE_PING_INTERVAL", 0)
+            )
+
+        return _pools[key]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_health_check = None
+
+    @property
+    def pool(self):
+        if not self.settings_dict.get("POOL_SIZE"):
+            return None
+
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        connection = pool.get(conn_params)
+
+        # same as in the PostgreSQL backend, the connection may come from the pool
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            pool.put(self.connection)
+
+    def close_if_unusable_or_obsolete(self):
+        """
+        called at the beginning and the end of every request and task, a pooled connection is always returned to the
+        pool and a persistent connection is verified with the pre-ping query if it was idle for too long
+        """
+        super().close_if_unusable_or_obsolete()
+        if self.connection is None or self.in_atomic_block:
+            return
+
+        if self.pool is not None:
+            self.close()
+            return
+
+        query = self.settings_dict.get("PRE_PING_QUERY")
+        now = time.time()
+        if query and (self.last_health_check is None or
+                      now - self.last_health_check >= self.settings_dict.get("PRE_PING_INTERVAL", 0)):
+            if not is_connection_healthy(self.connection, query):
+                logger.info("database connection %s failed the health check, reconnect..." % self.alias)
+                self.close()
+                return
+
+        self.last_health_check = now
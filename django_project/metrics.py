@@ -0,0 +1,352 @@
+"""
+query count and latency instrumentation for requests and Celery tasks (enabled with PDB_ENABLE_METRICS)
+
+The measurements (database queries and time, cacheops hits and misses, redis commands and time, total latency) are
+aggregated per endpoint (view name) and per task name in the memory of the process and periodically added to a
+single redis hash, so that the values of all web and worker processes are available on the /metrics endpoint in the
+Prometheus text format.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger("productdb")
+
+METRICS_CACHE_KEY = "PDB_METRICS"
+METRICS_FLUSH_INTERVAL = 10
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# metric name - description (the duration metrics are histograms, all other metrics are counters)
+METRIC_DESCRIPTIONS = {
+    "pdb_http_requests_total": "amount of requests",
+    "pdb_http_request_duration_seconds": "total latency of the requests",
+    "pdb_http_request_db_queries_total": "amount of database queries during the requests",
+    "pdb_http_request_db_seconds_total": "time spent in database queries during the requests",
+    "pdb_http_request_cacheops_hits_total": "amount of cacheops hits during the requests",
+    "pdb_http_request_cacheops_misses_total": "amount of cacheops misses during the requests",
+    "pdb_http_request_redis_commands_total": "amount of redis commands during the requests",
+    "pdb_http_request_redis_seconds_total": "time spent in redis commands during the requests",
+    "pdb_task_runs_total": "amount of executed tasks",
+    "pdb_task_duration_seconds": "total latency of the tasks",
+    "pdb_task_db_queries_total": "amount of database queries during the tasks",
+    "pdb_task_db_seconds_total": "time spent in database queries during the tasks",
+    "pdb_task_cacheops_hits_total": "amount of cacheops hits during the tasks",
+    "pdb_task_cacheops_misses_total": "amount of cacheops misses during the tasks",
+    "pdb_task_redis_commands_total": "amount of redis commands during the tasks",
+    "pdb_task_redis_seconds_total": "time spent in redis commands during the tasks",
+}
+
+_state = threading.local()
+_local_metrics = defaultdict(float)
+_local_metrics_lock = threading.Lock()
+_last_flush = [time.monotonic()]
+_installed = [False]
+
+
+class Measurement:
+    """measurements of a single request or task"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cacheops_hits = 0
+        self.cacheops_misses = 0
+        self.redis_commands = 0
+        self.redis_time = 0.0
+        self.sql_statements = Counter()
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.start
+
+
+def _active_measurements():
+    return getattr(_state, "measurements", [])
+
+
+def start_measurement():
+    measurement = Measurement()
+    _state.measurements = _active_measurements() + [measurement]
+    return measurement
+
+
+def stop_measurement(measurement):
+    _state.measurements = [m for m in _active_measurements() if m is not measurement]
+
+
+def _record_query(execute, sql, params, many, context):
+    measurements = _active_measurements()
+    if not measurements:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+
+    finally:
+        duration = time.perf_counter() - start
+        for measurement in measurements:
+            measurement.db_queries += 1
+            measurement.db_time += duration
+            measurement.sql_statements[sql] += 1
+
+
+def _add_query_wrapper(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _record_cacheops_read(sender, func, hit, **kwargs):
+    for measurement in _active_measurements():
+        if hit:
+            measurement.cacheops_hits += 1
+
+        else:
+            measurement.cacheops_misses += 1
+
+
+def _wrap_redis_method(method):
+    def wrapper(*args, **kwargs):
+        measurements = _active_measurements()
+        if not measurements:
+            return method(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+
+        finally:
+            duration = time.perf_counter() - start
+            for measurement in measurements:
+                measurement.redis_commands += 1
+                measurement.redis_time += duration
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def install():
+    """install the database, cacheops and redis hooks (only once per process)"""
+    if _installed[0]:
+        return
+    _installed[0] = True
+
+    connection_created.connect(_add_query_wrapper, dispatch_uid="pdb_metrics_query_wrapper")
+    from django.db import connections
+    for connection in connections.all():
+        _add_query_wrapper(None, connection)
+
+    try:
+        from cacheops.signals import cache_read
+        cache_read.connect(_record_cacheops_read, dispatch_uid="pdb_metrics_cacheops")
+
+    except ImportError:  # ignore for coverage
+        pass
+
+    import redis.client
+    redis.client.Redis.execute_command = _wrap_redis_method(redis.client.Redis.execute_command)
+    # commands in a pipeline are only queued (own execute_command method), the round trip happens on execute
+    redis.client.Pipeline.execute = _wrap_redis_method(redis.client.Pipeline.execute)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def record(kind, label_name, label_value, measurement, extra_labels=None):
+    """
+    add a finished measurement to the metrics of the process
+    :param kind: "http_request" or "task"
+    """
+    labels = "%s=\"%s\"" % (label_name, _escape_label(label_value))
+    count_labels = labels
+    if extra_labels:
+        count_labels += "".join([",%s=\"%s\"" % (k, _escape_label(v)) for k, v in sorted(extra_labels.items())])
+
+    duration = measurement.duration
+    count_metric = "pdb_http_requests_total" if kind == "http_request" else "pdb_task_runs_total"
+    values = {
+        "%s{%s}" % (count_metric, count_labels): 1,
+        "pdb_%s_duration_seconds_sum{%s}" % (kind, labels): duration,
+        "pdb_%s_duration_seconds_count{%s}" % (kind, labels): 1,
+        "pdb_%s_db_queries_total{%s}" % (kind, labels): measurement.db_queries,
+        "pdb_%s_db_seconds_total{%s}" % (kind, labels): measurement.db_time,
+        "pdb_%s_cacheops_hits_total{%s}" % (kind, labels): measurement.cacheops_hits,
+        "pdb_%s_cacheops_misses_total{%s}" % (kind, labels): measurement.cacheops_misses,
+        "pdb_%s_redis_commands_total{%s}" % (kind, labels): measurement.redis_commands,
+        "pdb_%s_redis_seconds_total{%s}" % (kind, labels): measurement.redis_time,
+    }
+    for bucket in DURATION_BUCKETS + ("+Inf", ):
+        values["pdb_%s_duration_seconds_bucket{%s,le=\"%s\"}" % (kind, labels, bucket)] = \
+            1 if bucket == "+Inf" or duration <= bucket else 0
+
+    with _local_metrics_lock:
+        for key, value in values.items():
+            _local_metrics[key] += value
+
+    if time.monotonic() - _last_flush[0] > METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+def _get_redis_client():
+    get_client = getattr(cache, "get_client", None)
+    if get_client is None:
+        return None
+
+    try:
+        return get_client(METRICS_CACHE_KEY, write=True)
+
+    except Exception:  # catch any exception
+        return None
+
+
+def flush():
+    """add the metrics of the process to the shared values"""
+    with _local_metrics_lock:
+        values = dict(_local_metrics)
+        _local_metrics.clear()
+        _last_flush[0] = time.monotonic()
+
+    client = _get_redis_client()
+    if not values or client is None:
+        # no shared storage available, keep the values in the process
+        with _local_metrics_lock:
+            for key, value in values.items():
+                _local_metrics[key] += value
+        return
+
+    try:
+        pipeline = client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.hincrbyfloat(cache.make_key(METRICS_CACHE_KEY), key, value)
+        pipeline.execute()
+
+    except Exception:  # catch any exception
+        logger.warning("cannot store the metrics", exc_info=True)
+
+
+def get_metrics():
+    """current values of all metrics (of all processes if a shared storage is available)"""
+    flush()
+    with _local_metrics_lock:
+        result = dict(_local_metrics)
+
+    client = _get_redis_client()
+    if client is not None:
+        for key, value in client.hgetall(cache.make_key(METRICS_CACHE_KEY)).items():
+            key = key.decode() if isinstance(key, bytes) else key
+            result[key] = result.get(key, 0) + float(value)
+
+    return result
+
+
+def render_metrics(metrics):
+    """render the metrics in the Prometheus text format"""
+    families = defaultdict(list)
+    for key, value in metrics.items():
+        name = key.split("{", 1)[0]
+        for suffix in ["_sum", "_count", "_bucket"]:
+            if name.endswith(suffix) and name[:-len(suffix)] in METRIC_DESCRIPTIONS:
+                name = name[:-len(suffix)]
+        families[name].append((key, value))
+
+    lines = []
+    for name in sorted(families.keys()):
+        metric_type = "histogram" if name.endswith("_duration_seconds") else "counter"
+        lines.append("# HELP %s %s" % (name, METRIC_DESCRIPTIONS.get(name, name)))
+        lines.append("# TYPE %s %s" % (name, metric_type))
+        for key, value in sorted(families[name]):
+            lines.append("%s %s" % (key, repr(float(value)) if value != int(value) else int(value)))
+
+    return "\n".join(lines) + "\n"
+
+
+def log_slow_request(request, measurement):
+    threshold = getattr(settings, "PDB_SLOW_REQUEST_THRESHOLD", 0)
+    duration = measurement.duration
+    if not threshold or duration < threshold:
+        return
+
+    top_statements = "\n".join([
+        "  %4dx %s" % (count, sql) for sql, count in measurement.sql_statements.most_common(5)
+    ])
+    logger.warning(
+        "slow request %s %s: %.3fs total, %d queries (%.3fs), %d redis commands (%.3fs), cacheops %d hits/%d misses, "
+        "top repeated SQL statements:\n%s" % (
+            request.method, request.path, duration, measurement.db_queries, measurement.db_time,
+            measurement.redis_commands, measurement.redis_time, measurement.cacheops_hits, measurement.cacheops_misses,
+            top_statements
+        )
+    )
+
+
+class MetricsMiddleware:
+    """record the metrics for every request (per view name)"""
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install()
+
+    def __call__(self, request):
+        measurement = start_measurement()
+        try:
+            response = self.get_response(request)
+
+        finally:
+            stop_measurement(measurement)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        endpoint = resolver_match.view_name if resolver_match else "unresolved"
+        record("http_request", "endpoint", endpoint, measurement, extra_labels={
+            "method": request.method,
+            "status": response.status_code
+        })
+        log_slow_request(request, measurement)
+
+        return response
+
+
+def metrics_view(request):
+    """
+    metrics in the Prometheus text format, requires the PDB_METRICS_TOKEN as bearer token (if configured) or a staff
+    user
+    """
+    if not getattr(settings, "PDB_ENABLE_METRICS", False):
+        raise Http404()
+
+    token = getattr(settings, "PDB_METRICS_TOKEN", None)
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if token and request.META.get("HTTP_AUTHORIZATION", "") == "Bearer %s" % token:
+        authorized = True
+
+    if not authorized:
+        return HttpResponseForbidden()
+
+    return HttpResponse(render_metrics(get_metrics()), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    if not hasattr(_state, "tasks"):
+        _state.tasks = {}
+    _state.tasks[task_id] = start_measurement()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    measurement = getattr(_state, "tasks", {}).pop(task_id, None)
+    if measurement is None or task is None:
+        return
+
+    stop_measurement(measurement)
+    record("task", "task", task.name, measurement, extra_labels={"state": state})
+
+
+def install_celery_signals():
+    """record the metrics for every Celery task (per task name)"""
+    from celery.signals import task_prerun, task_postrun
+    install()
+    task_prerun.connect(_task_prerun, dispatch_uid="pdb_metrics_task_prerun", weak=False)
+    task_postrun.connect(_task_postrun, dispatch_uid="pdb_metrics_task_postrun", weak=False)
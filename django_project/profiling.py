@@ -0,0 +1,140 @@
+"""
+on-demand profiling of requests and Celery tasks for staff users (enabled with PDB_ENABLE_PROFILING)
+
+A request is profiled if a staff user adds the `_profile` query parameter or the `X-PDB-Profile` header. Tasks that
+are scheduled during a profiled request are flagged and profiled by the worker as well. The results are stored as
+cProfile files (e.g. for snakeviz or flameprof) in the profiles directory within the MEDIA_ROOT and listed on the
+status page.
+"""
+import cProfile
+import logging
+import os
+import re
+import threading
+from django.conf import settings
+from django.utils.timezone import now
+
+logger = logging.getLogger("productdb")
+
+PROFILE_QUERY_PARAMETER = "_profile"
+PROFILE_HEADER = "HTTP_X_PDB_PROFILE"
+PROFILE_TASK_HEADER = "pdb_profile"
+PROFILE_FILE_REGEX = re.compile(r"^[\w\-.]+\.prof$")
+MAX_PROFILE_FILES = 50
+
+_state = threading.local()
+_task_profiles = {}
+
+
+def get_profile_directory():
+    return os.path.join(settings.MEDIA_ROOT, "profiles")
+
+
+def get_profile_files():
+    """stored profiles, newest first"""
+    directory = get_profile_directory()
+    if not os.path.isdir(directory):
+        return []
+
+    result = []
+    for filename in os.listdir(directory):
+        if PROFILE_FILE_REGEX.match(filename):
+            stat = os.stat(os.path.join(directory, filename))
+            result.append({"name": filename, "size": stat.st_size, "modified": stat.st_mtime})
+
+    return sorted(result, key=lambda e: e["modified"], reverse=True)
+
+
+def get_profile_file_path(filename):
+    """path to a stored profile, raises a ValueError if the filename is invalid"""
+    if not PROFILE_FILE_REGEX.match(filename):
+        raise ValueError("invalid profile filename")
+
+    return os.path.join(get_profile_directory(), filename)
+
+
+def save_profile(profiler, name):
+    """store the profile and remove the oldest profiles, returns the filename"""
+    directory = get_profile_directory()
+    os.makedirs(directory, exist_ok=True)
+
+    filename = "%s-%s.prof" % (now().strftime("%Y%m%d-%H%M%S-%f"), re.sub(r"[^\w\-.]+", "_", name).strip("_")[:100])
+    profiler.dump_stats(os.path.join(directory, filename))
+
+    for profile in get_profile_files()[MAX_PROFILE_FILES:]:
+        try:
+            os.remove(os.path.join(directory, profile["name"]))
+
+        except OSError:  # ignore for coverage
+            pass
+
+    return filename
+
+
+def is_profiling_requested(request):
+    if PROFILE_QUERY_PARAMETER not in request.GET and not request.META.get(PROFILE_HEADER):
+        return False
+
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+class ProfilingMiddleware:
+    """profile the request if requested by a staff user (must be placed after the AuthenticationMiddleware)"""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_profiling_requested(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        _state.active = True
+        try:
+            profiler.enable()
+            response = self.get_response(request)
+
+        finally:
+            profiler.disable()
+            _state.active = False
+
+        filename = save_profile(profiler, "request-%s-%s" % (request.method, request.path))
+        logger.info("profile of %s %s stored as %s" % (request.method, request.path, filename))
+        response["X-PDB-Profile-File"] = filename
+
+        return response
+
+
+def _flag_published_task(headers=None, **kwargs):
+    if getattr(_state, "active", False) and headers is not None:
+        headers[PROFILE_TASK_HEADER] = True
+
+
+def _is_flagged_task(task):
+    if getattr(task.request, PROFILE_TASK_HEADER, False):
+        return True
+
+    return bool((getattr(task.request, "headers", None) or {}).get(PROFILE_TASK_HEADER, False))
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    if task is not None and not task.request.is_eager and _is_flagged_task(task):
+        profiler = cProfile.Profile()
+        _task_profiles[task_id] = profiler
+        profiler.enable()
+
+
+def _task_postrun(task_id=None, task=None, **kwargs):
+    profiler = _task_profiles.pop(task_id, None)
+    if profiler is not None:
+        profiler.disable()
+        filename = save_profile(profiler, "task-%s" % task.name)
+        logger.info("profile of task %s (%s) stored as %s" % (task.name, task_id, filename))
+
+
+def install_celery_signals():
+    """flag tasks that are scheduled during a profiled request and profile them in the worker"""
+    from celery.signals import before_task_publish, task_prerun, task_postrun
+    before_task_publish.connect(_flag_published_task, dispatch_uid="pdb_profiling_publish", weak=False)
+    task_prerun.connect(_task_prerun, dispatch_uid="pdb_profiling_task_prerun", weak=False)
+    task_postrun.connect(_task_postrun, dispatch_uid="pdb_profiling_task_postrun", weak=False)
@@ -0,0 +1,25 @@
+"""
+REST API renderers
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+
+except ImportError:  # ignore for coverage
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that uses orjson for the compact output (same result as the JSONRenderer), the indented output of
+    the JSONRenderer is used as it is
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or data is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default)
+        # same escaping as the JSONRenderer (line and paragraph separators are not valid in JavaScript strings)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
@@ -19,6 +19,8 @@ CELERYBEAT_SCHEDULE_FILENAME = "../data/celerybeat-schedule.db"
 CELERYBEAT_PIDFILE = "../celerybeat.pid"
 CELERYBEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERYD_PREFETCH_MULTIPLIER = os.environ.get("PDB_CELERY_CONCURRENCY", 2)
+# product checks with more unique Product IDs are split into shards of the given size and processed in parallel
+PDB_PRODUCT_CHECK_SHARD_SIZE = int(os.environ.get("PDB_PRODUCT_CHECK_SHARD_SIZE", 2000))
 CELERYBEAT_SCHEDULE = {
     "periodic-sync-with-cisco-eox-api": {
         "task": "ciscoeox.synchronize_with_cisco_eox_api",
@@ -39,6 +39,22 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware"
 ]
 
+# query count and latency metrics per endpoint and task, available on the /metrics endpoint
+PDB_ENABLE_METRICS = True if os.getenv("PDB_ENABLE_METRICS", False) else False
+PDB_METRICS_TOKEN = os.getenv("PDB_METRICS_TOKEN", None)
+# log requests that take longer than the given amount of seconds (0 disables the log)
+PDB_SLOW_REQUEST_THRESHOLD = float(os.getenv("PDB_SLOW_REQUEST_THRESHOLD", 0))
+if PDB_ENABLE_METRICS:
+    MIDDLEWARE.insert(0, "django_project.metrics.MetricsMiddleware")
+
+# on-demand profiling of requests and tasks for staff users (results are stored in the MEDIA_ROOT)
+PDB_ENABLE_PROFILING = True if os.getenv("PDB_ENABLE_PROFILING", False) else False
+if PDB_ENABLE_PROFILING:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.auth.middleware.AuthenticationMiddleware") + 1,
+        "django_project.profiling.ProfilingMiddleware"
+    )
+
 if os.getenv("PDB_DEBUG", False) and os.getenv("PDB_DEBUG_NO_CACHE", False):
     logger.warning("DJANGO CONFIG: use database caching and disable cacheops...")
     CACHES = {
@@ -138,12 +154,20 @@ DATABASE_PORT = os.getenv("PDB_DATABASE_PORT", "5432")
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        # PostgreSQL backend with health checks and an optional connection pool
+        "ENGINE": "django_project.db_backends.postgresql",
         "NAME": DATABASE_NAME,
         "USER": DATABASE_USER,
         "PASSWORD": DATABASE_PASSWORD,
         "HOST": DATABASE_HOST,
         "PORT": DATABASE_PORT,
+        # reuse the connections of a process (seconds, also the maximum age of the pooled connections)
+        "CONN_MAX_AGE": int(os.getenv("PDB_DATABASE_CONN_MAX_AGE", 60)),
+        # verify a connection before it's reused if it was idle for PRE_PING_INTERVAL seconds (empty query disables it)
+        "PRE_PING_QUERY": os.getenv("PDB_DATABASE_PRE_PING_QUERY", "SELECT 1"),
+        "PRE_PING_INTERVAL": int(os.getenv("PDB_DATABASE_PRE_PING_INTERVAL", 30)),
+        # maximum amount of idle connections per process that are shared by all threads (0 disables the pool)
+        "POOL_SIZE": int(os.getenv("PDB_DATABASE_POOL_SIZE", 0)),
         "OPTIONS": {
             "sslmode": os.getenv(
                 "PDB_DATABASE_SSLMODE",
@@ -155,6 +179,26 @@ DATABASES = {
     }
 }
 
+# optional read replicas (comma separated list of host or host:port entries), used for read-only requests and tasks
+DATABASE_REPLICA_HOSTS = [e.strip() for e in os.getenv("PDB_DATABASE_REPLICA_HOSTS", "").split(",") if e.strip()]
+# seconds that a client reads from the primary database after a write
+PDB_DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("PDB_DATABASE_REPLICA_STICKY_SECONDS", 10))
+if DATABASE_REPLICA_HOSTS:
+    for counter, replica_host in enumerate(DATABASE_REPLICA_HOSTS):
+        replica_host, _, replica_port = replica_host.partition(":")
+        DATABASES["replica_%d" % counter] = dict(
+            DATABASES["default"],
+            HOST=replica_host,
+            PORT=replica_port or DATABASE_PORT,
+            OPTIONS=dict(DATABASES["default"]["OPTIONS"]),
+            TEST={"MIRROR": "default"}
+        )
+    DATABASE_ROUTERS = ["django_project.database_router.ReplicaRouter"]
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.sessions.middleware.SessionMiddleware"),
+        "django_project.database_router.ReplicaRoutingMiddleware"
+    )
+
 # HTTP proxy setting used with the Cisco Support API
 HTTP_PROXY_SERVER = os.getenv("PDB_HTTP_PROXY", None)
 HTTPS_PROXY_SERVER = os.getenv("PDB_HTTPS_PROXY", None)
@@ -11,7 +11,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.DjangoObjectPermissions"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.BasicAuthentication",
+        "django_project.authentication.CachedBasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
@@ -24,6 +24,9 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 25,
 }
 USE_X_FORWARDED_HOST = True
+
+# seconds a successful HTTP Basic authentication is kept in the process memory (0 disables the cache)
+API_BASIC_AUTH_CACHE_TIMEOUT = int(os.getenv("PDB_API_BASIC_AUTH_CACHE_TIMEOUT", 60))
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
         "basic": {
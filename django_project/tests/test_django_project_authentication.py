@@ -0,0 +1,81 @@
+"""
+Test suite for the django_project.authentication module
+"""
+import base64
+import pytest
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from rest_framework import authentication
+from rest_framework.exceptions import AuthenticationFailed
+from django_project.authentication import CachedBasicAuthentication, clear_verified_credentials
+
+pytestmark = pytest.mark.django_db
+
+
+def get_request(username, password):
+    credentials = base64.b64encode(("%s:%s" % (username, password)).encode()).decode()
+    return RequestFactory().get("/", HTTP_AUTHORIZATION="Basic %s" % credentials)
+
+
+class TestCachedBasicAuthentication:
+    @pytest.fixture(autouse=True)
+    def count_password_verifications(self, monkeypatch, settings):
+        settings.API_BASIC_AUTH_CACHE_TIMEOUT = 60
+        clear_verified_credentials()
+        self.verifications = 0
+        original_authenticate = authentication.authenticate
+
+        def counting_authenticate(*args, **kwargs):
+            self.verifications += 1
+            return original_authenticate(*args, **kwargs)
+
+        monkeypatch.setattr(authentication, "authenticate", counting_authenticate)
+        yield
+        clear_verified_credentials()
+
+    def test_cached_verification(self):
+        user = User.objects.create_user("api_user", password="api_password")
+        auth = CachedBasicAuthentication()
+
+        assert auth.authenticate(get_request("api_user", "api_password"))[0] == user
+        assert auth.authenticate(get_request("api_user", "api_password"))[0] == user
+        assert self.verifications == 1, "password should be verified only once"
+
+        # invalid credentials are never cached
+        for _ in range(2):
+            with pytest.raises(AuthenticationFailed):
+                auth.authenticate(get_request("api_user", "wrong_password"))
+        assert self.verifications == 3
+
+    def test_cache_disabled(self, settings):
+        settings.API_BASIC_AUTH_CACHE_TIMEOUT = 0
+        User.objects.create_user("api_user", password="api_password")
+        auth = CachedBasicAuthentication()
+
+        auth.authenticate(get_request("api_user", "api_password"))
+        auth.authenticate(get_request("api_user", "api_password"))
+        assert self.verifications == 2
+
+    def test_invalidation_on_password_change(self):
+        user = User.objects.create_user("api_user", password="api_password")
+        auth = CachedBasicAuthentication()
+        auth.authenticate(get_request("api_user", "api_password"))
+
+        # change the password without any signal (e.g. from another process)
+        user.set_password("new_password")
+        User.objects.filter(id=user.id).update(password=user.password)
+
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(get_request("api_user", "api_password"))
+        assert auth.authenticate(get_request("api_user", "new_password"))[0] == user
+
+    def test_invalidation_on_deactivation(self):
+        user = User.objects.create_user("api_user", password="api_password")
+        auth = CachedBasicAuthentication()
+        auth.authenticate(get_request("api_user", "api_password"))
+
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate(get_request("api_user", "api_password"))
@@ -62,3 +62,62 @@ class TestCustomMetaData:
         assert result["title"] == test_title
         assert result["auto_redirect"] is False
         assert result["redirect_to"] == test_redirect
+
+
+class MockTask:
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+
+class TestTaskProgressReporter:
+    def test_status_messages_are_always_written(self):
+        task = MockTask()
+        reporter = celery.TaskProgressReporter(task)
+
+        assert reporter("first message") is True
+        assert reporter("second message") is True
+        assert task.states == [
+            (celery.TaskState.PROCESSING, {"status_message": "first message"}),
+            (celery.TaskState.PROCESSING, {"status_message": "second message"}),
+        ]
+
+    def test_progress_updates_are_rate_limited(self):
+        task = MockTask()
+        reporter = celery.TaskProgressReporter(task, min_interval_seconds=3600, min_interval_count=10)
+
+        for e in range(1, 26):
+            reporter(processed=e, total=25)
+
+        # first update and every 10 entries
+        assert len(task.states) == 3
+        state, meta = task.states[-1]
+        assert state == celery.TaskState.PROCESSING
+        assert meta["status_message"] == "Process entry <strong>21</strong> of <strong>25</strong>..."
+        assert meta["progress"]["processed"] == 21
+        assert meta["progress"]["total"] == 25
+
+        # forced updates ignore the rate limit
+        assert reporter(processed=25, force=True) is True
+        assert task.states[-1][1]["progress"]["processed"] == 25
+
+    def test_progress_rate_and_eta(self, monkeypatch):
+        current_time = [100.0]
+        monkeypatch.setattr(celery.time, "monotonic", lambda: current_time[0])
+        task = MockTask()
+        reporter = celery.TaskProgressReporter(task, total=100, min_interval_seconds=2, min_interval_count=1000)
+
+        reporter(processed=1)
+        current_time[0] = 101.0
+        assert reporter(processed=10) is False, "update within the rate limit"
+
+        current_time[0] = 110.0
+        assert reporter(processed=50) is True
+        assert task.states[-1][1]["progress"] == {
+            "processed": 50,
+            "total": 100,
+            "rate": 5.0,
+            "eta": 10
+        }
@@ -0,0 +1,86 @@
+"""
+Test suite for the django_project.database_router module
+"""
+import time
+import pytest
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory
+from app.config.models import ConfigOption
+from app.productdb.models import Product, ProductIdNormalizationRule
+from django_project import database_router
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def replicas(monkeypatch, settings):
+    settings.PDB_DATABASE_REPLICA_STICKY_SECONDS = 10
+    monkeypatch.setattr(database_router, "get_replica_databases", lambda: ["replica_0"])
+
+
+@pytest.mark.usefixtures("replicas")
+class TestReplicaRouter:
+    def test_routing(self):
+        router = database_router.ReplicaRouter()
+        assert router.db_for_read(Product) == "default", "replicas should only be used if enabled"
+
+        with database_router.use_replica():
+            assert router.db_for_read(Product) == "replica_0"
+            assert router.db_for_read(Session) == "default"
+            for model in [ConfigOption, User, ProductIdNormalizationRule]:
+                assert router.db_for_read(model) == "default", "cached data must be read from the primary"
+
+            assert router.db_for_write(Session) == "default"
+            assert router.db_for_read(Product) == "replica_0", "session writes should not pin to the primary"
+
+            assert router.db_for_write(Product) == "default"
+            assert router.db_for_read(Product) == "default", "reads after a write should use the primary"
+
+        assert router.allow_migrate("default", "productdb") is True
+        assert router.allow_migrate("replica_0", "productdb") is False
+
+    def test_no_cacheops_for_replica_reads(self):
+        database_router.ReplicaRouter()
+
+        should_cache = Product.objects.none()._should_cache
+        assert Product.objects.using("replica_0")._should_cache("fetch") is False
+        assert Product.objects.using("replica_0")._should_cache("count") is False
+        assert Product.objects.using("default")._should_cache("fetch") == \
+            should_cache.__wrapped__(Product.objects.using("default"), "fetch")
+
+    def test_middleware(self):
+        router = database_router.ReplicaRouter()
+        databases = []
+
+        def read_response(request):
+            databases.append(router.db_for_read(Product))
+            return HttpResponse("ok")
+
+        def write_response(request):
+            router.db_for_write(Product)
+            databases.append(router.db_for_read(Product))
+            return HttpResponse("ok")
+
+        response = database_router.ReplicaRoutingMiddleware(read_response)(RequestFactory().get("/"))
+        assert databases.pop() == "replica_0"
+        assert database_router.PRIMARY_COOKIE_NAME not in response.cookies
+
+        response = database_router.ReplicaRoutingMiddleware(read_response)(RequestFactory().post("/"))
+        assert databases.pop() == "default", "write requests should use the primary"
+
+        response = database_router.ReplicaRoutingMiddleware(write_response)(RequestFactory().get("/"))
+        assert databases.pop() == "default"
+        cookie = response.cookies[database_router.PRIMARY_COOKIE_NAME]
+        assert int(cookie.value) > time.time()
+        assert not database_router.is_pinned_to_primary()
+
+        request = RequestFactory().get("/")
+        request.COOKIES[database_router.PRIMARY_COOKIE_NAME] = cookie.value
+        database_router.ReplicaRoutingMiddleware(read_response)(request)
+        assert databases.pop() == "default", "the client should be pinned to the primary after a write"
+
+        request.COOKIES[database_router.PRIMARY_COOKIE_NAME] = str(int(time.time()) - 1)
+        database_router.ReplicaRoutingMiddleware(read_response)(request)
+        assert databases.pop() == "replica_0"
@@ -0,0 +1,117 @@
+"""
+Test suite for the django_project.db_backends.postgresql module
+"""
+import pytest
+from psycopg2 import extensions
+from django_project.db_backends.postgresql import base
+
+
+class FakeConnection:
+    def __init__(self, healthy=True):
+        self.closed = 0
+        self.healthy = healthy
+        self.autocommit = True
+        self.rolled_back = False
+        self.pings = 0
+        self.info = type("Info", (), {"transaction_status": extensions.TRANSACTION_STATUS_IDLE})()
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def execute(self, query):
+                connection.pings += 1
+                if not connection.healthy:
+                    raise base.Database.OperationalError("server closed the connection unexpectedly")
+
+        return Cursor()
+
+    def rollback(self):
+        self.rolled_back = True
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def fake_connect(monkeypatch):
+    created = []
+
+    def connect(**kwargs):
+        created.append(FakeConnection())
+        return created[-1]
+
+    monkeypatch.setattr(base.Database, "connect", connect)
+    return created
+
+
+class TestConnectionPool:
+    def test_reuse_connections(self, fake_connect):
+        pool = base.ConnectionPool(size=1, max_age=60, pre_ping_query="SELECT 1")
+
+        first = pool.get({})
+        second = pool.get({})
+        assert len(fake_connect) == 2
+
+        pool.put(first)
+        pool.put(second)
+        assert second.closed, "connections that exceed the pool size should be closed"
+        assert pool.get({}) is first
+
+        first.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.put(first)
+        assert first.rolled_back, "open transactions should be rolled back"
+
+        first.healthy = False
+        connection = pool.get({})
+        assert connection is not first, "unhealthy connections should not be reused"
+        assert first.closed
+
+        foreign_connection = FakeConnection()
+        pool.put(foreign_connection)
+        assert foreign_connection.closed, "connections of other pools should not be reused"
+
+    def test_pre_ping_interval(self, fake_connect, monkeypatch):
+        current_time = [1000.0]
+        monkeypatch.setattr(base.time, "time", lambda: current_time[0])
+        pool = base.ConnectionPool(size=1, max_age=None, pre_ping_query="SELECT 1", pre_ping_interval=30)
+
+        connection = pool.get({})
+        pool.put(connection)
+        current_time[0] += 10
+        assert pool.get({}) is connection
+        assert connection.pings == 0, "recently used connections should not be verified"
+
+        pool.put(connection)
+        current_time[0] += 30
+        assert pool.get({}) is connection
+        assert connection.pings == 1, "idle connections should be verified after the interval"
+
+        pool.put(connection)
+        connection.healthy = False
+        current_time[0] += 30
+        assert pool.get({}) is not connection
+        assert connection.closed
+
+    def test_max_age(self, fake_connect):
+        pool = base.ConnectionPool(size=5, max_age=0)
+        connection = pool.get({})
+        pool.put(connection)
+
+        assert connection.closed
+        assert pool.get({}) is not connection
+
+    def test_health_check(self):
+        assert base.is_connection_healthy(FakeConnection(), "SELECT 1")
+        assert not base.is_connection_healthy(FakeConnection(healthy=False), "SELECT 1")
+
+        connection = FakeConnection()
+        connection.close()
+        assert not base.is_connection_healthy(connection, "SELECT 1")
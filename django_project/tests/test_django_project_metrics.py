@@ -0,0 +1,97 @@
+"""
+Test suite for the django_project.metrics module
+"""
+import logging
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from app.productdb.models import Vendor
+from django_project import metrics
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def local_metrics(monkeypatch, settings):
+    """use only the process local metrics storage"""
+    settings.PDB_ENABLE_METRICS = True
+    monkeypatch.setattr(metrics, "_get_redis_client", lambda: None)
+    metrics._local_metrics.clear()
+    yield metrics._local_metrics
+    metrics._local_metrics.clear()
+
+
+@pytest.mark.usefixtures("import_default_vendors")
+class TestMetricsMiddleware:
+    def test_request_metrics(self, local_metrics):
+        def get_response(request):
+            list(Vendor.objects.all().nocache())
+            list(Vendor.objects.all().nocache())
+            return HttpResponse("ok")
+
+        request = RequestFactory().get(reverse("productdb:home"))
+        request.resolver_match = None
+        response = metrics.MetricsMiddleware(get_response)(request)
+
+        assert response.status_code == 200
+        assert local_metrics['pdb_http_requests_total{endpoint="unresolved",method="GET",status="200"}'] == 1
+        assert local_metrics['pdb_http_request_db_queries_total{endpoint="unresolved"}'] == 2
+        assert local_metrics['pdb_http_request_duration_seconds_count{endpoint="unresolved"}'] == 1
+        assert local_metrics['pdb_http_request_duration_seconds_bucket{endpoint="unresolved",le="+Inf"}'] == 1
+        assert metrics._active_measurements() == [], "measurement should be stopped"
+
+    def test_slow_request_log(self, local_metrics, settings, caplog):
+        settings.PDB_SLOW_REQUEST_THRESHOLD = 0.000001
+
+        def get_response(request):
+            for _ in range(3):
+                list(Vendor.objects.filter(id=1).nocache())
+            return HttpResponse("ok")
+
+        request = RequestFactory().get(reverse("productdb:home"))
+        with caplog.at_level(logging.WARNING, logger="productdb"):
+            metrics.MetricsMiddleware(get_response)(request)
+
+        assert "slow request GET %s" % reverse("productdb:home") in caplog.text
+        assert "3 queries" in caplog.text
+        assert "   3x SELECT" in caplog.text
+
+
+class TestMetricsView:
+    def test_render_metrics(self, local_metrics):
+        measurement = metrics.start_measurement()
+        metrics.stop_measurement(measurement)
+        metrics.record("task", "task", "productdb.perform_product_check", measurement, extra_labels={
+            "state": "SUCCESS"
+        })
+
+        result = metrics.render_metrics(metrics.get_metrics())
+
+        assert "# TYPE pdb_task_runs_total counter" in result
+        assert "# TYPE pdb_task_duration_seconds histogram" in result
+        assert 'pdb_task_runs_total{task="productdb.perform_product_check",state="SUCCESS"} 1' in result
+        assert 'pdb_task_db_queries_total{task="productdb.perform_product_check"} 0' in result
+
+    def test_access(self, local_metrics, settings):
+        url = reverse("metrics")
+        settings.PDB_METRICS_TOKEN = "secret"
+
+        request = RequestFactory().get(url)
+        request.user = AnonymousUser()
+        assert metrics.metrics_view(request).status_code == 403
+
+        request = RequestFactory().get(url, HTTP_AUTHORIZATION="Bearer secret")
+        request.user = AnonymousUser()
+        response = metrics.metrics_view(request)
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+
+        request = RequestFactory().get(url)
+        request.user = User.objects.create(username="staff", is_staff=True)
+        assert metrics.metrics_view(request).status_code == 200
+
+        settings.PDB_ENABLE_METRICS = False
+        with pytest.raises(Http404):
+            metrics.metrics_view(request)
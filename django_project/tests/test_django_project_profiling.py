@@ -0,0 +1,56 @@
+"""
+Test suite for the django_project.profiling module
+"""
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from django_project import profiling
+
+pytestmark = pytest.mark.django_db
+
+
+class TestProfilingMiddleware:
+    def test_profile_request(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        middleware = profiling.ProfilingMiddleware(lambda request: HttpResponse("ok"))
+        url = reverse("productdb:home")
+
+        # not requested
+        request = RequestFactory().get(url)
+        request.user = User.objects.create(username="staff", is_staff=True)
+        response = middleware(request)
+        assert "X-PDB-Profile-File" not in response
+        assert profiling.get_profile_files() == []
+
+        # requested, but not a staff user
+        for user in [AnonymousUser(), User.objects.create(username="user")]:
+            request = RequestFactory().get(url + "?_profile=1")
+            request.user = user
+            response = middleware(request)
+            assert "X-PDB-Profile-File" not in response
+        assert profiling.get_profile_files() == []
+
+        # requested by staff user (query parameter and header)
+        request = RequestFactory().get(url + "?_profile=1")
+        request.user = User.objects.get(username="staff")
+        response = middleware(request)
+        assert response.content == b"ok"
+        assert response["X-PDB-Profile-File"].endswith(".prof")
+
+        request = RequestFactory().get(url, HTTP_X_PDB_PROFILE="1")
+        request.user = User.objects.get(username="staff")
+        middleware(request)
+
+        profile_files = profiling.get_profile_files()
+        assert len(profile_files) == 2
+        assert response["X-PDB-Profile-File"] in [e["name"] for e in profile_files]
+
+    def test_profile_file_path(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+        assert profiling.get_profile_file_path("abc.prof") == str(tmp_path / "profiles" / "abc.prof")
+        for filename in ["../abc.prof", "abc.txt", "abc/def.prof"]:
+            with pytest.raises(ValueError):
+                profiling.get_profile_file_path(filename)
@@ -392,6 +392,40 @@ class TestStatusAjaxCall:
         assert response.status_code == 200, "Should be callable"
         assert json.loads(response.content.decode()) == {"state": "processing", "status_message": "no state"}
 
+    def test_processing_task_state_with_progress(self, monkeypatch):
+        class MockAsyncResult:
+            state = TaskState.PROCESSING
+            info = {
+                "status_message": "Process entry 10 of 100",
+                "progress": {
+                    "processed": 10,
+                    "total": 100,
+                    "rate": 5.0,
+                    "eta": 18
+                }
+            }
+
+        monkeypatch.setattr(app, "AsyncResult", lambda task_id: MockAsyncResult())
+
+        url = reverse(self.URL_NAME, kwargs={"task_id": "mock_task_id"})
+        request = RequestFactory().get(url)
+        request.META["HTTP_X_REQUESTED_WITH"] = "XMLHttpRequest"  # AJAX request
+        request.user = User.objects.create(username="testuser", is_superuser=False, is_staff=False)
+
+        response = views.task_status_ajax(request, "mock_task_id")
+
+        assert response.status_code == 200, "Should be callable"
+        assert json.loads(response.content.decode()) == {
+            "state": "processing",
+            "status_message": "Process entry 10 of 100",
+            "progress": {
+                "processed": 10,
+                "total": 100,
+                "rate": 5.0,
+                "eta": 18
+            }
+        }
+
     def test_success_task_state_without_error(self, monkeypatch):
         class MockAsyncResult:
             state = TaskState.SUCCESS
@@ -6,6 +6,7 @@ from django.views.generic.base import RedirectView
 from django.conf.urls import include, url
 from django.contrib import admin
 from django_project import views
+from django_project.metrics import metrics_view
 
 admin.site.site_header = "Product Database Administration"
 
@@ -24,6 +25,7 @@ urlpatterns = [
     url(r'^productdb/config/', include('app.config.urls', namespace='productdb_config')),
     url(r'^productdb/ciscoapi/', include('app.ciscoeox.urls', namespace='cisco_api')),
     url(r'^productdb/', include('app.productdb.urls', namespace='productdb')),
+    url(r'^metrics$', metrics_view, name="metrics"),
     url(r'^$', RedirectView.as_view(url='/productdb/', permanent=False)),
 ]
 
@@ -180,6 +180,8 @@ def task_status_ajax(request, task_id):
                     "state": "processing",
                     "status_message": task.info.get("status_message", "")
                 }
+                if "progress" in task.info:
+                    response["progress"] = task.info["progress"]
 
             elif task.state == TaskState.SUCCESS:
                 response = {